@@ -0,0 +1,172 @@
+from dataclasses import asdict, dataclass
+from typing import BinaryIO, Iterable
+import json
+import mmap
+import os
+import struct
+
+BUNDLE_MAGIC = b"PGB1"
+_HEADER = struct.Struct("<4sI")
+# Pixel data is aligned so rows can be used in place by SIMD blitters.
+_ALIGNMENT = 16
+
+
+class BundleError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class BundleEntry:
+    name: str
+    width: int
+    height: int
+    pixel_format: str
+    offset: int
+    size: int
+
+
+def write_bundle(
+    file: BinaryIO, assets: Iterable[tuple[str, int, int, str, bytes]]
+) -> dict[str, BundleEntry]:
+    """Write pre-decoded pixel data into a single bundle file.
+
+    The file starts with a magic number and the length of a JSON index, followed by
+    the index and the pixel data of every asset.
+
+    Args:
+        file (BinaryIO): File opened for binary writing
+        assets (Iterable[tuple[str, int, int, str, bytes]]): Name, width, height,
+        pixel format and pixel bytes of every asset
+
+    Returns:
+        dict[str, BundleEntry]: Index of the written bundle
+    """
+    assets = list(assets)
+    index: dict[str, BundleEntry] = {}
+    # Offsets are relative to the end of the index until its length is known.
+    offset = 0
+    for name, width, height, pixel_format, data in assets:
+        if name in index:
+            raise BundleError(f"Duplicate asset name in bundle: {name}")
+        index[name] = BundleEntry(name, width, height, pixel_format, offset, len(data))
+        offset = _align(offset + len(data))
+    index_bytes = _encode_index(index, 0)
+    data_start = _align(_HEADER.size + len(index_bytes))
+    # Shifting the offsets can lengthen the index, so encode until it is stable.
+    while True:
+        index_bytes = _encode_index(index, data_start)
+        new_start = _align(_HEADER.size + len(index_bytes))
+        if new_start <= data_start:
+            break
+        data_start = new_start
+    file.write(_HEADER.pack(BUNDLE_MAGIC, len(index_bytes)))
+    file.write(index_bytes)
+    position = _HEADER.size + len(index_bytes)
+    for name, _, _, _, data in assets:
+        start = data_start + index[name].offset
+        file.write(b"\0" * (start - position))
+        file.write(data)
+        position = start + len(data)
+    return {
+        name: BundleEntry(**{**asdict(entry), "offset": data_start + entry.offset})
+        for name, entry in index.items()
+    }
+
+
+class BundleReader:
+    """Memory-maps a bundle and gives zero-copy views of its pixel data.
+
+    The mapping is private copy-on-write, so a view can back a surface that is
+    drawn on without ever touching the file.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self._view: memoryview | None = None
+        self._file = open(file_path, "rb")
+        try:
+            if os.fstat(self._file.fileno()).st_size < _HEADER.size:
+                raise BundleError(f"Not an asset bundle, file too short: {file_path}")
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_COPY)
+            try:
+                self.entries = self._read_index()
+            except Exception:
+                self._map.close()
+                raise
+        except Exception:
+            self._file.close()
+            raise
+        self._view = memoryview(self._map)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __enter__(self) -> "BundleReader":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def get_entry(self, name: str) -> BundleEntry:
+        entry = self.entries.get(name)
+        if entry is None:
+            raise KeyError(f"Could not find asset in bundle: {name}")
+        return entry
+
+    def get_buffer(self, name: str) -> memoryview:
+        entry = self.get_entry(name)
+        return self._view[entry.offset : entry.offset + entry.size]
+
+    def close(self) -> None:
+        """Close the mapping.
+
+        Views handed out, and anything made from them like surfaces, must have
+        been released first. Otherwise a BundleError is raised and the reader
+        stays open.
+        """
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        try:
+            self._map.close()
+        except BufferError as e:
+            self._view = memoryview(self._map)
+            raise BundleError(
+                f"Views of the bundle are still in use: {self.file_path}"
+            ) from e
+        self._file.close()
+
+    def _read_index(self) -> dict[str, BundleEntry]:
+        magic, index_size = _HEADER.unpack_from(self._map, 0)
+        if magic != BUNDLE_MAGIC:
+            raise BundleError(f"Not an asset bundle: {self.file_path}")
+        if _HEADER.size + index_size > len(self._map):
+            raise BundleError(f"Truncated asset bundle: {self.file_path}")
+        raw_index = self._map[_HEADER.size : _HEADER.size + index_size]
+        return {
+            name: BundleEntry(name=name, **fields)
+            for name, fields in json.loads(raw_index).items()
+        }
+
+
+def _align(offset: int) -> int:
+    return (offset + _ALIGNMENT - 1) // _ALIGNMENT * _ALIGNMENT
+
+
+def _encode_index(index: dict[str, BundleEntry], data_start: int) -> bytes:
+    return json.dumps(
+        {
+            name: {
+                "width": entry.width,
+                "height": entry.height,
+                "pixel_format": entry.pixel_format,
+                "offset": data_start + entry.offset,
+                "size": entry.size,
+            }
+            for name, entry in index.items()
+        },
+        separators=(",", ":"),
+    ).encode()
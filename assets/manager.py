@@ -0,0 +1,270 @@
+from collections import OrderedDict
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum, auto
+from typing import Callable, Generic, TypeVar
+import os
+import queue
+
+from ..core.event_manager import LogPolicy
+
+T = TypeVar("T")
+
+
+class AssetState(Enum):
+    LOADING = auto()
+    READY = auto()
+    FAILED = auto()
+
+
+class AssetError(Exception):
+    pass
+
+
+class AssetHandle(Generic[T]):
+    """Reference to an asset that may still be decoding on a worker thread.
+
+    A handle holds one reference to its asset until it is released. While any
+    reference is held the asset is never evicted.
+    """
+
+    def __init__(
+        self, manager: "AssetManager[T]", name: str, path: str, future: Future
+    ) -> None:
+        self.name = name
+        self.path = path
+        self.state = AssetState.LOADING
+        self.error: BaseException | None = None
+        self.size = 0
+        self.refcount = 0
+        self._manager = manager
+        self._future = future
+        self._value: T | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == AssetState.READY
+
+    def done(self) -> bool:
+        return self.state != AssetState.LOADING or self._future.done()
+
+    def get(self) -> T:
+        """Get the asset, blocking until it has been loaded."""
+        if self.state == AssetState.LOADING:
+            self._manager.wait([self])
+        if self.state != AssetState.READY:
+            raise AssetError(f"Could not load asset: {self.name}") from self.error
+        return self._value
+
+
+class AssetManager(Generic[T]):
+    """Loads assets on a thread pool with reference counting and an LRU budget.
+
+    Files are decoded by ``decoder`` on worker threads, so requesting a level's
+    assets does not block the frame loop. Decoded assets are handed over to the
+    calling thread in ``poll``, where ``finalize`` runs (for work that must happen
+    on the main thread, like converting a surface to the display format) and the
+    asset's size is accounted.
+
+    Assets whose reference count dropped to zero stay cached and are evicted in
+    least recently used order once the cache grows past ``memory_budget`` bytes.
+    """
+
+    def __init__(
+        self,
+        decoder: Callable[[str], T],
+        size_of: Callable[[T], int] | None = None,
+        finalize: Callable[[T], T] | None = None,
+        memory_budget: int | None = None,
+        max_workers: int | None = None,
+        log_policy: LogPolicy = LogPolicy.PRINT,
+    ) -> None:
+        self.decoder = decoder
+        self.size_of = size_of or (lambda asset: 0)
+        self.finalize = finalize
+        self.memory_budget = memory_budget
+        self.log_policy = log_policy
+        self.memory_used = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="asset-loader"
+        )
+        # Most recently used last.
+        self._handles: OrderedDict[str, AssetHandle[T]] = OrderedDict()
+        self._completed: queue.SimpleQueue[AssetHandle[T]] = queue.SimpleQueue()
+
+    def load(self, file_path: str, name: str | None = None) -> AssetHandle[T]:
+        """Start loading a file and take a reference to it.
+
+        Loading an asset that is already cached or loading only takes another
+        reference to it.
+
+        Args:
+            file_path (str): Path from current working directory to the file
+            name (str | None, optional): Asset name. Defaults to the file name.
+
+        Returns:
+            AssetHandle[T]: Handle of the asset
+        """
+        name = name or os.path.basename(file_path)
+        handle = self._handles.get(name)
+        if handle is None or handle.state == AssetState.FAILED:
+            future = self._executor.submit(self.decoder, file_path)
+            handle = AssetHandle(self, name, file_path, future)
+            self._handles[name] = handle
+            future.add_done_callback(lambda _: self._completed.put(handle))
+        else:
+            self._handles.move_to_end(name)
+        handle.refcount += 1
+        return handle
+
+    def load_folder(self, folder_path: str) -> list[AssetHandle[T]]:
+        """Start loading all the files of a folder
+
+        Args:
+            folder_path (str): Path from current working directory to the folder
+
+        Returns:
+            list[AssetHandle[T]]: Handles of the assets, in file name order
+        """
+        return [
+            self.load(os.path.join(folder_path, file_name))
+            for file_name in sorted(os.listdir(folder_path))
+            if os.path.isfile(os.path.join(folder_path, file_name))
+        ]
+
+    def poll(self) -> int:
+        """Finish assets decoded since the last poll. Call once per frame.
+
+        Returns:
+            int: Number of assets that finished loading
+        """
+        finished = 0
+        while True:
+            try:
+                handle = self._completed.get_nowait()
+            except queue.Empty:
+                break
+            if handle.state != AssetState.LOADING:
+                continue
+            finished += 1
+            self._finish(handle)
+        self._evict()
+        return finished
+
+    def wait(self, handles: list[AssetHandle[T]] | None = None) -> None:
+        """Block until the given handles, or all loading assets, are finished."""
+        if handles is None:
+            handles = list(self._handles.values())
+        loading = [handle for handle in handles if handle.state == AssetState.LOADING]
+        futures.wait([handle._future for handle in loading])
+        # Waiters wake up before the done callbacks queue the handles, so the
+        # handles are finished from their futures rather than from the queue.
+        for handle in loading:
+            self._finish_done(handle)
+        self.poll()
+
+    def get_asset(self, asset_file_name: str) -> T:
+        """Get a loaded asset by name. Raise KeyError if it is not loaded.
+
+        Args:
+            asset_file_name (str): Asset name
+
+        Returns:
+            T: Asset object
+        """
+        handle = self._handles.get(asset_file_name)
+        if handle is None:
+            raise KeyError(f"Could not find asset name: {asset_file_name}")
+        self._finish_done(handle)
+        if handle.state != AssetState.READY:
+            raise KeyError(f"Asset is not loaded: {asset_file_name}")
+        self._handles.move_to_end(asset_file_name)
+        return handle._value
+
+    def get_handle(self, asset_file_name: str) -> AssetHandle[T]:
+        handle = self._handles.get(asset_file_name)
+        if handle is None:
+            raise KeyError(f"Could not find asset name: {asset_file_name}")
+        return handle
+
+    def has(self, asset_file_name: str) -> bool:
+        handle = self._handles.get(asset_file_name)
+        return handle is not None and handle.state == AssetState.READY
+
+    def release(self, handle: AssetHandle[T] | str) -> None:
+        """Drop a reference. Unreferenced assets become candidates for eviction."""
+        if isinstance(handle, str):
+            handle = self.get_handle(handle)
+        if handle.refcount <= 0:
+            raise ValueError(f"Asset has no references: {handle.name}")
+        handle.refcount -= 1
+        if handle.refcount == 0:
+            self._evict()
+
+    def unload(self, asset_file_name: str) -> None:
+        """Remove an asset now, whatever its reference count."""
+        handle = self._handles.pop(asset_file_name, None)
+        if handle is None:
+            raise KeyError(f"Could not find asset name: {asset_file_name}")
+        handle._future.cancel()
+        self._drop(handle)
+
+    def set_memory_budget(self, memory_budget: int | None) -> None:
+        self.memory_budget = memory_budget
+        self._evict()
+
+    def empty(self) -> None:
+        for handle in self._handles.values():
+            handle._future.cancel()
+            self._drop(handle)
+        self._handles.clear()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _finish(self, handle: AssetHandle[T]) -> None:
+        future = handle._future
+        if future.cancelled():
+            return
+        try:
+            value = future.result()
+            if self.finalize is not None:
+                value = self.finalize(value)
+            size = self.size_of(value)
+        except Exception as e:
+            handle.state = AssetState.FAILED
+            handle.error = e
+            if self.log_policy == LogPolicy.PRINT:
+                print(f"Error loading asset: {handle.path}")
+            elif self.log_policy == LogPolicy.RAISE:
+                raise AssetError(f"Error loading asset: {handle.path}") from e
+            return
+        handle._value = value
+        handle.size = size
+        handle.state = AssetState.READY
+        self.memory_used += size
+
+    def _finish_done(self, handle: AssetHandle[T]) -> None:
+        """Finish a handle whose decoding is over, without waiting for poll."""
+        if handle.state == AssetState.LOADING and handle._future.done():
+            self._finish(handle)
+            self._evict()
+
+    def _evict(self) -> None:
+        if self.memory_budget is None or self.memory_used <= self.memory_budget:
+            return
+        for name in list(self._handles):
+            if self.memory_used <= self.memory_budget:
+                break
+            handle = self._handles[name]
+            if handle.refcount > 0 or handle.state == AssetState.LOADING:
+                continue
+            del self._handles[name]
+            self._drop(handle)
+
+    def _drop(self, handle: AssetHandle[T]) -> None:
+        if handle.state == AssetState.READY:
+            self.memory_used -= handle.size
+        handle._value = None
+        handle.state = AssetState.FAILED
+        handle.error = AssetError(f"Asset was unloaded: {handle.name}")
@@ -1,9 +1,27 @@
 import random
+import numpy as np
 import pygame
 from quadtree import QuadTreeNode
+from physics.circles import (
+    CircleBodies,
+    bounce_borders,
+    integrate,
+    kinetic_energies,
+    resolve_collisions,
+)
+from physics.pair_cache import PairCache
 
 
 class Ball:
+    """A ball of the demo.
+
+    Position and velocity are vectors owned by the ball and updated in place,
+    so getters and setters allocate nothing. Getters return those vectors
+    themselves: copy them to keep a value across updates.
+    """
+
+    __slots__ = ("_radius", "_position", "_color", "_mass", "_velocity")
+
     def __init__(
         self,
         radius: float,
@@ -16,7 +34,7 @@ class Ball:
         self._position = pygame.Vector2(position)
         self._color = color
         self._mass = mass
-        self.set_velocity(velocity)
+        self._velocity = pygame.Vector2(velocity)
 
     def __str__(self) -> str:
         return (
@@ -31,7 +49,7 @@ class Ball:
         return "ball"
 
     def move(self, position: tuple[float, float] | pygame.math.Vector2) -> None:
-        self._position = pygame.Vector2(position)
+        self._position.update(position)
 
     def get_position(self) -> pygame.Vector2:
         return self._position
@@ -55,40 +73,23 @@ class Ball:
         return self._mass
 
     def set_velocity(self, velocity: tuple[float, float] | pygame.Vector2) -> None:
-        self._velocity = pygame.Vector2(velocity)
+        self._velocity.update(velocity)
 
     def get_velocity(self) -> pygame.Vector2:
         return self._velocity
 
     def update(self, resolution: tuple[int, int], time_step: float) -> None:
+        position = self._position
+        velocity = self._velocity
+        radius = self._radius
         if self.is_vertical_screen_border_collided(resolution[0]):
-            self._velocity.x = -self._velocity.x
-            self.move(
-                (
-                    (
-                        self._radius
-                        if self._position.x < self._radius
-                        else resolution[0] - self._radius
-                    ),
-                    self._position.y,
-                )
-            )
+            velocity.x = -velocity.x
+            position.x = radius if position.x < radius else resolution[0] - radius
         if self.is_horizontal_screen_border_collided(resolution[1]):
-            self._velocity.y = -self._velocity.y
-            self.move(
-                (
-                    self._position.x,
-                    (
-                        self._radius
-                        if self._position.y < self._radius
-                        else resolution[1] - self._radius
-                    ),
-                )
-            )
-        x_offset = self._velocity.x * time_step
-        y_offset = self._velocity.y * time_step
-        new_position = self.get_position() + pygame.Vector2(x_offset, y_offset)
-        self.move(new_position)
+            velocity.y = -velocity.y
+            position.y = radius if position.y < radius else resolution[1] - radius
+        position.x += velocity.x * time_step
+        position.y += velocity.y * time_step
 
     def is_horizontal_screen_border_collided(self, height: int) -> bool:
         return not (
@@ -116,6 +117,84 @@ class Ball:
         )
 
 
+class BallSet:
+    """Many balls stored as rows of NumPy arrays, updated as one game object.
+
+    Each ball takes 48 bytes of arrays and a color reference, instead of a Python
+    object and two vectors.
+    ``update`` moves every ball like ``Ball.update`` and ``collide`` resolves
+    collisions like ``move_ball_colliding`` and ``exchange_momentum``, with
+    vectorized kernels.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.bodies = CircleBodies(capacity)
+        self.pair_cache = PairCache()
+        self._colors: list[pygame.color.Color] = []
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    def get_type(self) -> str:
+        return "ball_set"
+
+    def add(
+        self,
+        radius: float,
+        position: tuple[float, float] | pygame.Vector2,
+        color: pygame.color.Color,
+        mass: float,
+        velocity: tuple[float, float] | pygame.Vector2 = (0.0, 0.0),
+    ) -> int:
+        self._colors.append(color)
+        return self.bodies.add(position, velocity, radius, mass)
+
+    def add_ball(self, ball: Ball) -> int:
+        return self.add(
+            ball.get_radius(),
+            ball.get_position(),
+            ball.get_color(),
+            ball.get_mass(),
+            ball.get_velocity(),
+        )
+
+    def remove(self, index: int) -> None:
+        """Remove a ball. The last ball takes its index."""
+        if self.bodies.remove(index) is not None:
+            self._colors[index] = self._colors[-1]
+            self.pair_cache.reset()
+        self._colors.pop()
+
+    def clear(self) -> None:
+        self.bodies.clear()
+        self.pair_cache.reset()
+        self._colors.clear()
+
+    def get_colors(self) -> list[pygame.color.Color]:
+        return self._colors
+
+    def get_kinetic_energies(self) -> np.ndarray:
+        return kinetic_energies(self.bodies.velocities, self.bodies.masses)
+
+    def collide(self) -> None:
+        bodies = self.bodies
+        self.pair_cache.update(
+            bodies.positions, np.repeat(bodies.radii[:, None], 2, axis=1)
+        )
+        resolve_collisions(
+            bodies.positions,
+            bodies.velocities,
+            bodies.radii,
+            bodies.masses,
+            self.pair_cache.get_pairs(),
+        )
+
+    def update(self, resolution: tuple[int, int], time_step: float) -> None:
+        bodies = self.bodies
+        bounce_borders(bodies.positions, bodies.velocities, bodies.radii, resolution)
+        integrate(bodies.positions, bodies.velocities, time_step)
+
+
 class BallRenderer:
     def draw(self, screen: pygame.surface.Surface, obj: Ball) -> None:
         pygame.draw.circle(
@@ -126,6 +205,17 @@ class BallRenderer:
         )
 
 
+class BallSetRenderer:
+    def draw(self, screen: pygame.surface.Surface, obj: BallSet) -> None:
+        draw_circle = pygame.draw.circle
+        for color, (x, y), radius in zip(
+            obj.get_colors(),
+            obj.bodies.positions.tolist(),
+            obj.bodies.radii.tolist(),
+        ):
+            draw_circle(screen, color, (int(x), int(y)), radius)
+
+
 def circle_intersects_rect(cx, cy, radius, rx_min, ry_min, rx_max, ry_max) -> bool:
     """
     Check if a circle intersects an axis-aligned rectangle.
@@ -182,9 +272,13 @@ def exchange_momentum(ball_1: Ball, ball_2: Ball, coe: float) -> None:
     ball_2.set_velocity(new_vel_2)
 
 
-def move_ball_colliding(ball_1: Ball, ball_2: Ball):
+def move_ball_colliding(
+    ball_1: Ball, ball_2: Ball, rng: random.Random | None = None
+) -> None:
     if ball_1.get_position() == ball_2.get_position():
-        ball_1.move(ball_1.get_position() + (random.random(), random.random()))
+        # Pass a seeded rng to keep the separation reproducible.
+        rng = rng or random
+        ball_1.move(ball_1.get_position() + (rng.random(), rng.random()))
     delta_vector = ball_1.get_position() - ball_2.get_position()
     center_distance = delta_vector.magnitude()
     normal_vector = delta_vector / center_distance
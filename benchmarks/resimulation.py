@@ -0,0 +1,69 @@
+"""Measure how many fixed steps per second the engine re-simulates.
+
+Run with ``python -m pygmk2d.benchmarks.resimulation`` from the parent directory
+of the package.
+"""
+
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+import argparse
+import time
+
+from ..core.engine import Engine
+from ..ecs.component import Component
+from ..ecs.entity_manager import EntityManager
+from ..ecs.system import System
+
+
+@dataclass
+class Body(Component):
+    position: tuple[float, float] = (0.0, 0.0)
+    velocity: tuple[float, float] = (0.0, 0.0)
+
+
+class MoveSystem(System):
+    def update(self, delta_time: float) -> None:
+        for entity in self._ecs.query_by_type(Body):
+            body = self._ecs.get_component_mut(entity, Body)
+            body.position = (
+                body.position[0] + body.velocity[0] * delta_time,
+                body.position[1] + body.velocity[1] * delta_time,
+            )
+
+
+def make_engine(bodies: int, frames: int) -> Engine:
+    em = EntityManager()
+    engine = Engine(em, MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    engine.add_fixed_delta_system(MoveSystem)
+    engine.enable_rollback(frames=frames, seed=0)
+    for _ in range(bodies):
+        velocity = (engine.rng.uniform(-100, 100), engine.rng.uniform(-100, 100))
+        em.add_component(em.create_entity(), Body(velocity=velocity))
+    return engine
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bodies", type=int, default=1000)
+    parser.add_argument("--frames", type=int, default=8)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    engine = make_engine(args.bodies, args.frames)
+    engine.resimulate([None] * args.frames)
+    steps = 0
+    start = time.perf_counter()
+    for _ in range(args.rounds):
+        inputs = engine.rollback(engine.fixed_tick - args.frames)
+        engine.resimulate(inputs)
+        steps += len(inputs)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{args.bodies} bodies, {args.frames} frame window: "
+        f"{steps / elapsed:.0f} re-simulated steps/s "
+        f"({elapsed / args.rounds * 1000:.2f} ms per rollback)"
+    )
+
+
+if __name__ == "__main__":
+    main()
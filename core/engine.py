@@ -1,3 +1,6 @@
+from typing import Any, Callable, Iterable, Optional, Sequence
+import random
+
 from .event_manager import EventManager
 from ..input.provider import InputProvider
 from ..render.context import RenderContext
@@ -6,7 +9,13 @@ from ..ecs.system import System
 from ..render.system import RenderSystem
 from ..input.manager import InputManager
 from .timing import Clock
+from .jobs import JobScheduler
+from .metrics import MetricsCollector
 from ..render.camera import Camera
+from ..render.interpolation import TransformHistory
+from ..ecs.component import Component
+from ..ecs.snapshot import restore_snapshot, take_snapshot
+from .rollback import RollbackBuffer, RollbackFrame
 
 
 class Engine:
@@ -22,15 +31,25 @@ class Engine:
     ) -> None:
         self.em = em
         self.render_system = RenderSystem(em, render_context, camera)
+        self.transform_history = TransformHistory(em)
         self.event_manager = event_manager
         self.input_manager = InputManager(event_manager, input_provider)
         self.clock = clock
+        self.jobs = JobScheduler(clock)
+        self.metrics = MetricsCollector()
         self.fixed_dt = fixed_dt
         self._fixed_delta_systems: list[System] = []
         self._variable_delta_systems: list[System] = []
         self.min_frame_time = 1 / 60  # Default to 60 FPS
         self.accumulator = 0.0
         self.running = False
+        # Fixed-step systems should draw random numbers from here, so a seeded
+        # run can be reproduced and re-simulated.
+        self.rng = random.Random()
+        self.fixed_tick = 0
+        self.input_handler: Optional[Callable[[Any], None]] = None
+        self.rollback_buffer: Optional[RollbackBuffer] = None
+        self._rollback_types: Optional[list[type[Component]]] = None
 
     def set_max_fps(self, fps: int) -> None:
         self.min_frame_time = 1 / fps
@@ -38,6 +57,97 @@ class Engine:
     def set_fixed_dt(self, fixed_dt: float) -> None:
         self.fixed_dt = fixed_dt
 
+    def set_interpolation(self, enabled: bool) -> None:
+        """Render world transforms blended between the last two fixed steps.
+
+        Off by default. Transforms are only captured after fixed steps, so an
+        entity moved by a variable-delta system or a job is drawn lagging behind
+        where it is. Only enable it when the world transforms are written in fixed
+        steps, or call ``transform_history.snap`` for entities moved elsewhere.
+        """
+        self.render_system.set_interpolation(
+            self.transform_history if enabled else None
+        )
+
+    def set_job_budget(self, budget: float) -> None:
+        self.jobs.set_budget(budget)
+
+    def set_seed(self, seed: int) -> None:
+        self.rng.seed(seed)
+
+    def set_input_handler(self, handler: Optional[Callable[[Any], None]]) -> None:
+        """Set the function feeding recorded inputs to the world before a fixed
+        step that is given inputs, e.g. while re-simulating."""
+        self.input_handler = handler
+
+    def enable_rollback(
+        self,
+        frames: int = 8,
+        seed: Optional[int] = None,
+        component_types: Optional[Iterable[type[Component]]] = None,
+    ) -> None:
+        """Keep a snapshot of the world before each of the last fixed steps.
+
+        Args:
+            frames (int, optional): Fixed steps that can be rolled back. Defaults to 8.
+            seed (Optional[int], optional): Seed of the engine RNG. Defaults to None.
+            component_types (Optional[Iterable[type[Component]]], optional): Only
+            snapshot these component types. Defaults to None, meaning every
+            registered type that is snapshotted, which leaves out the renderables.
+            Rolling back only rewrites these types.
+        """
+        if seed is not None:
+            self.set_seed(seed)
+        self.rollback_buffer = RollbackBuffer(frames)
+        self._rollback_types = (
+            list(component_types) if component_types is not None else None
+        )
+
+    def disable_rollback(self) -> None:
+        self.rollback_buffer = None
+
+    def fixed_step(self, inputs: Any = None) -> None:
+        """Run the fixed-step systems once, without rendering."""
+        if self.rollback_buffer is not None:
+            self.rollback_buffer.push(
+                RollbackFrame(
+                    self.fixed_tick,
+                    take_snapshot(self.em, self._rollback_types),
+                    self.rng.getstate(),
+                    inputs,
+                )
+            )
+        if inputs is not None and self.input_handler is not None:
+            self.input_handler(inputs)
+        for sys in self._fixed_delta_systems:
+            # A new change tick per system run lets each system tell apart its
+            # own writes from the ones made after it last ran.
+            self.em.advance_tick()
+            sys.update(self.fixed_dt)
+        self.em.commands.apply()
+        self.fixed_tick += 1
+
+    def rollback(self, to_tick: int) -> list[Any]:
+        """Restore the world as it was before the fixed step ``to_tick``.
+
+        Returns:
+            list[Any]: Inputs recorded for the undone steps, in order, to be
+            corrected and passed to resimulate
+        """
+        if self.rollback_buffer is None:
+            raise RuntimeError("Rollback is not enabled")
+        frame = self.rollback_buffer.get(to_tick)
+        self.em.commands.clear()
+        restore_snapshot(self.em, frame.snapshot)
+        self.rng.setstate(frame.rng_state)
+        self.fixed_tick = to_tick
+        return [frame.inputs for frame in self.rollback_buffer.truncate(to_tick)]
+
+    def resimulate(self, inputs: Sequence[Any]) -> None:
+        """Run one fixed step per input, without rendering."""
+        for step_inputs in inputs:
+            self.fixed_step(step_inputs)
+
     def add_fixed_delta_system(self, system: type[System]) -> None:
         self._fixed_delta_systems.append(system(self.em))
 
@@ -66,16 +176,23 @@ class Engine:
         self.event_manager.external.process_event_queue()
 
         while self.accumulator >= self.fixed_dt:
-            for sys in self._fixed_delta_systems:
-                sys.update(self.fixed_dt)
+            self.fixed_step()
             self.accumulator -= self.fixed_dt
+            if self.render_system.interpolation is not None:
+                self.transform_history.capture()
 
         for sys in self._variable_delta_systems:
+            self.em.advance_tick()
             sys.update(dt)
 
+        self.jobs.run()
+        self.em.commands.apply()
+
         self.event_manager.internal.process_event_queue()
+        self.metrics.update()
 
         alpha = self.accumulator / self.fixed_dt
+        self.em.advance_tick()
         self.render_system.render(alpha)
 
     def stop(self) -> None:
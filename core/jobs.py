@@ -0,0 +1,174 @@
+from collections.abc import Generator
+from enum import Enum, IntEnum, auto
+from typing import Any, Callable
+import heapq
+import itertools
+
+from .event_manager import LogPolicy
+from .timing import Clock
+
+
+class JobPriority(IntEnum):
+    CRITICAL = 0
+    HIGH = 1
+    NORMAL = 2
+    LOW = 3
+
+
+class JobState(Enum):
+    PENDING = auto()
+    RUNNING = auto()
+    DONE = auto()
+    CANCELLED = auto()
+    FAILED = auto()
+
+
+class JobError(Exception):
+    pass
+
+
+JobTask = Callable[[], Any] | Generator[Any, None, Any]
+
+
+class Job:
+    """A unit of deferred work.
+
+    A task is either a plain callable, which runs to completion in one step, or a
+    generator (or a callable returning one), which runs one ``next()`` per step and
+    may therefore yield mid-work to be resumed on a later frame.
+    """
+
+    def __init__(
+        self,
+        task: JobTask,
+        priority: JobPriority = JobPriority.NORMAL,
+        name: str | None = None,
+        on_done: Callable[["Job"], None] | None = None,
+    ) -> None:
+        self.priority = priority
+        self.name = name or getattr(task, "__name__", type(task).__name__)
+        self.on_done = on_done
+        self.state = JobState.PENDING
+        self.result: Any = None
+        self.error: BaseException | None = None
+        self.steps = 0
+        self._task = task
+        self._generator: Generator[Any, None, Any] | None = (
+            task if isinstance(task, Generator) else None
+        )
+
+    @property
+    def done(self) -> bool:
+        return self.state in (JobState.DONE, JobState.CANCELLED, JobState.FAILED)
+
+    def cancel(self) -> None:
+        if self.done:
+            return
+        if self._generator is not None:
+            self._generator.close()
+        self.state = JobState.CANCELLED
+
+    def step(self) -> bool:
+        """Advance the job by one step. Returns True once the job has finished."""
+        self.state = JobState.RUNNING
+        self.steps += 1
+        if self._generator is None:
+            result = self._task()
+            if not isinstance(result, Generator):
+                self._finish(result)
+                return True
+            self._generator = result
+        try:
+            next(self._generator)
+        except StopIteration as stop:
+            self._finish(stop.value)
+            return True
+        return False
+
+    def _finish(self, result: Any) -> None:
+        self.result = result
+        self.state = JobState.DONE
+
+
+class JobScheduler:
+    """Runs queued jobs inside a per-frame time budget.
+
+    Jobs are picked by priority, then by submission order. A generator job that
+    yields is re-queued behind jobs of the same priority, so long computations are
+    interleaved and amortized across frames. At least one step is run per call to
+    ``run`` so queued work always makes progress, even with a tiny budget.
+    """
+
+    def __init__(
+        self,
+        clock: Clock,
+        budget: float = 0.002,
+        log_policy: LogPolicy = LogPolicy.PRINT,
+    ) -> None:
+        self.clock = clock
+        self.budget = budget
+        self.log_policy = log_policy
+        self._queue: list[tuple[int, int, Job]] = []
+        self._counter = itertools.count()
+
+    def set_budget(self, budget: float) -> None:
+        self.budget = budget
+
+    def submit(
+        self,
+        task: JobTask,
+        priority: JobPriority = JobPriority.NORMAL,
+        name: str | None = None,
+        on_done: Callable[[Job], None] | None = None,
+    ) -> Job:
+        job = Job(task, priority, name, on_done)
+        self._push(job)
+        return job
+
+    def pending(self) -> int:
+        return sum(1 for _, _, job in self._queue if not job.done)
+
+    def clear(self) -> None:
+        for _, _, job in self._queue:
+            job.cancel()
+        self._queue.clear()
+
+    def run(self, budget: float | None = None) -> int:
+        """Run queued jobs until the budget (in seconds) is used up.
+
+        Returns the number of job steps executed.
+        """
+        if not self._queue:
+            return 0
+        budget = self.budget if budget is None else budget
+        deadline = self.clock.now() + budget
+        steps = 0
+        while self._queue:
+            _, _, job = heapq.heappop(self._queue)
+            if job.done:
+                continue
+            try:
+                finished = job.step()
+            except Exception as e:
+                finished = True
+                self._fail(job, e)
+            steps += 1
+            if finished:
+                if job.on_done is not None:
+                    job.on_done(job)
+            else:
+                self._push(job)
+            if self.clock.now() >= deadline:
+                break
+        return steps
+
+    def _push(self, job: Job) -> None:
+        heapq.heappush(self._queue, (job.priority, next(self._counter), job))
+
+    def _fail(self, job: Job, error: Exception) -> None:
+        job.state = JobState.FAILED
+        job.error = error
+        if self.log_policy == LogPolicy.PRINT:
+            print(f"Error in job: {job.name}")
+        elif self.log_policy == LogPolicy.RAISE:
+            raise JobError(f"Error in job: {job.name}") from error
@@ -0,0 +1,182 @@
+from enum import Enum
+from operator import attrgetter
+from typing import TYPE_CHECKING, Any, Callable, Optional
+import numpy as np
+
+if TYPE_CHECKING:
+    from ..ecs.component import Component
+    from ..ecs.entity_manager import EntityManager
+
+MetricSource = Callable[[], np.ndarray]
+
+
+class Reduction(Enum):
+    SUM = "sum"
+    MIN = "min"
+    MAX = "max"
+    MEAN = "mean"
+    HISTOGRAM = "histogram"
+
+
+def reduce_values(
+    values: np.ndarray,
+    reduction: Reduction,
+    bins: int = 10,
+    value_range: Optional[tuple[float, float]] = None,
+) -> Any:
+    """Reduce an array of values at once.
+
+    Rows of a 2D array are reduced together, e.g. the sum of vectors. Min, max
+    and mean of no values are None, and a histogram is a (counts, edges) pair.
+    """
+    if reduction is Reduction.SUM:
+        total = values.sum(axis=0)
+        return float(total) if total.ndim == 0 else total
+    if reduction is Reduction.HISTOGRAM:
+        return np.histogram(values, bins, value_range)
+    if not len(values):
+        return None
+    if reduction is Reduction.MIN:
+        result = values.min(axis=0)
+    elif reduction is Reduction.MAX:
+        result = values.max(axis=0)
+    else:
+        result = values.mean(axis=0)
+    return float(result) if result.ndim == 0 else result
+
+
+def component_column(
+    em: "EntityManager", component_type: "type[Component]", field: str
+) -> np.ndarray:
+    """Read one field of every component of a type into an array.
+
+    Numbers give a 1D array and tuples of numbers one row per component.
+    """
+    components = em.get_components(em.query_by_type(component_type), component_type)
+    values = list(map(attrgetter(field), components))
+    if values and isinstance(values[0], tuple):
+        return np.array(values, dtype=float).reshape(len(values), -1)
+    return np.fromiter(values, dtype=float, count=len(values))
+
+
+class Metric:
+    def __init__(
+        self,
+        source: MetricSource,
+        reduction: Reduction = Reduction.SUM,
+        every: int = 1,
+        bins: int = 10,
+        value_range: Optional[tuple[float, float]] = None,
+    ) -> None:
+        """A reduction of an array source, sampled every ``every`` frames
+
+        Args:
+            source (MetricSource): Returns the values to reduce
+            reduction (Reduction, optional): Defaults to Reduction.SUM.
+            every (int, optional): Frames between samples. Defaults to 1.
+            bins (int, optional): Histogram bins. Defaults to 10.
+            value_range (Optional[tuple[float, float]], optional): Histogram range.
+            Defaults to the range of the values.
+        """
+        if every < 1:
+            raise ValueError("A metric must be sampled at least every frame")
+        self.source = source
+        self.reduction = reduction
+        self.every = every
+        self.bins = bins
+        self.value_range = value_range
+        self.value: Any = None
+        # Frame of the last sample, None before the first one.
+        self.sampled_frame: Optional[int] = None
+
+    def sample(self, frame: int) -> Any:
+        self.value = reduce_values(
+            self.source(), self.reduction, self.bins, self.value_range
+        )
+        self.sampled_frame = frame
+        return self.value
+
+
+class MetricsCollector:
+    """Named metrics sampled once per frame by the engine.
+
+    Each metric reduces an array in one vectorized call, and only on the frames
+    it is due, so diagnostics such as the total kinetic energy of a HUD cost
+    nothing on the other frames. Metrics are sampled on their first update.
+    """
+
+    def __init__(self) -> None:
+        self.frame = 0
+        self._metrics: dict[str, Metric] = {}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._metrics
+
+    def __len__(self) -> int:
+        return len(self._metrics)
+
+    def add(
+        self,
+        name: str,
+        source: MetricSource,
+        reduction: Reduction = Reduction.SUM,
+        every: int = 1,
+        bins: int = 10,
+        value_range: Optional[tuple[float, float]] = None,
+    ) -> Metric:
+        metric = Metric(source, reduction, every, bins, value_range)
+        self._metrics[name] = metric
+        return metric
+
+    def add_component_field(
+        self,
+        name: str,
+        em: "EntityManager",
+        component_type: "type[Component]",
+        field: str,
+        reduction: Reduction = Reduction.SUM,
+        every: int = 1,
+        bins: int = 10,
+        value_range: Optional[tuple[float, float]] = None,
+    ) -> Metric:
+        """Reduce a field of every component of a type, see component_column."""
+        return self.add(
+            name,
+            lambda: component_column(em, component_type, field),
+            reduction,
+            every,
+            bins,
+            value_range,
+        )
+
+    def remove(self, name: str) -> None:
+        self._metrics.pop(name, None)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Get the last sampled value of a metric."""
+        metric = self._metrics.get(name)
+        return default if metric is None else metric.value
+
+    def get_metric(self, name: str) -> Metric:
+        metric = self._metrics.get(name)
+        if metric is None:
+            raise KeyError(f"Could not find metric: {name}")
+        return metric
+
+    def values(self) -> dict[str, Any]:
+        return {name: metric.value for name, metric in self._metrics.items()}
+
+    def update(self) -> list[str]:
+        """Sample the metrics due this frame, then advance the frame.
+
+        Returns:
+            list[str]: Names of the metrics sampled
+        """
+        sampled = []
+        for name, metric in self._metrics.items():
+            last = metric.sampled_frame
+            if last is None or self.frame - last >= metric.every:
+                metric.sample(self.frame)
+                sampled.append(name)
+        self.frame += 1
+        return sampled
@@ -0,0 +1,61 @@
+from collections import deque
+from dataclasses import dataclass
+from typing import Any
+
+from ..ecs.snapshot import WorldSnapshot
+
+
+@dataclass
+class RollbackFrame:
+    """World state at the start of a fixed step, and the input that step used."""
+
+    tick: int
+    snapshot: WorldSnapshot
+    rng_state: Any
+    inputs: Any = None
+
+
+class RollbackBuffer:
+    """Ring buffer of the last ``capacity`` fixed steps."""
+
+    def __init__(self, capacity: int = 8) -> None:
+        if capacity < 1:
+            raise ValueError("Rollback capacity must be at least 1")
+        self._frames: deque[RollbackFrame] = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @property
+    def capacity(self) -> int:
+        return self._frames.maxlen
+
+    @property
+    def oldest_tick(self) -> int | None:
+        return self._frames[0].tick if self._frames else None
+
+    def push(self, frame: RollbackFrame) -> None:
+        self._frames.append(frame)
+
+    def get(self, tick: int) -> RollbackFrame:
+        """Get the frame of a fixed step tick still inside the buffer."""
+        if not self._frames:
+            raise KeyError(f"No rollback frame for tick {tick}")
+        index = tick - self._frames[0].tick
+        if not 0 <= index < len(self._frames):
+            raise KeyError(
+                f"Tick {tick} is outside the rollback window "
+                f"[{self._frames[0].tick}, {self._frames[-1].tick}]"
+            )
+        return self._frames[index]
+
+    def truncate(self, tick: int) -> list[RollbackFrame]:
+        """Drop and return the frames from a tick onwards."""
+        dropped = []
+        while self._frames and self._frames[-1].tick >= tick:
+            dropped.append(self._frames.pop())
+        dropped.reverse()
+        return dropped
+
+    def clear(self) -> None:
+        self._frames.clear()
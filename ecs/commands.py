@@ -0,0 +1,79 @@
+from typing import TYPE_CHECKING, Optional
+from .component import Component
+
+if TYPE_CHECKING:
+    from .entity_manager import EntityManager
+
+
+class CommandBuffer:
+    """Records structural changes to apply later in one batch.
+
+    Systems iterating over query results record spawns, despawns and component
+    adds and removes here instead of mutating the EntityManager. ``apply`` then
+    updates storage one component type at a time, in component id and entity
+    order.
+
+    Only the last add or remove of a component type on an entity is kept, and
+    despawns are applied after every other command of the batch.
+    """
+
+    def __init__(self, em: "EntityManager") -> None:
+        self.em = em
+        # (entity, component type) -> component to add, or None to remove.
+        self._changes: dict[tuple[int, type[Component]], Optional[Component]] = {}
+        self._despawned: set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._changes) + len(self._despawned)
+
+    def spawn(self, *components: Component) -> int:
+        """Reserve a new entity id now and add its components on apply."""
+        entity_id = self.em.create_entity()
+        for component in components:
+            self.add(entity_id, component)
+        return entity_id
+
+    def despawn(self, entity_id: int) -> None:
+        self._despawned.add(entity_id)
+
+    def add(self, entity_id: int, component: Component) -> None:
+        self._changes[(entity_id, type(component))] = component
+
+    def remove(self, entity_id: int, component_type: type[Component]) -> None:
+        self._changes[(entity_id, component_type)] = None
+
+    def clear(self) -> None:
+        self._changes = {}
+        self._despawned = set()
+
+    def apply(self) -> int:
+        """Apply and clear the recorded commands.
+
+        Returns:
+            int: Number of commands applied
+        """
+        if not self._changes and not self._despawned:
+            return 0
+        changes, despawned = self._changes, self._despawned
+        # Listeners notified below may record new commands for the next batch.
+        self.clear()
+        added: dict[type[Component], list[tuple[int, Component]]] = {}
+        removed: dict[type[Component], list[int]] = {}
+        for (entity_id, component_type), component in changes.items():
+            if entity_id in despawned:
+                continue
+            if component is None:
+                removed.setdefault(component_type, []).append(entity_id)
+            else:
+                added.setdefault(component_type, []).append((entity_id, component))
+        em = self.em
+        for component_type in sorted(removed, key=em.registry.register):
+            em.remove_components(sorted(removed[component_type]), component_type)
+        for component_type in sorted(added, key=em.registry.register):
+            pairs = sorted(added[component_type], key=lambda pair: pair[0])
+            em.add_components(
+                [entity_id for entity_id, _ in pairs],
+                [component for _, component in pairs],
+            )
+        em.remove_entities(sorted(despawned))
+        return len(changes) + len(despawned)
@@ -1,4 +1,9 @@
+from typing import ClassVar
+
+
 class Component:
     """Base class for all components in the ECS architecture."""
 
-    pass
+    # Components holding callbacks or other live objects set this to False, so
+    # world snapshots leave them out.
+    snapshotted: ClassVar[bool] = True
@@ -1,10 +1,76 @@
+from typing import Callable, Iterable, Optional
 from .component import Component
+from .commands import CommandBuffer
+from .registry import ComponentRegistry
+
+ComponentListener = Callable[[int, Component], None]
 
 
 class EntityManager:
-    def __init__(self):
-        self._components: dict[str, dict[int, Component]] = {}
+    def __init__(self, registry: Optional[ComponentRegistry] = None):
+        self.registry = registry or ComponentRegistry()
+        # Indexed by component id.
+        self._components: list[dict[int, Component]] = []
+        self._listeners: list[
+            list[tuple[Optional[ComponentListener], Optional[ComponentListener]]]
+        ] = []
+        # Per component id, entity -> tick of the last add or change. Entries are
+        # moved to the end when stamped, so they stay in tick order.
+        self._added_ticks: list[dict[int, int]] = []
+        self._changed_ticks: list[dict[int, int]] = []
+        # Bit i is set when the entity has the component with id i.
+        self._masks: dict[int, int] = {}
         self._next_entity_id: int = 0
+        self.tick: int = 0
+        # Structural changes deferred to the next sync point.
+        self.commands = CommandBuffer(self)
+
+    def _get_id(self, component_type: type[Component]) -> int:
+        component_id = self.registry.register(component_type)
+        while len(self._components) <= component_id:
+            self._components.append({})
+            self._listeners.append([])
+            self._added_ticks.append({})
+            self._changed_ticks.append({})
+        return component_id
+
+    def register_listener(
+        self,
+        component_type: type[Component],
+        on_added: Optional[ComponentListener] = None,
+        on_removed: Optional[ComponentListener] = None,
+    ) -> None:
+        """Get notified when a component of the given type is added or removed."""
+        self._listeners[self._get_id(component_type)].append((on_added, on_removed))
+
+    def unregister_listener(
+        self,
+        component_type: type[Component],
+        on_added: Optional[ComponentListener] = None,
+        on_removed: Optional[ComponentListener] = None,
+    ) -> None:
+        listeners = self._listeners[self._get_id(component_type)]
+        if (on_added, on_removed) in listeners:
+            listeners.remove((on_added, on_removed))
+
+    def _notify_added(
+        self, component_id: int, entity_id: int, component: Component
+    ) -> None:
+        for on_added, _ in self._listeners[component_id]:
+            if on_added is not None:
+                on_added(entity_id, component)
+
+    def _notify_removed(
+        self, component_id: int, entity_id: int, component: Component
+    ) -> None:
+        for _, on_removed in self._listeners[component_id]:
+            if on_removed is not None:
+                on_removed(entity_id, component)
+
+    def advance_tick(self) -> int:
+        """Start a new change tick and return it."""
+        self.tick += 1
+        return self.tick
 
     def create_entity(self) -> int:
         entity_id = self._next_entity_id
@@ -12,58 +78,221 @@ class EntityManager:
         return entity_id
 
     def remove_entity(self, entity_id: int) -> None:
-        for component_dict in self._components.values():
-            if entity_id in component_dict.keys():
-                del component_dict[entity_id]
+        mask = self._masks.pop(entity_id, 0)
+        component_id = 0
+        while mask:
+            if mask & 1:
+                component = self._components[component_id].pop(entity_id)
+                del self._added_ticks[component_id][entity_id]
+                del self._changed_ticks[component_id][entity_id]
+                self._notify_removed(component_id, entity_id, component)
+            mask >>= 1
+            component_id += 1
+
+    def remove_entities(self, entity_ids: list[int]) -> None:
+        for entity_id in entity_ids:
+            self.remove_entity(entity_id)
+
+    def clear(self) -> None:
+        """Remove every entity, notifying listeners."""
+        self.remove_entities(list(self._masks))
 
     def add_component(self, entity_id: int, component: Component) -> None:
-        component_type = type(component).__name__
-        if component_type not in self._components:
-            self._components[component_type] = {}
-        self._components[component_type][entity_id] = component
+        component_id = self._get_id(type(component))
+        store = self._components[component_id]
+        previous = store.get(entity_id)
+        store[entity_id] = component
+        self._masks[entity_id] = self._masks.get(entity_id, 0) | 1 << component_id
+        _stamp(self._added_ticks[component_id], entity_id, self.tick)
+        _stamp(self._changed_ticks[component_id], entity_id, self.tick)
+        if previous is not None:
+            self._notify_removed(component_id, entity_id, previous)
+        self._notify_added(component_id, entity_id, component)
+
+    def add_components(
+        self, entity_ids: list[int], components: list[Component]
+    ) -> None:
+        """Add components of one exact type to many entities at once."""
+        if not components:
+            return
+        component_id = self._get_id(type(components[0]))
+        store = self._components[component_id]
+        added_ticks = self._added_ticks[component_id]
+        changed_ticks = self._changed_ticks[component_id]
+        listeners = self._listeners[component_id]
+        masks = self._masks
+        bit = 1 << component_id
+        tick = self.tick
+        for entity_id, component in zip(entity_ids, components):
+            previous = store.get(entity_id)
+            store[entity_id] = component
+            masks[entity_id] = masks.get(entity_id, 0) | bit
+            _stamp(added_ticks, entity_id, tick)
+            _stamp(changed_ticks, entity_id, tick)
+            if listeners:
+                if previous is not None:
+                    self._notify_removed(component_id, entity_id, previous)
+                self._notify_added(component_id, entity_id, component)
 
     def has_component(self, entity_id: int, component_type: type[Component]) -> bool:
-        component_type_name = component_type.__name__
+        component_id = self.registry.get_id(component_type)
         return (
-            component_type_name in self._components
-            and entity_id in self._components[component_type_name]
+            component_id is not None
+            and self._masks.get(entity_id, 0) >> component_id & 1 == 1
         )
 
     def remove_component(self, entity_id: int, component_type: type[Component]) -> None:
-        component_type_name = component_type.__name__
-        if component_type_name in self._components:
-            if entity_id in self._components[component_type_name]:
-                del self._components[component_type_name][entity_id]
+        component_id = self.registry.get_id(component_type)
+        if component_id is None or component_id >= len(self._components):
+            return
+        component = self._components[component_id].pop(entity_id, None)
+        if component is not None:
+            self._masks[entity_id] &= ~(1 << component_id)
+            del self._added_ticks[component_id][entity_id]
+            del self._changed_ticks[component_id][entity_id]
+            self._notify_removed(component_id, entity_id, component)
+
+    def remove_components(
+        self, entity_ids: list[int], component_type: type[Component]
+    ) -> None:
+        """Remove a component type from many entities at once."""
+        component_id = self.registry.get_id(component_type)
+        if component_id is None or component_id >= len(self._components):
+            return
+        store = self._components[component_id]
+        added_ticks = self._added_ticks[component_id]
+        changed_ticks = self._changed_ticks[component_id]
+        listeners = self._listeners[component_id]
+        masks = self._masks
+        keep = ~(1 << component_id)
+        for entity_id in entity_ids:
+            component = store.pop(entity_id, None)
+            if component is None:
+                continue
+            masks[entity_id] &= keep
+            del added_ticks[entity_id]
+            del changed_ticks[entity_id]
+            if listeners:
+                self._notify_removed(component_id, entity_id, component)
 
     def get_component(
         self, entity_id: int, component_type: type[Component]
     ) -> Component | None:
-        component_type_name = component_type.__name__
-        return self._components.get(component_type_name, {}).get(entity_id, None)
+        component_id = self.registry.get_id(component_type)
+        if component_id is None or component_id >= len(self._components):
+            return None
+        return self._components[component_id].get(entity_id, None)
+
+    def get_components(
+        self, entity_ids: Iterable[int], component_type: type[Component]
+    ) -> list[Component]:
+        """Get a component type of many entities, which must all have it."""
+        component_id = self.registry.get_id(component_type)
+        if component_id is None:
+            raise KeyError(f"Unknown component type: {component_type.__name__}")
+        return list(map(self._components[component_id].__getitem__, entity_ids))
+
+    def get_component_mut(
+        self, entity_id: int, component_type: type[Component]
+    ) -> Component | None:
+        """Get a component to write to, marking it changed at the current tick."""
+        component = self.get_component(entity_id, component_type)
+        if component is not None:
+            component_id = self.registry.get_id(component_type)
+            _stamp(self._changed_ticks[component_id], entity_id, self.tick)
+        return component
 
-    def get_all_components(self, entity_id: int) -> dict[str, Component]:
+    def mark_changed(self, entity_id: int, component_type: type[Component]) -> None:
+        if self.has_component(entity_id, component_type):
+            component_id = self.registry.get_id(component_type)
+            _stamp(self._changed_ticks[component_id], entity_id, self.tick)
+
+    def changed_since(
+        self, component_type: type[Component], tick: int
+    ) -> tuple[int, ...]:
+        """Get the entities whose component was added or changed after a tick.
+
+        Only the changed entries are visited, so the cost is proportional to the
+        number of changes. A system that saves ``em.tick`` when it runs and passes
+        it here next time sees every change made after it ran, but not its own.
+        """
+        component_id = self.registry.get_id(component_type)
+        if component_id is None or component_id >= len(self._changed_ticks):
+            return ()
+        return _stamped_after(self._changed_ticks[component_id], tick)
+
+    def added_since(
+        self, component_type: type[Component], tick: int
+    ) -> tuple[int, ...]:
+        """Get the entities whose component was added after a tick."""
+        component_id = self.registry.get_id(component_type)
+        if component_id is None or component_id >= len(self._added_ticks):
+            return ()
+        return _stamped_after(self._added_ticks[component_id], tick)
+
+    def get_all_components(self, entity_id: int) -> dict[type[Component], Component]:
         result = {}
-        for component_type, component_dict in self._components.items():
-            if entity_id in component_dict:
-                result[component_type] = component_dict[entity_id]
+        mask = self._masks.get(entity_id, 0)
+        component_id = 0
+        while mask:
+            if mask & 1:
+                result[self.registry.get_type(component_id)] = self._components[
+                    component_id
+                ][entity_id]
+            mask >>= 1
+            component_id += 1
         return result
 
+    def get_mask(self, entity_id: int) -> int:
+        """Get the bitmask of the component ids the entity has."""
+        return self._masks.get(entity_id, 0)
+
     def query_by_type(self, component_type: type[Component]) -> tuple[int]:
-        if component_type.__name__ not in self._components:
+        component_id = self.registry.get_id(component_type)
+        if component_id is None or component_id >= len(self._components):
             return ()
-        return tuple(self._components[component_type.__name__].keys())
+        return tuple(self._components[component_id].keys())
 
-    def filter_entities(self, component_types: list[type[Component]]) -> tuple[int]:
+    def filter_entities(self, component_types: list[type[Component]]) -> set[int]:
         if not component_types:
-            return []
-
-        component_type_names = [ct.__name__ for ct in component_types]
-        component_type_names.sort(key=lambda x: len(self._components.get(x, {})))
-        common_entities = set(self._components.get(component_type_names[0], {}).keys())
-        for component_type_name in component_type_names[1:]:
-            common_entities = set(
-                entity_id
-                for entity_id in common_entities
-                if entity_id in self._components.get(component_type_name, {})
-            )
-        return common_entities
+            return set()
+
+        component_ids = [self._get_id(ct) for ct in component_types]
+        smallest = min(component_ids, key=lambda x: len(self._components[x]))
+        return self.query_mask(self.registry.get_mask(component_types), smallest)
+
+    def query_mask(self, mask: int, component_id: Optional[int] = None) -> set[int]:
+        """Get the entities having every component in the mask.
+
+        Args:
+            mask (int): Bitmask of component ids, see ComponentRegistry.get_mask
+            component_id (Optional[int], optional): Id of a component in the mask
+            whose entities are scanned. Defaults to the lowest id in the mask.
+        """
+        if not mask:
+            return set()
+        if component_id is None:
+            component_id = (mask & -mask).bit_length() - 1
+        if component_id >= len(self._components):
+            return set()
+        masks = self._masks
+        return set(
+            entity_id
+            for entity_id in self._components[component_id]
+            if masks[entity_id] & mask == mask
+        )
+
+
+def _stamp(ticks: dict[int, int], entity_id: int, tick: int) -> None:
+    ticks.pop(entity_id, None)
+    ticks[entity_id] = tick
+
+
+def _stamped_after(ticks: dict[int, int], tick: int) -> tuple[int, ...]:
+    entities = []
+    for entity_id in reversed(ticks):
+        if ticks[entity_id] <= tick:
+            break
+        entities.append(entity_id)
+    entities.reverse()
+    return tuple(entities)
@@ -0,0 +1,133 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from .component import Component
+from .entity_manager import EntityManager
+
+Prefab = Callable[[], Iterable[Component]]
+ResetFunction = Callable[[int, list[Component]], None]
+
+
+@dataclass
+class PoolStats:
+    hits: int = 0
+    misses: int = 0
+    despawned: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        spawned = self.hits + self.misses
+        return self.hits / spawned if spawned else 0.0
+
+
+class EntityPool:
+    """Reuses entities built from a prefab instead of allocating new ones.
+
+    The prefab is called once per pooled entity to build its components. Despawning
+    only takes the components out of the EntityManager, keeping the entity id and
+    component objects in the pool. Spawning resets every component to the fields it
+    had when it was built, then adds them back, so listeners and systems see a
+    normal add and remove.
+
+    Fields, including ``__slots__``, are reset with ``setattr``, through the
+    public property of private fields that have one. Mutable field values are
+    therefore shared with the prefab's original state. Use ``reset`` to
+    reinitialize those in place.
+    """
+
+    def __init__(
+        self,
+        em: EntityManager,
+        prefab: Prefab,
+        size: int = 0,
+        reset: Optional[ResetFunction] = None,
+    ) -> None:
+        self.em = em
+        self.prefab = prefab
+        self.reset = reset
+        self.stats = PoolStats()
+        self._components: dict[int, list[Component]] = {}
+        self._defaults: dict[int, list[dict[str, Any]]] = {}
+        self._free: list[int] = []
+        self._active: set[int] = set()
+        self.prewarm(size)
+
+    def prewarm(self, count: int) -> None:
+        """Allocate inactive entities ahead of time."""
+        for _ in range(count):
+            self._free.append(self._allocate())
+
+    def spawn(self) -> int:
+        if self._free:
+            self.stats.hits += 1
+            entity_id = self._free.pop()
+            components = self._components[entity_id]
+            for component, defaults in zip(components, self._defaults[entity_id]):
+                _reset_fields(component, defaults)
+        else:
+            self.stats.misses += 1
+            entity_id = self._allocate()
+            components = self._components[entity_id]
+        if self.reset is not None:
+            self.reset(entity_id, components)
+        for component in components:
+            self.em.add_component(entity_id, component)
+        self._active.add(entity_id)
+        return entity_id
+
+    def despawn(self, entity_id: int) -> None:
+        if entity_id not in self._active:
+            raise ValueError(f"Entity is not active in this pool: {entity_id}")
+        self._active.remove(entity_id)
+        for component in self._components[entity_id]:
+            self.em.remove_component(entity_id, type(component))
+        self._free.append(entity_id)
+        self.stats.despawned += 1
+
+    def is_active(self, entity_id: int) -> bool:
+        return entity_id in self._active
+
+    def get_active(self) -> tuple[int, ...]:
+        return tuple(self._active)
+
+    @property
+    def active_count(self) -> int:
+        return len(self._active)
+
+    @property
+    def free_count(self) -> int:
+        return len(self._free)
+
+    def despawn_all(self) -> None:
+        for entity_id in list(self._active):
+            self.despawn(entity_id)
+
+    def _allocate(self) -> int:
+        entity_id = self.em.create_entity()
+        components = list(self.prefab())
+        self._components[entity_id] = components
+        self._defaults[entity_id] = [_get_fields(component) for component in components]
+        return entity_id
+
+
+def _get_fields(component: Component) -> dict[str, Any]:
+    fields = dict(getattr(component, "__dict__", {}))
+    for cls in type(component).__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__") and hasattr(component, name):
+                fields[name] = getattr(component, name)
+    return fields
+
+
+def _reset_fields(component: Component, fields: dict[str, Any]) -> None:
+    component_type = type(component)
+    for name, value in fields.items():
+        # A private field behind a property is set through it, so its setter
+        # runs, e.g. to notify the render order index.
+        public = name[1:] if name.startswith("_") else ""
+        attribute = getattr(component_type, public, None) if public else None
+        if isinstance(attribute, property) and attribute.fset is not None:
+            setattr(component, public, value)
+        else:
+            setattr(component, name, value)
@@ -0,0 +1,40 @@
+from .component import Component
+
+
+class ComponentRegistry:
+    """Assigns every component class a small integer id.
+
+    Ids are handed out in registration order and are used as bit positions in
+    entity component masks, so classes that share a name stay distinct.
+    """
+
+    def __init__(self) -> None:
+        self._ids: dict[type[Component], int] = {}
+        self._types: list[type[Component]] = []
+
+    def register(self, component_type: type[Component]) -> int:
+        """Get the id of a component class, registering it on first use."""
+        component_id = self._ids.get(component_type)
+        if component_id is None:
+            component_id = self._ids[component_type] = len(self._types)
+            self._types.append(component_type)
+        return component_id
+
+    def get_id(self, component_type: type[Component]) -> int | None:
+        """Get the id of a registered component class, or None."""
+        return self._ids.get(component_type)
+
+    def get_type(self, component_id: int) -> type[Component]:
+        return self._types[component_id]
+
+    def get_mask(self, component_types: list[type[Component]]) -> int:
+        mask = 0
+        for component_type in component_types:
+            mask |= 1 << self.register(component_type)
+        return mask
+
+    def __contains__(self, component_type: type[Component]) -> bool:
+        return component_type in self._ids
+
+    def __len__(self) -> int:
+        return len(self._types)
@@ -0,0 +1,349 @@
+from array import array
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional
+from itertools import chain
+from operator import itemgetter
+import importlib
+import pickle
+import struct
+
+from .component import Component
+from .entity_manager import EntityManager
+
+SNAPSHOT_MAGIC = b"PGS1"
+_HEADER = struct.Struct("<4sI")
+
+# Column kinds: "q" ints, "d" floats, "dN" N-tuples of floats, "o" a pickled list
+# of values, which also keeps mutable values from being shared with the world.
+Column = tuple[str, Any]
+
+
+class SnapshotError(Exception):
+    pass
+
+
+@dataclass
+class ComponentColumns:
+    """Every component of one type, stored as one column per field."""
+
+    component_type: type[Component]
+    entities: array
+    fields: dict[str, Column]
+    # Only set in deltas: entities that lost the component since the base.
+    removed: array = field(default_factory=lambda: array("q"))
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+
+@dataclass
+class WorldSnapshot:
+    tick: int
+    next_entity_id: int
+    columns: list[ComponentColumns]
+    # Tick of the snapshot a delta applies to, None for a full snapshot.
+    base_tick: Optional[int] = None
+
+    @property
+    def is_delta(self) -> bool:
+        return self.base_tick is not None
+
+    def to_bytes(self) -> bytes:
+        """Serialize the snapshot.
+
+        A small pickled header describes the columns, followed by the raw bytes of
+        every column buffer.
+        """
+        buffers: list[bytes] = []
+        columns_meta = []
+        for columns in self.columns:
+            buffers.append(columns.entities.tobytes())
+            buffers.append(columns.removed.tobytes())
+            fields_meta = []
+            for name, (kind, data) in columns.fields.items():
+                raw = data if kind == "o" else data.tobytes()
+                buffers.append(raw)
+                fields_meta.append((name, kind, len(raw)))
+            columns_meta.append(
+                (
+                    columns.component_type.__module__,
+                    columns.component_type.__qualname__,
+                    len(columns.entities),
+                    len(columns.removed),
+                    fields_meta,
+                )
+            )
+        meta = pickle.dumps(
+            (self.tick, self.next_entity_id, self.base_tick, columns_meta)
+        )
+        return b"".join([_HEADER.pack(SNAPSHOT_MAGIC, len(meta)), meta, *buffers])
+
+    @classmethod
+    def from_bytes(
+        cls, data: bytes, types: Optional[Iterable[type[Component]]] = None
+    ) -> "WorldSnapshot":
+        """Read a serialized snapshot.
+
+        Args:
+            data (bytes): Output of to_bytes
+            types (Optional[Iterable[type[Component]]], optional): Component classes
+            to resolve by name before importing them from their module, e.g. for
+            classes defined inside functions. Defaults to None.
+        """
+        magic, meta_size = _HEADER.unpack_from(data, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise SnapshotError("Not a world snapshot")
+        offset = _HEADER.size + meta_size
+        tick, next_entity_id, base_tick, columns_meta = pickle.loads(
+            data[_HEADER.size : offset]
+        )
+        known = {(t.__module__, t.__qualname__): t for t in types or ()}
+        view = memoryview(data)
+        columns = []
+        for module, qualname, count, removed_count, fields_meta in columns_meta:
+            component_type = known.get((module, qualname)) or _import_type(
+                module, qualname
+            )
+            entities = array("q")
+            entities.frombytes(view[offset : offset + count * 8])
+            offset += count * 8
+            removed = array("q")
+            removed.frombytes(view[offset : offset + removed_count * 8])
+            offset += removed_count * 8
+            fields = {}
+            for name, kind, size in fields_meta:
+                raw = view[offset : offset + size]
+                offset += size
+                if kind == "o":
+                    fields[name] = (kind, raw.tobytes())
+                else:
+                    column = array(kind[0])
+                    column.frombytes(raw)
+                    fields[name] = (kind, column)
+            columns.append(ComponentColumns(component_type, entities, fields, removed))
+        return cls(tick, next_entity_id, columns, base_tick)
+
+
+def take_snapshot(
+    em: EntityManager, component_types: Optional[Iterable[type[Component]]] = None
+) -> WorldSnapshot:
+    """Copy every component of the given types, or of all registered types.
+
+    Numeric fields are packed into ``array`` buffers, any other field is pickled
+    as one list per column. Types with ``snapshotted`` set to False, such as the
+    renderables, are left out of the registered types and rejected when given.
+    """
+    # Types without components get an empty column, so restoring clears them.
+    columns = [
+        _encode(em, component_type, em.query_by_type(component_type))
+        for component_type in _snapshot_types(em, component_types)
+    ]
+    return WorldSnapshot(em.tick, em._next_entity_id, columns)
+
+
+def take_delta(
+    em: EntityManager,
+    base: WorldSnapshot,
+    component_types: Optional[Iterable[type[Component]]] = None,
+) -> WorldSnapshot:
+    """Record what changed since a full snapshot.
+
+    Components added or written through tracked accessors since the base tick are
+    copied, and components the base had but the world no longer has are listed as
+    removed. Untracked writes are not detected.
+
+    Writes made during the base tick may come before or after the base was taken,
+    so the components stamped with the base tick are copied too.
+    """
+    if base.is_delta:
+        raise SnapshotError("A delta must be taken against a full snapshot")
+    base_entities = {
+        columns.component_type: columns.entities for columns in base.columns
+    }
+    columns = []
+    for component_type in _snapshot_types(em, component_types):
+        changed = em.changed_since(component_type, base.tick - 1)
+        removed = array(
+            "q",
+            (
+                entity_id
+                for entity_id in base_entities.get(component_type, ())
+                if not em.has_component(entity_id, component_type)
+            ),
+        )
+        if not changed and not removed:
+            continue
+        encoded = _encode(em, component_type, changed)
+        encoded.removed = removed
+        columns.append(encoded)
+    return WorldSnapshot(em.tick, em._next_entity_id, columns, base.tick)
+
+
+def restore_snapshot(em: EntityManager, snapshot: WorldSnapshot) -> None:
+    """Load a snapshot into an EntityManager.
+
+    A full snapshot replaces every component of the types it holds, and removes
+    the entities created after it was taken. Components of other types are left
+    as they are on the remaining entities. A delta is applied on top of the world
+    restored from its base snapshot.
+    """
+    if not snapshot.is_delta:
+        em.remove_entities(
+            [
+                entity_id
+                for entity_id in em._masks
+                if entity_id >= snapshot.next_entity_id
+            ]
+        )
+        for columns in snapshot.columns:
+            component_type = columns.component_type
+            em.remove_components(list(em.query_by_type(component_type)), component_type)
+    # Restored components are stamped with the snapshot's tick, and entity ids are
+    # handed out again from where the snapshot was taken.
+    em.tick = snapshot.tick
+    em._next_entity_id = snapshot.next_entity_id
+    for columns in snapshot.columns:
+        if len(columns.removed):
+            em.remove_components(list(columns.removed), columns.component_type)
+        em.add_components(list(columns.entities), _decode(columns))
+
+
+def _snapshot_types(
+    em: EntityManager, component_types: Optional[Iterable[type[Component]]]
+) -> list[type[Component]]:
+    if component_types is None:
+        registered = (em.registry.get_type(i) for i in range(len(em.registry)))
+        return [t for t in registered if t.snapshotted]
+    component_types = list(component_types)
+    for component_type in component_types:
+        if not component_type.snapshotted:
+            raise SnapshotError(
+                f"Component type {component_type.__qualname__} is not snapshotted"
+            )
+    return component_types
+
+
+def _encode(
+    em: EntityManager, component_type: type[Component], entities: Iterable[int]
+) -> ComponentColumns:
+    entities = array("q", entities)
+    components = em.get_components(entities, component_type) if entities else []
+    slots = _get_slots(component_type)
+    attributes = [_get_attributes(component, slots) for component in components]
+    names = list(attributes[0]) if attributes else []
+    if len(set(map(len, attributes))) > 1 or any(
+        attribute.keys() != attributes[0].keys() for attribute in attributes
+    ):
+        # Instances with different attributes: keep whole attribute dicts.
+        return ComponentColumns(
+            component_type,
+            entities,
+            {"__dict__": ("o", _pickle(component_type, attributes))},
+        )
+    fields = {}
+    for name in names:
+        fields[name] = _encode_column(
+            component_type, list(map(itemgetter(name), attributes))
+        )
+    return ComponentColumns(component_type, entities, fields)
+
+
+def _get_slots(component_type: type[Component]) -> list[str]:
+    names = []
+    for cls in component_type.__mro__:
+        slots = getattr(cls, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            if name not in ("__dict__", "__weakref__"):
+                names.append(name)
+    return names
+
+
+def _get_attributes(component: Component, slots: list[str]) -> dict[str, Any]:
+    if not slots:
+        return vars(component)
+    attributes = dict(getattr(component, "__dict__", {}))
+    for name in slots:
+        if hasattr(component, name):
+            attributes[name] = getattr(component, name)
+    return attributes
+
+
+def _encode_column(component_type: type[Component], values: list[Any]) -> Column:
+    types = set(map(type, values))
+    if types == {float} or types == {int}:
+        code = "d" if types == {float} else "q"
+        try:
+            return code, array(code, values)
+        except OverflowError:
+            pass
+    elif types == {tuple}:
+        sizes = set(map(len, values))
+        if len(sizes) == 1 and 0 not in sizes:
+            flat = list(chain.from_iterable(values))
+            if set(map(type, flat)) == {float}:
+                return f"d{sizes.pop()}", array("d", flat)
+    return "o", _pickle(component_type, values)
+
+
+def _pickle(component_type: type[Component], values: Any) -> bytes:
+    try:
+        return pickle.dumps(values)
+    except (pickle.PicklingError, AttributeError, TypeError) as e:
+        raise SnapshotError(
+            f"Could not snapshot {component_type.__qualname__}, set its "
+            f"snapshotted to False to leave it out: {e}"
+        ) from e
+
+
+def _decode_column(kind: str, data: Any) -> list[Any]:
+    if kind == "o":
+        return pickle.loads(data)
+    if kind in ("q", "d"):
+        return data.tolist()
+    size = int(kind[1:])
+    flat = data.tolist()
+    return list(zip(*(flat[i::size] for i in range(size))))
+
+
+def _decode(columns: ComponentColumns) -> list[Component]:
+    component_type = columns.component_type
+    names = list(columns.fields)
+    values = [_decode_column(*columns.fields[name]) for name in names]
+    create = component_type.__new__
+    # Slots are not in __dict__, so components with slots are set field by field.
+    update = _set_attributes if _get_slots(component_type) else _update_dict
+    components = []
+    if names == ["__dict__"]:
+        for attributes in values[0]:
+            component = create(component_type)
+            update(component, attributes.items())
+            components.append(component)
+        return components
+    for row in zip(*values) if names else ((),) * len(columns.entities):
+        component = create(component_type)
+        update(component, zip(names, row))
+        components.append(component)
+    return components
+
+
+def _update_dict(component: Component, attributes: Iterable[tuple[str, Any]]) -> None:
+    component.__dict__.update(attributes)
+
+
+def _set_attributes(
+    component: Component, attributes: Iterable[tuple[str, Any]]
+) -> None:
+    for name, value in attributes:
+        object.__setattr__(component, name, value)
+
+
+def _import_type(module: str, qualname: str) -> type[Component]:
+    try:
+        target: Any = importlib.import_module(module)
+        for part in qualname.split("."):
+            target = getattr(target, part)
+    except (ImportError, AttributeError) as e:
+        raise SnapshotError(
+            f"Could not find component type: {module}.{qualname}"
+        ) from e
+    return target
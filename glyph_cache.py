@@ -0,0 +1,160 @@
+from collections import OrderedDict
+import pygame
+
+Glyph = tuple[pygame.surface.Surface, int]
+GlyphStyle = tuple[pygame.font.Font, tuple[int, ...], bool]
+
+
+class GlyphCache:
+    def __init__(self, max_styles: int = 64) -> None:
+        """Cache of rasterized glyphs keyed by font, color and antialiasing
+
+        Args:
+            max_styles (int, optional): How many font/color combinations to keep before
+            dropping the least recently used one. Defaults to 64.
+        """
+        self.max_styles = max_styles
+        self._styles: OrderedDict[GlyphStyle, dict[str, Glyph]] = OrderedDict()
+
+    def get_glyphs(
+        self, font: pygame.font.Font, color: pygame.color.Color, antialias: bool = True
+    ) -> dict[str, Glyph]:
+        """Get the cached glyphs of a font/color combination"""
+        key = (font, tuple(color), antialias)
+        glyphs = self._styles.get(key)
+        if glyphs is None:
+            glyphs = self._styles[key] = {}
+            if len(self._styles) > self.max_styles:
+                self._styles.popitem(last=False)
+        else:
+            self._styles.move_to_end(key)
+        return glyphs
+
+    def get_glyph(
+        self,
+        font: pygame.font.Font,
+        char: str,
+        color: pygame.color.Color,
+        antialias: bool = True,
+    ) -> Glyph:
+        """Get the surface and horizontal advance of a single character"""
+        glyphs = self.get_glyphs(font, color, antialias)
+        glyph = glyphs.get(char)
+        if glyph is None:
+            glyph = glyphs[char] = _rasterize(font, char, color, antialias)
+        return glyph
+
+    def layout(
+        self,
+        font: pygame.font.Font,
+        text: str,
+        color: pygame.color.Color,
+        antialias: bool = True,
+        start_x: int = 0,
+    ) -> tuple[list[tuple[pygame.surface.Surface, tuple[int, int]]], list[int]]:
+        """Place the glyphs of a line of text
+
+        Returns:
+            tuple[list, list[int]]: Blit sequence of (glyph, position) and the x offset
+            of every character followed by the line width
+        """
+        glyphs = self.get_glyphs(font, color, antialias)
+        sequence = []
+        offsets = [start_x]
+        x = start_x
+        for char in text:
+            glyph = glyphs.get(char)
+            if glyph is None:
+                glyph = glyphs[char] = _rasterize(font, char, color, antialias)
+            sequence.append((glyph[0], (x, 0)))
+            x += glyph[1]
+            offsets.append(x)
+        return sequence, offsets
+
+    def clear(self) -> None:
+        self._styles.clear()
+
+
+class GlyphLine:
+    def __init__(
+        self,
+        font: pygame.font.Font,
+        color: pygame.color.Color,
+        antialias: bool = True,
+        cache: "GlyphCache | None" = None,
+    ) -> None:
+        """A line of text composed from cached glyphs into a reused surface
+
+        Changing the text only re-blits the characters after the common prefix with
+        the previous text, and setting the same text again does nothing.
+        """
+        self._cache = cache or default_glyph_cache
+        self._font = font
+        self._color = color
+        self._antialias = antialias
+        self._text = ""
+        self._offsets = [0]
+        self._buffer: pygame.surface.Surface | None = None
+        self._surface: pygame.surface.Surface | None = None
+
+    def set_style(self, font: pygame.font.Font, color: pygame.color.Color) -> None:
+        self._font = font
+        self._color = color
+        text = self._text
+        self._text = ""
+        self._offsets = [0]
+        self._buffer = None
+        self.set_text(text)
+
+    def set_text(self, text: str) -> None:
+        if text == self._text and self._surface is not None:
+            return
+        previous = self._text
+        prefix = 0
+        limit = min(len(previous), len(text))
+        while prefix < limit and previous[prefix] == text[prefix]:
+            prefix += 1
+        sequence, offsets = self._cache.layout(
+            self._font,
+            text[prefix:],
+            self._color,
+            self._antialias,
+            self._offsets[prefix],
+        )
+        width = max(offsets[-1], 1)
+        height = self._font.get_height()
+        buffer = self._buffer
+        if buffer is None or buffer.get_width() < width:
+            # Leave some room so a growing line keeps reusing the surface.
+            buffer = pygame.Surface(((width // 64 + 1) * 64, height), pygame.SRCALPHA)
+            sequence, offsets = self._cache.layout(
+                self._font, text, self._color, self._antialias
+            )
+            prefix = 0
+        else:
+            start = self._offsets[prefix]
+            buffer.fill((0, 0, 0, 0), (start, 0, buffer.get_width() - start, height))
+        buffer.blits(sequence, False)
+        self._buffer = buffer
+        self._offsets = self._offsets[:prefix] + offsets
+        self._text = text
+        self._surface = buffer.subsurface((0, 0, width, height))
+
+    def get_text(self) -> str:
+        return self._text
+
+    def get_surface(self) -> pygame.surface.Surface:
+        return self._surface
+
+
+def _rasterize(
+    font: pygame.font.Font, char: str, color: pygame.color.Color, antialias: bool
+) -> Glyph:
+    surface = font.render(char, antialias, color)
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    metrics = font.metrics(char)[0]
+    return surface, metrics[4] if metrics else surface.get_width()
+
+
+default_glyph_cache = GlyphCache()
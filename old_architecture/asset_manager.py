@@ -22,9 +22,10 @@ class AssetManager:
         Args:
             folder_path (str): Path from current working directory to the specified folder
         """
-        file_paths = os.listdir(folder_path)
-        for file_path in file_paths:
-            self.load(file_path)
+        for file_name in os.listdir(folder_path):
+            file_path = os.path.join(folder_path, file_name)
+            if os.path.isfile(file_path):
+                self.load(file_path)
 
     def _find_asset(self, asset_file_name: str) -> pygame.surface.Surface:
         """Find asset from asset name. If it doesn't exist then raise an exception.
@@ -38,10 +39,10 @@ class AssetManager:
         Returns:
             pygame.surface.Surface: Asset surface object
         """
-        for asset_name in self._assets.keys():
-            if asset_name == asset_file_name:
-                return self._assets[asset_file_name]
-        raise KeyError(f"Could not find asset name: {asset_file_name}")
+        asset = self._assets.get(asset_file_name)
+        if asset is None:
+            raise KeyError(f"Could not find asset name: {asset_file_name}")
+        return asset
 
     def remove_asset(self, asset_file_name: str) -> None:
         """Remove asset using asset name. Raise exception if can not find asset.
@@ -65,10 +66,18 @@ class AssetManager:
         Returns:
             bool: True if exists, False otherwise
         """
-        return asset_file_name in self._assets.keys()
+        return asset_file_name in self._assets
 
     def get_asset(self, asset_file_name: str) -> pygame.surface.Surface:
         return self._find_asset(asset_file_name)
 
+    def get_assets(self) -> dict[str, pygame.surface.Surface]:
+        """Get a copy of all loaded assets, e.g. to pack them into a texture atlas
+
+        Returns:
+            dict[str, pygame.surface.Surface]: Asset surfaces by asset file name
+        """
+        return dict(self._assets)
+
     def empty(self):
         self._assets: dict[str, pygame.surface.Surface] = {}
@@ -0,0 +1,499 @@
+from typing import TYPE_CHECKING, Optional
+import numpy as np
+
+if TYPE_CHECKING:
+    from .contacts import ContactSolver
+
+Pairs = tuple[np.ndarray, np.ndarray]
+
+
+class CircleBodies:
+    """Circle bodies stored as NumPy arrays, one row per body.
+
+    Removing a body moves the last body into its row, so rows stay packed and
+    every kernel below works on plain ``[:count]`` views.
+    """
+
+    def __init__(self, capacity: int = 256) -> None:
+        self.count = 0
+        self._positions = np.zeros((capacity, 2))
+        self._velocities = np.zeros((capacity, 2))
+        self._radii = np.zeros(capacity)
+        self._masses = np.zeros(capacity)
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._positions[: self.count]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._velocities[: self.count]
+
+    @property
+    def radii(self) -> np.ndarray:
+        return self._radii[: self.count]
+
+    @property
+    def masses(self) -> np.ndarray:
+        return self._masses[: self.count]
+
+    def add(
+        self,
+        position: tuple[float, float],
+        velocity: tuple[float, float],
+        radius: float,
+        mass: float,
+    ) -> int:
+        if self.count == len(self._radii):
+            self._grow(len(self._radii) * 2)
+        index = self.count
+        self._positions[index] = position
+        self._velocities[index] = velocity
+        self._radii[index] = radius
+        self._masses[index] = mass
+        self.count += 1
+        return index
+
+    def remove(self, index: int) -> int | None:
+        """Remove a body. Returns the old row of the body moved into its place."""
+        last = self.count - 1
+        if not 0 <= index <= last:
+            raise IndexError(f"No body at index {index}")
+        self.count = last
+        if index == last:
+            return None
+        for array in (self._positions, self._velocities, self._radii, self._masses):
+            array[index] = array[last]
+        return last
+
+    def clear(self) -> None:
+        self.count = 0
+
+    def _grow(self, capacity: int) -> None:
+        self._positions = _resized(self._positions, capacity)
+        self._velocities = _resized(self._velocities, capacity)
+        self._radii = _resized(self._radii, capacity)
+        self._masses = _resized(self._masses, capacity)
+
+
+def integrate(positions: np.ndarray, velocities: np.ndarray, dt: float) -> None:
+    positions += velocities * dt
+
+
+def kinetic_energies(velocities: np.ndarray, masses: np.ndarray) -> np.ndarray:
+    """Kinetic energy of every body, e.g. as a metric source."""
+    return 0.5 * masses * np.einsum("ij,ij->i", velocities, velocities)
+
+
+def bounce_borders(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    bounds: tuple[float, float],
+) -> None:
+    """Reflect bodies crossing the screen borders, like ``Ball.update``."""
+    for axis in (0, 1):
+        low = positions[:, axis] < radii - 1
+        high = positions[:, axis] > bounds[axis] - radii + 1
+        crossed = low | high
+        velocities[crossed, axis] = -velocities[crossed, axis]
+        positions[low, axis] = radii[low]
+        positions[high, axis] = bounds[axis] - radii[high]
+
+
+def find_pairs(positions: np.ndarray, radii: np.ndarray, margin: float = 0.0) -> Pairs:
+    """Find the pairs of bodies whose bounding boxes overlap.
+
+    Returns:
+        Pairs: Arrays of first and second body indices, with first < second
+    """
+    extents = (radii + margin)[:, None]
+    return find_box_pairs(positions, np.repeat(extents, 2, axis=1))
+
+
+def find_swept_pairs(
+    positions: np.ndarray, velocities: np.ndarray, radii: np.ndarray, dt: float
+) -> Pairs:
+    """Find the pairs of bodies whose boxes swept over a step overlap."""
+    return find_box_pairs(*_swept_boxes(positions, velocities, radii, dt))
+
+
+def _swept_boxes(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    dt: np.ndarray | float,
+) -> tuple[np.ndarray, np.ndarray]:
+    half_move = velocities * (dt / 2)
+    return positions + half_move, radii[:, None] + np.abs(half_move)
+
+
+def find_box_pairs(centers: np.ndarray, half_sizes: np.ndarray) -> Pairs:
+    """Find the pairs of overlapping axis-aligned boxes.
+
+    Sweep and prune along x, fully vectorized: after sorting by the left edge,
+    every box is paired with the run of boxes starting before its right edge,
+    then pairs not overlapping along y are dropped.
+
+    Returns:
+        Pairs: Arrays of first and second box indices, with first < second
+    """
+    count = len(centers)
+    if count < 2:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    left = centers[:, 0] - half_sizes[:, 0]
+    order = np.argsort(left, kind="stable")
+    sorted_left = left[order]
+    sorted_right = (centers[:, 0] + half_sizes[:, 0])[order]
+    starts = np.arange(1, count + 1)
+    ends = np.searchsorted(sorted_left, sorted_right, side="right")
+    counts = np.maximum(ends - starts, 0)
+    total = int(counts.sum())
+    first = np.repeat(np.arange(count), counts)
+    offsets = np.cumsum(counts) - counts
+    second = np.arange(total) - np.repeat(offsets, counts) + np.repeat(starts, counts)
+    first = order[first]
+    second = order[second]
+    overlap_y = np.abs(centers[first, 1] - centers[second, 1]) <= (
+        half_sizes[first, 1] + half_sizes[second, 1]
+    )
+    first, second = first[overlap_y], second[overlap_y]
+    swap = first > second
+    first[swap], second[swap] = second[swap], first[swap]
+    return first, second
+
+
+class SortedBoxes:
+    """Boxes sorted by their left edge, to query many boxes against at once.
+
+    Sorting is done once, so a set of boxes that does not move can be kept and
+    queried every step for the cost of the query alone.
+    """
+
+    def __init__(
+        self,
+        centers: np.ndarray,
+        half_sizes: np.ndarray,
+        order: Optional[np.ndarray] = None,
+    ) -> None:
+        """Sort the boxes by their left edge.
+
+        Args:
+            order (Optional[np.ndarray], optional): Order of the same boxes sorted
+            before, which is re-sorted cheaply when few boxes moved. Defaults to
+            None.
+        """
+        left = centers[:, 0] - half_sizes[:, 0]
+        if order is None:
+            self.order = np.argsort(left, kind="stable")
+        else:
+            self.order = order[np.argsort(left[order], kind="stable")]
+        self.left = left[self.order]
+        self.right = self.left + 2.0 * half_sizes[self.order, 0]
+        self.y_centers = centers[self.order, 1]
+        self.y_half_sizes = half_sizes[self.order, 1]
+        self.max_width = float(2.0 * half_sizes[:, 0].max()) if len(left) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def query(self, centers: np.ndarray, half_sizes: np.ndarray) -> Pairs:
+        """Find the overlapping pairs of query boxes and stored boxes.
+
+        Returns:
+            Pairs: Indices into the query boxes and into the stored boxes
+        """
+        if not len(self.order) or not len(centers):
+            empty = np.empty(0, dtype=np.intp)
+            return empty, empty
+        query_left = centers[:, 0] - half_sizes[:, 0]
+        query_right = centers[:, 0] + half_sizes[:, 0]
+        # Stored boxes overlapping along x start between these two edges.
+        starts = np.searchsorted(self.left, query_left - self.max_width, side="left")
+        ends = np.searchsorted(self.left, query_right, side="right")
+        counts = ends - starts
+        total = int(counts.sum())
+        queries = np.repeat(np.arange(len(centers)), counts)
+        offsets = np.cumsum(counts) - counts
+        boxes = (
+            np.arange(total) - np.repeat(offsets, counts) + np.repeat(starts, counts)
+        )
+        overlap = (self.right[boxes] >= query_left[queries]) & (
+            np.abs(centers[queries, 1] - self.y_centers[boxes])
+            <= half_sizes[queries, 1] + self.y_half_sizes[boxes]
+        )
+        return queries[overlap], self.order[boxes[overlap]]
+
+
+def time_of_impact(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    pairs: Pairs,
+    dt: float,
+) -> np.ndarray:
+    """Get when each pair of circles first touches within a step.
+
+    Solves ``|p + v t| = r1 + r2`` for the relative position ``p`` and velocity
+    ``v`` of every pair at once. Pairs that do not touch within ``[0, dt]``, or
+    that are moving apart, get ``inf``.
+    """
+    first, second = pairs
+    return _relative_time_of_impact(
+        positions[first] - positions[second],
+        velocities[first] - velocities[second],
+        radii[first] + radii[second],
+        dt,
+    )
+
+
+def _relative_time_of_impact(
+    p: np.ndarray, v: np.ndarray, total_radius: np.ndarray, horizon: np.ndarray | float
+) -> np.ndarray:
+    a = np.einsum("ij,ij->i", v, v)
+    b = 2.0 * np.einsum("ij,ij->i", p, v)
+    c = np.einsum("ij,ij->i", p, p) - total_radius * total_radius
+    discriminant = b * b - 4.0 * a * c
+    approaching = (b < 0.0) & (discriminant >= 0.0) & (a > 0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        hits = np.maximum((-b - np.sqrt(discriminant)) / (2.0 * a), 0.0)
+    return np.where(approaching & (hits <= horizon), hits, np.inf)
+
+
+def reflect_borders(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    bounds: tuple[float, float],
+) -> None:
+    """Fold bodies that moved past a border back inside, flipping their velocity.
+
+    Unlike ``bounce_borders``, this is exact for any distance traveled past the
+    border, even over several bounces.
+    """
+    for axis in (0, 1):
+        low = radii
+        span = np.maximum(bounds[axis] - 2.0 * radii, 0.0)
+        offset = positions[:, axis] - low
+        outside = (offset < 0.0) | (offset > span)
+        if not outside.any():
+            continue
+        period = 2.0 * span[outside]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            folded = np.mod(offset[outside], period)
+        folded = np.nan_to_num(folded)
+        back = folded > span[outside]
+        folded[back] = period[back] - folded[back]
+        positions[outside, axis] = low[outside] + folded
+        flipped = np.flatnonzero(outside)[back]
+        velocities[flipped, axis] = -velocities[flipped, axis]
+
+
+def resolve_collisions(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    masses: np.ndarray,
+    pairs: Pairs,
+    restitution: float = 0.0,
+) -> Pairs:
+    """Separate overlapping pairs and exchange their momentum.
+
+    Uses the same rules as ``move_ball_colliding`` and ``exchange_momentum``,
+    evaluated for all pairs at once. Corrections of a body in several pairs are
+    summed.
+
+    Returns:
+        Pairs: The pairs that were colliding
+    """
+    first, second = pairs
+    delta = positions[first] - positions[second]
+    distance_squared = np.einsum("ij,ij->i", delta, delta)
+    total_radius = radii[first] + radii[second]
+    colliding = distance_squared - total_radius * total_radius <= -1e-6
+    first, second = first[colliding], second[colliding]
+    if not len(first):
+        return first, second
+    delta = delta[colliding]
+    distance = np.sqrt(distance_squared[colliding])
+    # Coincident centers have no normal; push them apart along x.
+    same = distance == 0.0
+    delta[same] = (1.0, 0.0)
+    distance[same] = 1.0
+    normal = delta / distance[:, None]
+    mass_1, mass_2 = masses[first], masses[second]
+    total_mass = mass_1 + mass_2
+
+    overlap = (total_radius[colliding] - distance)[:, None] * normal
+    np.add.at(positions, first, (mass_2 / total_mass)[:, None] * overlap)
+    np.add.at(positions, second, -(mass_1 / total_mass)[:, None] * overlap)
+
+    _exchange_momentum(velocities, masses, first, second, normal, restitution)
+    return first, second
+
+
+def _exchange_momentum(
+    velocities: np.ndarray,
+    masses: np.ndarray,
+    first: np.ndarray,
+    second: np.ndarray,
+    normal: np.ndarray,
+    restitution: float,
+) -> None:
+    mass_1, mass_2 = masses[first], masses[second]
+    relative = np.einsum("ij,ij->i", velocities[first] - velocities[second], normal)
+    impulse = ((1 + restitution) / (mass_1 + mass_2) * relative)[:, None] * normal
+    np.add.at(velocities, first, -mass_2[:, None] * impulse)
+    np.add.at(velocities, second, mass_1[:, None] * impulse)
+
+
+def step_circles(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    masses: np.ndarray,
+    bounds: tuple[float, float],
+    dt: float,
+    restitution: float = 0.0,
+    ccd: bool = False,
+    max_rounds: int = 16,
+    solver: Optional["ContactSolver"] = None,
+    ids: Optional[np.ndarray] = None,
+) -> int:
+    """Advance bodies by one step in the order the ball demo uses: collisions,
+    then borders, then integration.
+
+    With a ``solver``, collisions and borders are resolved together by the
+    iterative contact solver instead of pair by pair, and ``ids`` identify the
+    bodies for its warm starting.
+
+    With ``ccd``, the integration is continuous: candidate pairs come from the
+    boxes swept over the step, impacts are found with ``time_of_impact`` and
+    resolved at the moment they happen, in at most ``max_rounds`` vectorized
+    rounds, and bodies are then folded back from the borders. Bodies that bounce
+    are swept again along their new path for the rest of the step. Fast bodies
+    bounce off each other and the borders instead of tunneling through them.
+
+    Returns:
+        int: Number of impact rounds taken
+    """
+    if solver is not None:
+        solver.solve(positions, velocities, radii, masses, bounds, dt, restitution, ids)
+    else:
+        pairs = find_pairs(positions, radii)
+        resolve_collisions(positions, velocities, radii, masses, pairs, restitution)
+    bounce_borders(positions, velocities, radii, bounds)
+    if not ccd:
+        integrate(positions, velocities, dt)
+        return 0
+    rounds = _integrate_continuous(
+        positions, velocities, radii, masses, dt, restitution, max_rounds
+    )
+    reflect_borders(positions, velocities, radii, bounds)
+    return rounds
+
+
+def _integrate_continuous(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    masses: np.ndarray,
+    dt: float,
+    restitution: float,
+    max_rounds: int,
+) -> int:
+    # Every body keeps its own clock: the time within the step it was advanced
+    # to. Each round, a pair whose impact is the earliest event of both of its
+    # bodies is advanced to that impact and resolved. Such pairs share no body,
+    # so a whole round is resolved at once.
+    clocks = np.zeros(len(radii))
+    pairs = find_swept_pairs(positions, velocities, radii, dt)
+    rounds = 0
+    while rounds < max_rounds and len(pairs[0]):
+        first, second = pairs
+        start = np.maximum(clocks[first], clocks[second])
+        p = (
+            positions[first]
+            + velocities[first] * (start - clocks[first])[:, None]
+            - positions[second]
+            - velocities[second] * (start - clocks[second])[:, None]
+        )
+        v = velocities[first] - velocities[second]
+        toi = start + _relative_time_of_impact(
+            p, v, radii[first] + radii[second], dt - start
+        )
+        earliest = np.full(len(radii), np.inf)
+        np.minimum.at(earliest, first, toi)
+        np.minimum.at(earliest, second, toi)
+        mutual = np.isfinite(toi) & (toi == earliest[first]) & (toi == earliest[second])
+        if not mutual.any():
+            break
+        rounds += 1
+        hit_first, hit_second, hit_toi = first[mutual], second[mutual], toi[mutual]
+        for bodies in (hit_first, hit_second):
+            positions[bodies] += (
+                velocities[bodies] * (hit_toi - clocks[bodies])[:, None]
+            )
+            clocks[bodies] = hit_toi
+        delta = positions[hit_first] - positions[hit_second]
+        distance = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        distance[distance == 0.0] = 1.0
+        _exchange_momentum(
+            velocities,
+            masses,
+            hit_first,
+            hit_second,
+            delta / distance[:, None],
+            restitution,
+        )
+        # Pairs with no impact ahead stay that way unless one body changed course.
+        changed = np.zeros(len(radii), dtype=bool)
+        changed[hit_first] = True
+        changed[hit_second] = True
+        keep = np.isfinite(toi) | changed[first] | changed[second]
+        # Bodies that bounced follow a new path, which may cross bodies that
+        # were not candidates at the start of the step.
+        pairs = _merge_pairs(
+            (first[keep], second[keep]),
+            _find_changed_pairs(positions, velocities, radii, dt - clocks, changed),
+            len(radii),
+        )
+    positions += velocities * (dt - clocks)[:, None]
+    return rounds
+
+
+def _find_changed_pairs(
+    positions: np.ndarray,
+    velocities: np.ndarray,
+    radii: np.ndarray,
+    remaining: np.ndarray,
+    changed: np.ndarray,
+) -> Pairs:
+    """Find the pairs of changed bodies whose boxes swept over the rest of their
+    step overlap. Every body is at its own clock, with ``remaining`` time left."""
+    centers, half_sizes = _swept_boxes(positions, velocities, radii, remaining[:, None])
+    bodies = np.flatnonzero(changed)
+    query, found = SortedBoxes(centers, half_sizes).query(
+        centers[bodies], half_sizes[bodies]
+    )
+    query = bodies[query]
+    distinct = query != found
+    query, found = query[distinct], found[distinct]
+    return np.minimum(query, found), np.maximum(query, found)
+
+
+def _merge_pairs(pairs: Pairs, other: Pairs, count: int) -> Pairs:
+    keys = np.unique(
+        np.concatenate([pairs[0] * count + pairs[1], other[0] * count + other[1]])
+    )
+    return np.divmod(keys, count)
+
+
+def _resized(array: np.ndarray, capacity: int) -> np.ndarray:
+    resized = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+    resized[: len(array)] = array[:capacity]
+    return resized
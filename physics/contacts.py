@@ -0,0 +1,262 @@
+from functools import partial
+from typing import Optional
+import numpy as np
+
+from .circles import find_pairs
+
+# Warm-start keys pack two body ids. Border contacts use the top of the second
+# half, one value per border.
+_KEY_STRIDE = 1 << 31
+_BORDER_NORMALS = np.array([(1.0, 0.0), (-1.0, 0.0), (0.0, 1.0), (0.0, -1.0)])
+# Odd multiplier: a bijection on 64-bit keys, used to order contacts pseudo
+# randomly but the same way every time.
+_SCRAMBLE = np.uint64(0x9E3779B97F4A7C15)
+
+
+class ContactSolver:
+    """Sequential impulse solver over the contacts of a step.
+
+    Every contact of the step, between two bodies or between a body and a
+    border, is gathered into arrays. The solver then runs ``iterations`` passes
+    over them, each clamping the accumulated normal impulse of a contact so it
+    only pushes. Contacts are split into batches sharing no body, so a batch is
+    solved at once and the passes give the same result as solving contacts one
+    by one. Overlaps beyond ``slop`` are pushed out by ``baumgarte`` of their
+    depth per step, in a separate pass that only moves positions.
+
+    With ``warm_starting``, the impulses found for a contact start from those of
+    the previous step, so resting piles stay settled with few iterations. Bodies
+    are identified by the ``ids`` passed to ``solve``, which must be kept stable
+    between steps or ``reset`` must be called.
+    """
+
+    def __init__(
+        self,
+        iterations: int = 8,
+        baumgarte: float = 0.2,
+        slop: float = 0.05,
+        margin: float = 0.5,
+        warm_starting: bool = True,
+    ) -> None:
+        self.iterations = iterations
+        self.baumgarte = baumgarte
+        self.slop = slop
+        self.margin = margin
+        self.warm_starting = warm_starting
+        # Contacts of the last step, sorted by key, with their impulses.
+        self._keys = np.empty(0, dtype=np.int64)
+        self._impulses = np.empty(0)
+
+    def reset(self) -> None:
+        """Forget the impulses of the previous step."""
+        self._keys = np.empty(0, dtype=np.int64)
+        self._impulses = np.empty(0)
+
+    def get_impulse(self, first_id: int, second_id: int) -> float:
+        """Get the impulse of the last step between two bodies, 0 if none."""
+        first_id, second_id = sorted((first_id, second_id))
+        key = first_id * _KEY_STRIDE + second_id
+        index = np.searchsorted(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            return float(self._impulses[index])
+        return 0.0
+
+    def solve(
+        self,
+        positions: np.ndarray,
+        velocities: np.ndarray,
+        radii: np.ndarray,
+        masses: np.ndarray,
+        bounds: tuple[float, float],
+        dt: float,
+        restitution: float = 0.0,
+        ids: Optional[np.ndarray] = None,
+    ) -> int:
+        """Solve the contacts of one step, updating velocities in place.
+
+        Args:
+            ids (Optional[np.ndarray], optional): Stable id of every body, for
+            warm starting when stepping a subset of the bodies. Defaults to the
+            row indices.
+
+        Returns:
+            int: Number of contacts solved
+        """
+        count = len(radii)
+        ids = np.arange(count) if ids is None else ids
+        first, second, normals, separations, keys = self._gather(
+            positions, radii, bounds, ids
+        )
+        if not len(first):
+            self.reset()
+            return 0
+        # Contacts are sorted by batch, so every batch is a slice of the arrays.
+        batches = _split_batches(first, second, keys, count)
+        order = np.concatenate(batches)
+        first, second, normals = first[order], second[order], normals[order]
+        separations, keys = separations[order], keys[order]
+        ends = np.cumsum([len(batch) for batch in batches])
+        slices = [slice(end - len(batch), end) for batch, end in zip(batches, ends)]
+
+        # Borders are contacts with a static body appended as the last row.
+        inverse_masses = np.concatenate([1.0 / masses, [0.0]])
+        work = np.concatenate([velocities, np.zeros((1, 2))])
+
+        approach = np.einsum("ij,ij->i", work[first] - work[second], normals)
+        # Separated contacts may close their gap this step, touching ones must
+        # not approach, and impacts within the step bounce back.
+        targets = np.where(separations > 0, -separations / dt, 0.0)
+        if restitution:
+            hitting = approach * dt + separations < 0
+            targets = np.where(
+                hitting, np.maximum(targets, -restitution * approach), targets
+            )
+
+        first_steps = normals * inverse_masses[first, None]
+        second_steps = normals * inverse_masses[second, None]
+        impulses = np.zeros(len(first))
+        if self.warm_starting and len(self._keys):
+            index = np.minimum(np.searchsorted(self._keys, keys), len(self._keys) - 1)
+            found = self._keys[index] == keys
+            impulses[found] = self._impulses[index[found]]
+            np.add.at(work, first, impulses[:, None] * first_steps)
+            np.add.at(work, second, -impulses[:, None] * second_steps)
+
+        solve = partial(
+            self._solve_batches,
+            slices,
+            first,
+            second,
+            normals,
+            first_steps,
+            second_steps,
+            1.0 / (inverse_masses[first] + inverse_masses[second]),
+        )
+        solve(work, impulses, targets)
+        velocities[:] = work[:count]
+
+        # Overlaps are solved separately, as velocities only applied to the
+        # positions of this step. Kept out of the warm-started impulses, they do
+        # not feed energy back into resting stacks.
+        push_targets = self.baumgarte / dt * np.maximum(-separations - self.slop, 0.0)
+        if push_targets.any():
+            push = np.zeros_like(work)
+            solve(push, np.zeros(len(first)), push_targets)
+            positions += push[:count] * dt
+
+        order = np.argsort(keys)
+        self._keys = keys[order]
+        self._impulses = impulses[order]
+        return len(first)
+
+    def _solve_batches(
+        self,
+        slices: list[slice],
+        first: np.ndarray,
+        second: np.ndarray,
+        normals: np.ndarray,
+        first_steps: np.ndarray,
+        second_steps: np.ndarray,
+        effective_masses: np.ndarray,
+        work: np.ndarray,
+        impulses: np.ndarray,
+        targets: np.ndarray,
+    ) -> None:
+        batches = [
+            (
+                first[part],
+                second[part],
+                normals[part],
+                first_steps[part],
+                second_steps[part],
+                effective_masses[part],
+                impulses[part],
+                targets[part],
+            )
+            for part in slices
+        ]
+        for _ in range(self.iterations):
+            for a, b, normal, a_step, b_step, mass, impulse, target in batches:
+                relative = np.einsum("ij,ij->i", work[a] - work[b], normal)
+                change = np.maximum(mass * (target - relative), -impulse)
+                # Views into the impulses, so the accumulated sums are kept.
+                impulse += change
+                change = change[:, None]
+                # Bodies are unique within a batch, except the static row whose
+                # inverse mass is zero.
+                work[a] += change * a_step
+                work[b] -= change * b_step
+
+    def _gather(
+        self,
+        positions: np.ndarray,
+        radii: np.ndarray,
+        bounds: tuple[float, float],
+        ids: np.ndarray,
+    ) -> tuple[np.ndarray, ...]:
+        count = len(radii)
+        first, second = find_pairs(positions, radii, self.margin)
+        delta = positions[first] - positions[second]
+        distance = np.sqrt(np.einsum("ij,ij->i", delta, delta))
+        separation = distance - radii[first] - radii[second]
+        near = separation <= self.margin
+        first, second = first[near], second[near]
+        delta, distance, separation = delta[near], distance[near], separation[near]
+        # Coincident centers have no normal; push them apart along x.
+        same = distance == 0.0
+        delta[same] = (1.0, 0.0)
+        distance[same] = 1.0
+        normals = delta / distance[:, None]
+        first_ids, second_ids = ids[first], ids[second]
+        swap = first_ids > second_ids
+        first_ids[swap], second_ids[swap] = second_ids[swap], first_ids[swap]
+        keys = first_ids.astype(np.int64) * _KEY_STRIDE + second_ids
+
+        # Left, right, top and bottom borders.
+        gaps = (
+            np.stack(
+                [
+                    positions[:, 0],
+                    bounds[0] - positions[:, 0],
+                    positions[:, 1],
+                    bounds[1] - positions[:, 1],
+                ],
+                axis=1,
+            )
+            - radii[:, None]
+        )
+        bodies, borders = np.nonzero(gaps <= self.margin)
+        return (
+            np.concatenate([first, bodies]),
+            np.concatenate([second, np.full(len(bodies), count)]),
+            np.concatenate([normals, _BORDER_NORMALS[borders]]),
+            np.concatenate([separation, gaps[bodies, borders]]),
+            np.concatenate(
+                [
+                    keys,
+                    ids[bodies].astype(np.int64) * _KEY_STRIDE
+                    + (_KEY_STRIDE - 1 - borders),
+                ]
+            ),
+        )
+
+
+def _split_batches(
+    first: np.ndarray, second: np.ndarray, keys: np.ndarray, static: int
+) -> list[np.ndarray]:
+    # Each round takes the contacts that come first, in a scrambled key order,
+    # among the remaining contacts of both of their bodies. The static row never
+    # conflicts, since nothing is added to its velocity.
+    priorities = (keys.astype(np.uint64) * _SCRAMBLE).argsort().argsort()
+    remaining = np.arange(len(first))
+    batches = []
+    while len(remaining):
+        a, b = first[remaining], second[remaining]
+        rank = priorities[remaining]
+        lowest = np.full(static + 1, len(first))
+        np.minimum.at(lowest, a, rank)
+        np.minimum.at(lowest, b, rank)
+        chosen = (lowest[a] == rank) & ((b == static) | (lowest[b] == rank))
+        batches.append(remaining[chosen])
+        remaining = remaining[~chosen]
+    return batches
@@ -0,0 +1,152 @@
+from typing import Callable, Optional
+import numpy as np
+
+from .circles import Pairs, SortedBoxes
+
+PairListener = Callable[[np.ndarray, np.ndarray], None]
+PairListeners = tuple[Optional[PairListener], Optional[PairListener]]
+
+_KEY_STRIDE = 1 << 31
+
+
+class PairCache:
+    """Broad-phase pairs kept from one step to the next.
+
+    Every object gets a fat box: its box enlarged by ``margin``. Pairs are the
+    objects whose fat boxes overlap. An object whose box still fits in its fat
+    box is not looked at again, so only objects leaving their fat box are
+    re-boxed and queried against the others, and the pairs of objects that did
+    not move are kept as they are. Each update reports the pairs added and
+    removed, also passed to the registered listeners.
+
+    The cached pairs are a superset of the overlapping boxes: callers still
+    test the pairs they get. Objects are identified by index. Appending objects
+    is supported, but anything that moves objects to other indices must call
+    ``reset``.
+    """
+
+    def __init__(self, margin: float = 4.0) -> None:
+        self.margin = margin
+        self._listeners: list[PairListeners] = []
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def reset(self) -> None:
+        """Forget every object and pair; the next update re-boxes everything."""
+        self._keys = np.empty(0, dtype=np.int64)
+        self._fat_centers = np.empty((0, 2))
+        self._fat_half_sizes = np.empty((0, 2))
+        self._order: Optional[np.ndarray] = None
+        # Number of objects re-boxed by the last update.
+        self.moved_count = 0
+
+    def register_listener(
+        self,
+        on_added: Optional[PairListener] = None,
+        on_removed: Optional[PairListener] = None,
+    ) -> None:
+        """Get the first and second indices of the pairs added or removed."""
+        self._listeners.append((on_added, on_removed))
+
+    def unregister_listener(
+        self,
+        on_added: Optional[PairListener] = None,
+        on_removed: Optional[PairListener] = None,
+    ) -> None:
+        if (on_added, on_removed) in self._listeners:
+            self._listeners.remove((on_added, on_removed))
+
+    def get_pairs(self) -> Pairs:
+        """Get the cached pairs, with first < second."""
+        return _unpack(self._keys)
+
+    def update(
+        self, centers: np.ndarray, half_sizes: np.ndarray
+    ) -> tuple[Pairs, Pairs]:
+        """Update the pairs to the current boxes of the objects.
+
+        Returns:
+            tuple[Pairs, Pairs]: The pairs added and the pairs removed
+        """
+        count = len(centers)
+        previous_keys = self._keys
+        restarted = count < len(self._fat_centers)
+        if restarted:
+            # Objects were removed, so indices may now mean other objects.
+            self.reset()
+        known = len(self._fat_centers)
+        fat_centers = self._fat_centers
+        fat_half_sizes = self._fat_half_sizes
+        if count > known:
+            fat_centers = np.concatenate([fat_centers, np.zeros((count - known, 2))])
+            fat_half_sizes = np.concatenate(
+                [fat_half_sizes, np.full((count - known, 2), -np.inf)]
+            )
+        # Objects whose box left their fat box, new objects included.
+        moved = np.flatnonzero(
+            np.any(np.abs(centers - fat_centers) + half_sizes > fat_half_sizes, axis=1)
+        )
+        self.moved_count = len(moved)
+        if not len(moved):
+            empty = _unpack(np.empty(0, dtype=np.int64))
+            if not restarted:
+                return empty, empty
+            # Every object was removed, so were all the pairs.
+            removed = _unpack(previous_keys)
+            self._notify(empty, removed)
+            return empty, removed
+        fat_centers[moved] = centers[moved]
+        fat_half_sizes[moved] = half_sizes[moved] + self.margin
+        self._fat_centers = fat_centers
+        self._fat_half_sizes = fat_half_sizes
+
+        # Most fat boxes did not change, so the previous order is nearly sorted.
+        order = self._order
+        if order is not None and len(order) < count:
+            order = np.concatenate([order, np.arange(len(order), count)])
+        boxes = SortedBoxes(fat_centers, fat_half_sizes, order)
+        self._order = boxes.order
+        query, found = boxes.query(fat_centers[moved], fat_half_sizes[moved])
+        first, second = moved[query], found
+        distinct = first != second
+        first, second = first[distinct], second[distinct]
+        keys = np.sort(_pack(np.minimum(first, second), np.maximum(first, second)))
+        # Pairs of two moved objects were found from both sides.
+        distinct = np.ones(len(keys), dtype=bool)
+        distinct[1:] = keys[1:] != keys[:-1]
+        keys = keys[distinct]
+
+        # Pairs of objects that did not move are unchanged.
+        if restarted:
+            touched = np.ones(len(previous_keys), dtype=bool)
+        else:
+            first_old, second_old = _unpack(previous_keys)
+            is_moved = np.zeros(count, dtype=bool)
+            is_moved[moved] = True
+            touched = is_moved[first_old] | is_moved[second_old]
+        old_touched = previous_keys[touched]
+        added_keys = np.setdiff1d(keys, old_touched, assume_unique=True)
+        removed_keys = np.setdiff1d(old_touched, keys, assume_unique=True)
+        # Both parts are disjoint, so sorting them together is enough.
+        self._keys = np.sort(np.concatenate([previous_keys[~touched], keys]))
+        added, removed = _unpack(added_keys), _unpack(removed_keys)
+        self._notify(added, removed)
+        return added, removed
+
+    def _notify(self, added: Pairs, removed: Pairs) -> None:
+        for on_added, on_removed in self._listeners:
+            if on_added is not None and len(added[0]):
+                on_added(*added)
+            if on_removed is not None and len(removed[0]):
+                on_removed(*removed)
+
+
+def _pack(first: np.ndarray, second: np.ndarray) -> np.ndarray:
+    return first.astype(np.int64) * _KEY_STRIDE + second
+
+
+def _unpack(keys: np.ndarray) -> Pairs:
+    first, second = np.divmod(keys, _KEY_STRIDE)
+    return first.astype(np.intp), second.astype(np.intp)
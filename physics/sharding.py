@@ -0,0 +1,247 @@
+from multiprocessing import get_context
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+import numpy as np
+
+from .circles import CircleBodies, step_circles
+
+Region = tuple[float, float, float, float]
+
+
+class _SharedArrays:
+    """NumPy views over one shared memory block.
+
+    Positions and velocities are double-buffered: workers read buffer ``src`` and
+    write buffer ``1 - src``, so no worker reads a body another one is writing.
+    """
+
+    def __init__(self, buffer: memoryview, capacity: int) -> None:
+        vectors = np.ndarray((4, capacity, 2), dtype=np.float64, buffer=buffer)
+        scalars = np.ndarray(
+            (2, capacity), dtype=np.float64, buffer=buffer, offset=vectors.nbytes
+        )
+        self.positions = (vectors[0], vectors[1])
+        self.velocities = (vectors[2], vectors[3])
+        self.radii = scalars[0]
+        self.masses = scalars[1]
+
+    @staticmethod
+    def size(capacity: int) -> int:
+        return (4 * capacity * 2 + 2 * capacity) * 8
+
+
+class ShardedCircleSimulation:
+    """Steps circle bodies in worker processes, one per spatial region.
+
+    The bounds are split into a ``columns`` x ``rows`` grid. Each step, a worker
+    takes the bodies of its region plus a halo around it, steps them with
+    ``step_circles`` and writes back only the bodies it owns, i.e. whose center
+    is in its region. With a halo of at least the largest contact distance, every
+    owned body sees all of its contacts, so the merged result matches a single
+    process step. With continuous collision detection, impacts are ordered per
+    region, so results near region borders can differ slightly.
+    """
+
+    def __init__(
+        self,
+        bounds: tuple[float, float],
+        capacity: int,
+        columns: int = 2,
+        rows: int = 1,
+        restitution: float = 0.0,
+        ccd: bool = False,
+    ) -> None:
+        self.bounds = bounds
+        self.ccd = ccd
+        self.capacity = capacity
+        self.grid = (columns, rows)
+        self.restitution = restitution
+        self.count = 0
+        self._src = 0
+        self._memory = SharedMemory(create=True, size=_SharedArrays.size(capacity))
+        self._arrays = _SharedArrays(self._memory.buf, capacity)
+        self._connections: list[Connection] = []
+        self._processes = []
+        context = get_context()
+        for row in range(rows):
+            for column in range(columns):
+                parent, child = context.Pipe()
+                process = context.Process(
+                    target=_run_worker,
+                    args=(
+                        self._memory.name,
+                        capacity,
+                        (column, row),
+                        self.grid,
+                        bounds,
+                        restitution,
+                        ccd,
+                        child,
+                    ),
+                    daemon=True,
+                )
+                process.start()
+                child.close()
+                self._connections.append(parent)
+                self._processes.append(process)
+
+    def __enter__(self) -> "ShardedCircleSimulation":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    @property
+    def positions(self) -> np.ndarray:
+        return self._arrays.positions[self._src][: self.count]
+
+    @property
+    def velocities(self) -> np.ndarray:
+        return self._arrays.velocities[self._src][: self.count]
+
+    def load(self, bodies: CircleBodies) -> None:
+        """Copy bodies into shared memory."""
+        if len(bodies) > self.capacity:
+            raise ValueError(
+                f"{len(bodies)} bodies do not fit in a capacity of {self.capacity}"
+            )
+        count = self.count = len(bodies)
+        arrays = self._arrays
+        arrays.positions[self._src][:count] = bodies.positions
+        arrays.velocities[self._src][:count] = bodies.velocities
+        arrays.radii[:count] = bodies.radii
+        arrays.masses[:count] = bodies.masses
+
+    def store(self, bodies: CircleBodies) -> None:
+        """Copy the simulated positions and velocities back into bodies."""
+        bodies.positions[:] = self.positions
+        bodies.velocities[:] = self.velocities
+
+    def step(self, dt: float, halo: Optional[float] = None) -> None:
+        """Run one step in every region and wait for all of them.
+
+        Args:
+            dt (float): Time step
+            halo (Optional[float], optional): Width around each region whose bodies
+            are simulated but not written back. Defaults to the largest contact
+            distance, plus the farthest two bodies can close in on each other
+            during the step with continuous collision detection.
+        """
+        if not self.count:
+            return
+        if halo is None:
+            halo = 2.0 * float(self._arrays.radii[: self.count].max()) + 1.0
+            if self.ccd:
+                speed = np.abs(self.velocities).max()
+                halo += 2.0 * float(speed) * dt * 2**0.5
+        message = (self._src, self.count, dt, halo)
+        for connection in self._connections:
+            connection.send(message)
+        for connection in self._connections:
+            connection.recv()
+        self._src = 1 - self._src
+
+    def close(self) -> None:
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+        for process in self._processes:
+            process.join(timeout=1.0)
+            if process.is_alive():
+                process.terminate()
+        self._connections = []
+        self._processes = []
+        if self._memory is not None:
+            del self._arrays
+            self._memory.close()
+            self._memory.unlink()
+            self._memory = None
+
+
+def region_of(
+    positions: np.ndarray, bounds: tuple[float, float], grid: tuple[int, int]
+) -> tuple[np.ndarray, np.ndarray]:
+    """Get the grid column and row owning each position."""
+    columns, rows = grid
+    column = np.clip(
+        (positions[:, 0] * columns / bounds[0]).astype(np.intp), 0, columns - 1
+    )
+    row = np.clip((positions[:, 1] * rows / bounds[1]).astype(np.intp), 0, rows - 1)
+    return column, row
+
+
+def _run_worker(
+    memory_name: str,
+    capacity: int,
+    cell: tuple[int, int],
+    grid: tuple[int, int],
+    bounds: tuple[float, float],
+    restitution: float,
+    ccd: bool,
+    connection: Connection,
+) -> None:
+    memory = SharedMemory(name=memory_name)
+    arrays = _SharedArrays(memory.buf, capacity)
+    try:
+        while True:
+            message = connection.recv()
+            if message is None:
+                break
+            connection.send(
+                _step_region(arrays, cell, grid, bounds, restitution, ccd, *message)
+            )
+    except EOFError:
+        pass
+    finally:
+        del arrays
+        memory.close()
+
+
+def _step_region(
+    arrays: _SharedArrays,
+    cell: tuple[int, int],
+    grid: tuple[int, int],
+    bounds: tuple[float, float],
+    restitution: float,
+    ccd: bool,
+    src: int,
+    count: int,
+    dt: float,
+    halo: float,
+) -> int:
+    cell_width = bounds[0] / grid[0]
+    cell_height = bounds[1] / grid[1]
+    left, top = cell[0] * cell_width, cell[1] * cell_height
+    right, bottom = left + cell_width, top + cell_height
+    positions = arrays.positions[src][:count]
+    column, row = region_of(positions, bounds, grid)
+    owned = (column == cell[0]) & (row == cell[1])
+    x, y = positions[:, 0], positions[:, 1]
+    near = (
+        (x >= left - halo)
+        & (x < right + halo)
+        & (y >= top - halo)
+        & (y < bottom + halo)
+    ) | owned
+    indices = np.flatnonzero(near)
+    local_positions = positions[indices]
+    local_velocities = arrays.velocities[src][indices]
+    step_circles(
+        local_positions,
+        local_velocities,
+        arrays.radii[indices],
+        arrays.masses[indices],
+        bounds,
+        dt,
+        restitution,
+        ccd,
+    )
+    keep = owned[indices]
+    written = indices[keep]
+    arrays.positions[1 - src][written] = local_positions[keep]
+    arrays.velocities[1 - src][written] = local_velocities[keep]
+    return len(written)
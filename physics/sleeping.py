@@ -0,0 +1,126 @@
+import numpy as np
+
+from .circles import Pairs
+
+
+def connected_components(count: int, pairs: Pairs) -> np.ndarray:
+    """Label the connected components of a graph given as edge arrays.
+
+    Labels are propagated along edges with vectorized minimum updates until they
+    settle, so every body ends up labeled with the lowest index of its component.
+    """
+    labels = np.arange(count)
+    first, second = pairs
+    if not len(first):
+        return labels
+    while True:
+        edge_labels = np.minimum(labels[first], labels[second])
+        updated = labels.copy()
+        np.minimum.at(updated, first, edge_labels)
+        np.minimum.at(updated, second, edge_labels)
+        # Pointer jumping: follow labels to their own labels.
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+class SleepState:
+    """Tracks which bodies are asleep, grouped into contact islands.
+
+    A body is still while its speed stays under ``threshold``. Each step, bodies
+    in contact form islands, and an island whose bodies have all been still for
+    ``frames`` steps falls asleep together: its velocities are zeroed and it is
+    left out of integration and collision until a moving body touches it.
+    """
+
+    def __init__(self, threshold: float = 2.0, frames: int = 30) -> None:
+        self.threshold = threshold
+        self.frames = frames
+        self.still_frames = np.zeros(0, dtype=np.int32)
+        self.asleep = np.zeros(0, dtype=bool)
+        # Island of each sleeping body, to wake it as a whole.
+        self.islands = np.zeros(0, dtype=np.intp)
+        # Bumped whenever the set of sleeping bodies changes.
+        self.version = 0
+
+    def resize(self, count: int) -> None:
+        """Match the number of bodies, new bodies starting awake."""
+        old = len(self.asleep)
+        self.version += 1
+        if count <= old:
+            self.still_frames = self.still_frames[:count]
+            self.asleep = self.asleep[:count]
+            self.islands = self.islands[:count]
+            return
+        self.still_frames = np.concatenate(
+            [self.still_frames, np.zeros(count - old, dtype=np.int32)]
+        )
+        self.asleep = np.concatenate([self.asleep, np.zeros(count - old, dtype=bool)])
+        self.islands = np.concatenate([self.islands, np.arange(old, count)])
+
+    def move(self, source: int, target: int) -> None:
+        """Copy the state of a body moved to another row, see CircleBodies.remove."""
+        self.version += 1
+        self.still_frames[target] = self.still_frames[source]
+        self.asleep[target] = self.asleep[source]
+        self.islands[target] = self.islands[source]
+        self.islands[self.islands == source] = target
+
+    def wake(self, indices: np.ndarray) -> None:
+        """Wake the islands of the given bodies."""
+        indices = np.asarray(indices)
+        sleeping = indices[self.asleep[indices]]
+        if not len(sleeping):
+            return
+        woken = np.isin(self.islands, self.islands[sleeping]) & self.asleep
+        self.version += 1
+        self.asleep[woken] = False
+        self.still_frames[woken] = 0
+
+    def wake_all(self) -> None:
+        self.version += 1
+        self.asleep[:] = False
+        self.still_frames[:] = 0
+
+    def wake_touched(self, velocities: np.ndarray, contacts: Pairs) -> None:
+        """Wake sleeping islands in contact with a moving awake body."""
+        first, second = contacts
+        moving = ~self.asleep & (
+            np.einsum("ij,ij->i", velocities, velocities)
+            >= self.threshold * self.threshold
+        )
+        touched = np.concatenate(
+            [
+                second[moving[first] & self.asleep[second]],
+                first[moving[second] & self.asleep[first]],
+            ]
+        )
+        self.wake(touched)
+
+    def update(self, velocities: np.ndarray, contacts: Pairs) -> int:
+        """Count still steps and put islands that stayed still to sleep.
+
+        Returns:
+            int: Number of bodies that fell asleep
+        """
+        awake = ~self.asleep
+        speed_squared = np.einsum("ij,ij->i", velocities, velocities)
+        still = speed_squared < self.threshold * self.threshold
+        self.still_frames = np.where(awake & still, self.still_frames + 1, 0)
+        first, second = contacts
+        both_awake = awake[first] & awake[second]
+        labels = connected_components(
+            len(self.asleep), (first[both_awake], second[both_awake])
+        )
+        # An island is ready when its least still body has been still long enough.
+        ready_frames = np.full(len(labels), np.iinfo(np.int32).max)
+        np.minimum.at(ready_frames, labels, self.still_frames)
+        falling = awake & (ready_frames[labels] >= self.frames)
+        if not falling.any():
+            return 0
+        self.version += 1
+        self.asleep[falling] = True
+        self.islands[falling] = labels[falling]
+        velocities[falling] = 0.0
+        return int(falling.sum())
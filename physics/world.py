@@ -0,0 +1,160 @@
+from typing import Optional
+import numpy as np
+
+from .circles import CircleBodies, Pairs, SortedBoxes, find_pairs, step_circles
+from .contacts import ContactSolver
+from .sleeping import SleepState
+
+
+class CircleWorld:
+    """Circle bodies inside screen bounds, stepped with the array kernels.
+
+    With a SleepState, islands of resting bodies are put to sleep and skipped in
+    integration and collision until a moving body touches them, so the stepping
+    cost follows the number of awake bodies.
+
+    With a ContactSolver, contacts are solved iteratively with warm starting,
+    which keeps stacks resting under ``gravity`` stable.
+    """
+
+    def __init__(
+        self,
+        bounds: tuple[float, float],
+        restitution: float = 0.0,
+        ccd: bool = False,
+        sleeping: Optional[SleepState] = None,
+        contact_margin: float = 0.5,
+        capacity: int = 256,
+        solver: Optional[ContactSolver] = None,
+        gravity: tuple[float, float] = (0.0, 0.0),
+    ) -> None:
+        self.bounds = bounds
+        self.restitution = restitution
+        self.ccd = ccd
+        self.sleeping = sleeping
+        self.contact_margin = contact_margin
+        self.solver = solver
+        self.gravity = np.array(gravity, dtype=float)
+        self.bodies = CircleBodies(capacity)
+        # Sleeping bodies do not move, so their sorted boxes are kept until the
+        # sleeping set changes.
+        self._sleeping_boxes: Optional[tuple[int, np.ndarray, SortedBoxes]] = None
+
+    def __len__(self) -> int:
+        return len(self.bodies)
+
+    def add(
+        self,
+        position: tuple[float, float],
+        velocity: tuple[float, float],
+        radius: float,
+        mass: float,
+    ) -> int:
+        index = self.bodies.add(position, velocity, radius, mass)
+        if self.sleeping is not None:
+            self.sleeping.resize(len(self.bodies))
+        return index
+
+    def remove(self, index: int) -> Optional[int]:
+        """Remove a body. Returns the old row of the body moved into its place."""
+        if self.sleeping is not None:
+            # Whatever rested on the body may start moving.
+            self.sleeping.wake(np.array([index]))
+        moved = self.bodies.remove(index)
+        if self.solver is not None:
+            # Rows changed, so the impulses of the last step no longer match.
+            self.solver.reset()
+        if self.sleeping is not None:
+            if moved is not None:
+                self.sleeping.move(moved, index)
+            self.sleeping.resize(len(self.bodies))
+        return moved
+
+    def clear(self) -> None:
+        self.bodies.clear()
+        if self.solver is not None:
+            self.solver.reset()
+        if self.sleeping is not None:
+            self.sleeping.resize(0)
+
+    def wake(self, index: int) -> None:
+        """Wake a body's island, e.g. after changing its velocity."""
+        if self.sleeping is not None:
+            self.sleeping.wake(np.array([index]))
+
+    def awake_count(self) -> int:
+        if self.sleeping is None:
+            return len(self.bodies)
+        return int(np.count_nonzero(~self.sleeping.asleep))
+
+    def step(self, dt: float) -> None:
+        bodies = self.bodies
+        if self.sleeping is None:
+            bodies.velocities[:] += self.gravity * dt
+            step_circles(
+                bodies.positions,
+                bodies.velocities,
+                bodies.radii,
+                bodies.masses,
+                self.bounds,
+                dt,
+                self.restitution,
+                self.ccd,
+                solver=self.solver,
+            )
+            return
+        sleeping = self.sleeping
+        if sleeping.asleep.all():
+            return
+        contacts = self._find_contacts()
+        sleeping.wake_touched(bodies.velocities, contacts)
+        awake = np.flatnonzero(~sleeping.asleep)
+        positions = bodies.positions[awake]
+        velocities = bodies.velocities[awake] + self.gravity * dt
+        step_circles(
+            positions,
+            velocities,
+            bodies.radii[awake],
+            bodies.masses[awake],
+            self.bounds,
+            dt,
+            self.restitution,
+            self.ccd,
+            solver=self.solver,
+            ids=awake,
+        )
+        bodies.positions[awake] = positions
+        bodies.velocities[awake] = velocities
+        sleeping.update(bodies.velocities, contacts)
+
+    def _find_contacts(self) -> Pairs:
+        """Pairs of bodies touching or within the contact margin, at least one of
+        them awake. Only awake bodies are sorted and queried."""
+        bodies = self.bodies
+        positions, radii = bodies.positions, bodies.radii
+        asleep = self.sleeping.asleep
+        awake = np.flatnonzero(~asleep)
+        first, second = find_pairs(positions[awake], radii[awake], self.contact_margin)
+        first, second = awake[first], awake[second]
+        sleeping_ids, boxes = self._get_sleeping_boxes()
+        extents = (radii[awake] + self.contact_margin)[:, None]
+        query, found = boxes.query(positions[awake], np.repeat(extents, 2, axis=1))
+        first = np.concatenate([first, awake[query]])
+        second = np.concatenate([second, sleeping_ids[found]])
+        delta = positions[first] - positions[second]
+        reach = radii[first] + radii[second] + self.contact_margin
+        touching = np.einsum("ij,ij->i", delta, delta) <= reach * reach
+        return first[touching], second[touching]
+
+    def _get_sleeping_boxes(self) -> tuple[np.ndarray, SortedBoxes]:
+        version = self.sleeping.version
+        cached = self._sleeping_boxes
+        if cached is None or cached[0] != version:
+            sleeping_ids = np.flatnonzero(self.sleeping.asleep)
+            # Sleeping boxes carry no margin; the query boxes include it.
+            extents = self.bodies.radii[sleeping_ids][:, None]
+            boxes = SortedBoxes(
+                self.bodies.positions[sleeping_ids], np.repeat(extents, 2, axis=1)
+            )
+            cached = self._sleeping_boxes = (version, sleeping_ids, boxes)
+        return cached[1], cached[2]
@@ -0,0 +1,39 @@
+import pygame
+
+from ..assets.manager import AssetManager
+
+
+def load_surface(file_path: str) -> pygame.surface.Surface:
+    return pygame.image.load(file_path)
+
+
+def convert_surface(surface: pygame.surface.Surface) -> pygame.surface.Surface:
+    """Convert a loaded image to the display format once a display exists."""
+    if pygame.display.get_surface() is None:
+        return surface
+    if surface.get_flags() & pygame.SRCALPHA:
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+def surface_size(surface: pygame.surface.Surface) -> int:
+    return surface.get_pitch() * surface.get_height()
+
+
+def create_asset_manager(
+    memory_budget: int | None = None, max_workers: int | None = None
+) -> AssetManager[pygame.surface.Surface]:
+    """Asset manager decoding images on worker threads.
+
+    Args:
+        memory_budget (int | None, optional): Bytes of unreferenced surfaces to keep
+        cached. Defaults to None, which never evicts.
+        max_workers (int | None, optional): Decoding threads. Defaults to None.
+    """
+    return AssetManager(
+        load_surface,
+        size_of=surface_size,
+        finalize=convert_surface,
+        memory_budget=memory_budget,
+        max_workers=max_workers,
+    )
@@ -0,0 +1,125 @@
+from collections import OrderedDict
+from typing import Sequence
+import pygame
+
+from ..render.atlas import TextureAtlas, pack_rects
+
+
+def build_atlas(
+    images: dict[str, pygame.surface.Surface],
+    page_size: tuple[int, int] = (2048, 2048),
+    padding: int = 1,
+) -> TextureAtlas[pygame.surface.Surface]:
+    """Pack loaded images into a few large surfaces.
+
+    Args:
+        images (dict[str, pygame.surface.Surface]): Images by texture id
+        page_size (tuple[int, int], optional): Maximum page size. Defaults to (2048, 2048).
+        padding (int, optional): Empty pixels around every image. Defaults to 1.
+
+    Returns:
+        TextureAtlas[pygame.surface.Surface]: Atlas with one surface per page
+    """
+    regions, page_sizes = pack_rects(
+        {texture_id: image.get_size() for texture_id, image in images.items()},
+        page_size,
+        padding,
+    )
+    pages = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+    for texture_id, region in regions.items():
+        pages[region.page].blit(images[texture_id], (region.x, region.y))
+    return TextureAtlas(pages, regions)
+
+
+class SpriteBatcher:
+    """Draws runs of atlas textures with a single ``Surface.blits`` call.
+
+    Sprites drawn at their native size without rotation blit straight from the
+    atlas page. Scaled or rotated sprites are transformed once and cached, with
+    rotations rounded to ``rotation_step`` degrees and at most ``cache_size``
+    surfaces, evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        atlas: TextureAtlas[pygame.surface.Surface],
+        cache_size: int = 512,
+        rotation_step: float = 1.0,
+    ) -> None:
+        self.atlas = atlas
+        self.cache_size = cache_size
+        self.rotation_step = rotation_step
+        self._areas = {
+            texture_id: pygame.Rect(region.x, region.y, region.width, region.height)
+            for texture_id, region in atlas.regions.items()
+        }
+        # Most recently used last.
+        self._transformed: OrderedDict[
+            tuple[str, tuple[int, int], float], pygame.surface.Surface
+        ] = OrderedDict()
+
+    def draw(
+        self,
+        target: pygame.surface.Surface,
+        texture_ids: Sequence[str],
+        positions: Sequence[tuple[float, float]],
+        sizes: Sequence[tuple[float, float]],
+        rotations: Sequence[float],
+    ) -> list[pygame.Rect]:
+        """Blit the sprites onto the target and return the changed rectangles."""
+        pages = self.atlas.pages
+        regions = self.atlas.regions
+        areas = self._areas
+        rotation_step = self.rotation_step
+        sequence = []
+        for texture_id, position, size, rotation in zip(
+            texture_ids, positions, sizes, rotations
+        ):
+            area = areas[texture_id]
+            width, height = int(size[0]), int(size[1])
+            if rotation:
+                rotation = quantize_rotation(rotation, rotation_step)
+            if rotation == 0.0 and width == area.width and height == area.height:
+                page = pages[regions[texture_id].page]
+                sequence.append((page, (int(position[0]), int(position[1])), area))
+                continue
+            image = self._get_transformed(texture_id, (width, height), rotation)
+            center_x = position[0] + width / 2
+            center_y = position[1] + height / 2
+            sequence.append(
+                (
+                    image,
+                    (
+                        int(center_x - image.get_width() / 2),
+                        int(center_y - image.get_height() / 2),
+                    ),
+                )
+            )
+        return target.blits(sequence) or []
+
+    def _get_transformed(
+        self, texture_id: str, size: tuple[int, int], rotation: float
+    ) -> pygame.surface.Surface:
+        key = (texture_id, size, rotation)
+        image = self._transformed.get(key)
+        if image is not None:
+            self._transformed.move_to_end(key)
+            return image
+        if len(self._transformed) >= self.cache_size:
+            self._transformed.popitem(last=False)
+        image = self.atlas.get_page(texture_id).subsurface(self._areas[texture_id])
+        if size != image.get_size():
+            image = pygame.transform.scale(image, size)
+        if rotation:
+            image = pygame.transform.rotate(image, rotation)
+        self._transformed[key] = image
+        return image
+
+
+def quantize_rotation(rotation: float, step: float) -> float:
+    """Round a rotation to ``step`` degrees, in ``[0, 360)``.
+
+    Rotations that change every frame would otherwise add a cached surface
+    almost every frame.
+    """
+    return round(rotation / step) * step % 360
@@ -0,0 +1,77 @@
+import os
+import pygame
+
+from ..assets.bundle import BundleReader, write_bundle
+
+
+def pack_folder(
+    folder_path: str, bundle_path: str, pixel_format: str = "BGRA"
+) -> list[str]:
+    """Decode every image of a folder and write them into one bundle file.
+
+    Images with per-pixel alpha are stored in ``pixel_format``, which should match
+    the display format (BGRA on most little-endian platforms) so no conversion is
+    needed at load time. Opaque images are stored as RGB.
+
+    Args:
+        folder_path (str): Path from current working directory to the folder
+        bundle_path (str): Path of the bundle file to write
+        pixel_format (str, optional): Format of images with alpha. Defaults to "BGRA".
+
+    Returns:
+        list[str]: Names of the packed assets
+    """
+    assets = []
+    for file_name in sorted(os.listdir(folder_path)):
+        file_path = os.path.join(folder_path, file_name)
+        if not os.path.isfile(file_path):
+            continue
+        image = pygame.image.load(file_path)
+        image_format = pixel_format if image.get_flags() & pygame.SRCALPHA else "RGB"
+        width, height = image.get_size()
+        data = pygame.image.tobytes(image, image_format)
+        assets.append((file_name, width, height, image_format, data))
+    with open(bundle_path, "wb") as file:
+        write_bundle(file, assets)
+    return [asset[0] for asset in assets]
+
+
+class BundleAssetManager:
+    """Serves surfaces straight out of a memory-mapped bundle.
+
+    Surfaces are created on first use with ``pygame.image.frombuffer`` over the
+    mapped pixel data, so no file is decoded and no pixels are copied.
+    """
+
+    def __init__(self, bundle_path: str) -> None:
+        self._reader = BundleReader(bundle_path)
+        self._assets: dict[str, pygame.surface.Surface] = {}
+
+    def get_asset(self, asset_file_name: str) -> pygame.surface.Surface:
+        asset = self._assets.get(asset_file_name)
+        if asset is None:
+            entry = self._reader.get_entry(asset_file_name)
+            asset = pygame.image.frombuffer(
+                self._reader.get_buffer(asset_file_name),
+                (entry.width, entry.height),
+                entry.pixel_format,
+            )
+            self._assets[asset_file_name] = asset
+        return asset
+
+    def get_assets(self) -> dict[str, pygame.surface.Surface]:
+        """Get all the assets of the bundle, e.g. to pack them into a texture atlas"""
+        return {name: self.get_asset(name) for name in self._reader.entries}
+
+    def has(self, asset_file_name: str) -> bool:
+        return asset_file_name in self._reader
+
+    def close(self) -> None:
+        """Close the bundle.
+
+        Surfaces use the mapped memory, so every surface taken from the manager
+        must have been released first. Otherwise a BundleError is raised and the
+        bundle stays open; surfaces are then made again on their next use.
+        """
+        self._assets.clear()
+        self._reader.close()
@@ -0,0 +1,299 @@
+from collections import OrderedDict
+from typing import Any, Optional, Sequence
+import math
+import pygame
+
+from ..render.atlas import TextureAtlas
+from ..render.context import RenderSpace
+from .atlas import SpriteBatcher, quantize_rotation
+from .target import PygameRenderTarget
+
+
+class PygameRenderContext:
+    """RenderContext backend drawing with pygame.
+
+    Every draw records its screen rectangle and a signature of what was drawn.
+    At the end of a frame, draws that differ from the previous frame give the
+    dirty rectangles, and only those are presented to the display. The next frame
+    then erases only the rectangles drawn before instead of filling the screen.
+    If the dirty area grows past ``full_update_ratio`` of the screen, the whole
+    frame is cleared and flipped instead. Draws made on the screen surface without
+    the draw methods are only tracked when reported with ``mark_dirty``.
+
+    Scaled or rotated textures outside the atlas are cached, with rotations
+    rounded to ``rotation_step`` degrees and at most ``cache_size`` surfaces,
+    evicting the least recently used.
+    """
+
+    def __init__(
+        self,
+        target: PygameRenderTarget,
+        background_color: tuple[int, int, int] = (0, 0, 0),
+        textures: Optional[dict[str, pygame.surface.Surface]] = None,
+        atlas: Optional[TextureAtlas[pygame.surface.Surface]] = None,
+        dirty_rects: bool = True,
+        full_update_ratio: float = 0.5,
+        rotation_step: float = 1.0,
+        cache_size: int = 512,
+    ) -> None:
+        self._display_target = target
+        self._target = target
+        self.background_color = background_color
+        self.background_image: Optional[pygame.surface.Surface] = None
+        self.textures: dict[str, pygame.surface.Surface] = textures or {}
+        self.dirty_rects = dirty_rects
+        self.full_update_ratio = full_update_ratio
+        self.rotation_step = rotation_step
+        self.cache_size = cache_size
+        self._space = RenderSpace.SCREEN
+        self._batcher: Optional[SpriteBatcher] = None
+        self.set_atlas(atlas)
+        # Most recently used last.
+        self._scaled: OrderedDict[
+            tuple[str, tuple[int, int], float], pygame.Surface
+        ] = OrderedDict()
+        self._previous_draws: dict[tuple, pygame.Rect] = {}
+        self._current_draws: dict[tuple, pygame.Rect] = {}
+        self._extra_dirty: list[pygame.Rect] = []
+        self._previous_extra_dirty: list[pygame.Rect] = []
+        self._target_bounds: dict[int, tuple[int, pygame.Rect]] = {}
+        self._full_redraw = True
+
+    def set_atlas(self, atlas: Optional[TextureAtlas[pygame.surface.Surface]]) -> None:
+        self._batcher = (
+            SpriteBatcher(atlas, self.cache_size, self.rotation_step)
+            if atlas is not None
+            else None
+        )
+
+    def set_background_image(self, image: Optional[pygame.surface.Surface]) -> None:
+        self.background_image = image
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """Clear and present the whole screen on the next frame."""
+        self._full_redraw = True
+
+    def mark_dirty(self, rect: pygame.Rect) -> None:
+        """Present a region of the screen drawn without the draw methods this frame.
+
+        Like the context's own draws, the region is erased at the start of the
+        next frame. Callbacks drawing on the screen surface directly must call
+        this, or ``invalidate``, or they leave trails.
+        """
+        if self._target is self._display_target:
+            self._extra_dirty.append(pygame.Rect(rect))
+
+    def get_target(self) -> PygameRenderTarget:
+        return self._target
+
+    def set_target(self, target: PygameRenderTarget) -> None:
+        self._target = target
+
+    def get_resolution(self) -> tuple[int, int]:
+        return self._display_target.get_size()
+
+    def set_resolution(self, resolution: tuple[int, int]) -> None:
+        self._display_target.resize(resolution)
+        self.invalidate()
+
+    def create_target(self, size: tuple[int, int]) -> PygameRenderTarget:
+        return PygameRenderTarget.create_offscreen(size)
+
+    def draw_target(
+        self, target: PygameRenderTarget, position: tuple[float, float] = (0.0, 0.0)
+    ) -> None:
+        surface = target.get_surface()
+        cached = self._target_bounds.get(id(target))
+        if cached is None or cached[0] != target.version:
+            # Only the drawn part of a cached layer is blitted and reported dirty.
+            cached = (target.version, surface.get_bounding_rect())
+            self._target_bounds[id(target)] = cached
+        area = cached[1]
+        rect = self._target.get_surface().blit(
+            surface,
+            (int(position[0]) + area.x, int(position[1]) + area.y),
+            area,
+        )
+        self._record(("target", id(target), target.version, position), rect)
+
+    def set_space(self, space: RenderSpace) -> None:
+        self._space = space
+
+    def start_frame(self) -> None:
+        self._target = self._display_target
+        self._current_draws = {}
+        if self._full_redraw or not self.dirty_rects:
+            self._erase(None)
+            return
+        for rect in self._previous_draws.values():
+            self._erase(rect)
+        for rect in self._previous_extra_dirty:
+            self._erase(rect)
+
+    def end_frame(self) -> None:
+        target = self._display_target
+        if self._full_redraw or not self.dirty_rects:
+            target.set_dirty_rects(None)
+            self._full_redraw = False
+        else:
+            dirty = self._compute_dirty_rects()
+            width, height = target.get_size()
+            area = sum(rect.width * rect.height for rect in dirty)
+            if area > width * height * self.full_update_ratio:
+                # Most of the screen changed: a single fill and flip next frame
+                # is cheaper than erasing and updating many rectangles.
+                target.set_dirty_rects(None)
+                self._full_redraw = True
+            else:
+                target.set_dirty_rects(dirty)
+        target.present()
+        self._previous_draws = self._current_draws
+        self._previous_extra_dirty = self._extra_dirty
+        self._extra_dirty = []
+
+    def draw_texture(
+        self,
+        texture_id: str,
+        position: tuple[float, float],
+        size: tuple[float, float],
+        rotation: float = 0.0,
+    ) -> None:
+        self.draw_textures([texture_id], [position], [size], [rotation])
+
+    def draw_textures(
+        self,
+        texture_ids: Sequence[str],
+        positions: Sequence[tuple[float, float]],
+        sizes: Sequence[tuple[float, float]],
+        rotations: Sequence[float],
+    ) -> None:
+        surface = self._target.get_surface()
+        if self._batcher is not None and all(
+            texture_id in self._batcher.atlas for texture_id in texture_ids
+        ):
+            rects = self._batcher.draw(
+                surface, texture_ids, positions, sizes, rotations
+            )
+        else:
+            rects = [
+                self._blit_texture(surface, texture_id, position, size, rotation)
+                for texture_id, position, size, rotation in zip(
+                    texture_ids, positions, sizes, rotations
+                )
+            ]
+        for texture_id, position, size, rotation, rect in zip(
+            texture_ids, positions, sizes, rotations, rects
+        ):
+            self._record(("texture", texture_id, position, size, rotation), rect)
+
+    def draw_shape(
+        self,
+        shape_type: str,
+        position: tuple[float, float],
+        size: tuple[float, float],
+        color: tuple[int, int, int],
+        rotation: float = 0.0,
+    ) -> None:
+        surface = self._target.get_surface()
+        rect = pygame.Rect(int(position[0]), int(position[1]), 0, 0)
+        rect.size = (max(int(size[0]), 1), max(int(size[1]), 1))
+        if shape_type in ("circle", "ellipse"):
+            dirty = pygame.draw.ellipse(surface, color, rect)
+        elif shape_type == "rect" and rotation:
+            dirty = pygame.draw.polygon(
+                surface, color, _rotated_corners(rect, rotation)
+            )
+        elif shape_type == "rect":
+            dirty = pygame.draw.rect(surface, color, rect)
+        elif shape_type == "line":
+            dirty = pygame.draw.line(surface, color, rect.topleft, rect.bottomright)
+        else:
+            raise ValueError(f"Unknown shape type: {shape_type}")
+        self._record(("shape", shape_type, position, size, color, rotation), dirty)
+
+    def draw_shapes(
+        self,
+        shape_types: Sequence[str],
+        positions: Sequence[tuple[float, float]],
+        sizes: Sequence[tuple[float, float]],
+        colors: Sequence[Optional[tuple[int, int, int]]],
+        rotations: Sequence[float],
+    ) -> None:
+        for shape_type, position, size, color, rotation in zip(
+            shape_types, positions, sizes, colors, rotations
+        ):
+            self.draw_shape(shape_type, position, size, color, rotation)
+
+    def _blit_texture(
+        self,
+        surface: pygame.surface.Surface,
+        texture_id: str,
+        position: tuple[float, float],
+        size: tuple[float, float],
+        rotation: float,
+    ) -> pygame.Rect:
+        image = self.textures.get(texture_id)
+        if image is None:
+            raise KeyError(f"Could not find texture: {texture_id}")
+        width, height = int(size[0]), int(size[1])
+        if rotation or image.get_size() != (width, height):
+            rotation = quantize_rotation(rotation, self.rotation_step)
+            key = (texture_id, (width, height), rotation)
+            transformed = self._scaled.get(key)
+            if transformed is not None:
+                self._scaled.move_to_end(key)
+            else:
+                if len(self._scaled) >= self.cache_size:
+                    self._scaled.popitem(last=False)
+                transformed = pygame.transform.scale(image, (width, height))
+                if rotation:
+                    transformed = pygame.transform.rotate(transformed, rotation)
+                self._scaled[key] = transformed
+            center = (position[0] + width / 2, position[1] + height / 2)
+            return surface.blit(transformed, transformed.get_rect(center=center))
+        return surface.blit(image, (int(position[0]), int(position[1])))
+
+    def _record(self, signature: tuple[Any, ...], rect: pygame.Rect) -> None:
+        if self._target is not self._display_target:
+            return
+        key = (self._space, *signature)
+        while key in self._current_draws:
+            # The same draw twice in a frame; keep both.
+            key = (*key, 0)
+        self._current_draws[key] = rect
+
+    def _compute_dirty_rects(self) -> list[pygame.Rect]:
+        previous = self._previous_draws
+        current = self._current_draws
+        dirty = [rect for key, rect in current.items() if key not in previous]
+        dirty.extend(rect for key, rect in previous.items() if key not in current)
+        dirty.extend(self._extra_dirty)
+        dirty.extend(self._previous_extra_dirty)
+        screen = pygame.Rect((0, 0), self._display_target.get_size())
+        return [rect.clip(screen) for rect in dirty if rect.colliderect(screen)]
+
+    def _erase(self, rect: Optional[pygame.Rect]) -> None:
+        surface = self._display_target.get_surface()
+        if self.background_image is None:
+            surface.fill(self.background_color, rect)
+        elif rect is None:
+            surface.blit(self.background_image, (0, 0))
+        else:
+            surface.blit(self.background_image, rect, rect)
+
+
+def _rotated_corners(rect: pygame.Rect, rotation: float) -> list[tuple[float, float]]:
+    angle = math.radians(-rotation)
+    cos, sin = math.cos(angle), math.sin(angle)
+    cx, cy = rect.center
+    half_w, half_h = rect.width / 2, rect.height / 2
+    return [
+        (cx + x * cos - y * sin, cy + x * sin + y * cos)
+        for x, y in (
+            (-half_w, -half_h),
+            (half_w, -half_h),
+            (half_w, half_h),
+            (-half_w, half_h),
+        )
+    ]
@@ -0,0 +1,65 @@
+from typing import Sequence
+import pygame
+
+
+class PygameRenderTarget:
+    """Render target backed by a pygame surface.
+
+    A display target presents to the window. When dirty rectangles were set for
+    the frame only those regions are pushed with ``pygame.display.update``,
+    otherwise the whole window is flipped. Offscreen targets never present, and
+    alpha targets cleared with an RGB color are cleared to transparent.
+    """
+
+    def __init__(
+        self, surface: pygame.surface.Surface, is_display: bool = False
+    ) -> None:
+        self._surface = surface
+        self.is_display = is_display
+        self._dirty_rects: list[pygame.Rect] | None = None
+        # Bumped on every clear, so a blit of this target can tell it changed.
+        self.version = 0
+
+    @classmethod
+    def create_display(
+        cls, size: tuple[int, int], flags: int = 0
+    ) -> "PygameRenderTarget":
+        return cls(pygame.display.set_mode(size, flags), is_display=True)
+
+    @classmethod
+    def create_offscreen(
+        cls, size: tuple[int, int], transparent: bool = True
+    ) -> "PygameRenderTarget":
+        flags = pygame.SRCALPHA if transparent else 0
+        return cls(pygame.Surface(size, flags))
+
+    def set_dirty_rects(self, rects: Sequence[pygame.Rect] | None) -> None:
+        """Set the regions to present next, or None to present everything."""
+        self._dirty_rects = None if rects is None else list(rects)
+
+    def present(self) -> None:
+        if not self.is_display:
+            return
+        if self._dirty_rects is None:
+            pygame.display.flip()
+        elif self._dirty_rects:
+            pygame.display.update(self._dirty_rects)
+        self._dirty_rects = None
+
+    def get_size(self) -> tuple[int, int]:
+        return self._surface.get_size()
+
+    def clear(self, color: tuple[int, ...]) -> None:
+        if self._surface.get_flags() & pygame.SRCALPHA and len(color) == 3:
+            color = (*color, 0)
+        self._surface.fill(color)
+        self.version += 1
+
+    def resize(self, size: tuple[int, int]) -> None:
+        if self.is_display:
+            self._surface = pygame.display.set_mode(size, self._surface.get_flags())
+        else:
+            self._surface = pygame.Surface(size, self._surface.get_flags())
+
+    def get_surface(self) -> pygame.surface.Surface:
+        return self._surface
@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+P = TypeVar("P")
+
+
+@dataclass(frozen=True)
+class AtlasRegion:
+    page: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class AtlasPackingError(Exception):
+    pass
+
+
+def pack_rects(
+    sizes: dict[str, tuple[int, int]],
+    page_size: tuple[int, int] = (2048, 2048),
+    padding: int = 1,
+) -> tuple[dict[str, AtlasRegion], list[tuple[int, int]]]:
+    """Pack rectangles into as few pages as possible.
+
+    Uses first-fit decreasing-height shelf packing: rectangles are sorted from
+    tallest to shortest and placed on the first shelf of the first page with
+    room, opening a new shelf or page when none fits.
+
+    Returns the region of every key and the used size of every page.
+    """
+    page_width, page_height = page_size
+    # Each page is a list of shelves: [y, height, next_x].
+    pages: list[list[list[int]]] = []
+    page_extents: list[list[int]] = []
+    regions: dict[str, AtlasRegion] = {}
+    order = sorted(sizes, key=lambda key: (sizes[key][1], sizes[key][0]), reverse=True)
+    for key in order:
+        width, height = sizes[key]
+        padded_width = width + padding * 2
+        padded_height = height + padding * 2
+        if padded_width > page_width or padded_height > page_height:
+            raise AtlasPackingError(
+                f"Texture {key} ({width}x{height}) does not fit in a "
+                f"{page_width}x{page_height} atlas page"
+            )
+        placed = None
+        for page_index, shelves in enumerate(pages):
+            for shelf in shelves:
+                if padded_height <= shelf[1] and shelf[2] + padded_width <= page_width:
+                    placed = (page_index, shelf[2], shelf[0])
+                    shelf[2] += padded_width
+                    break
+            if placed is not None:
+                break
+            top = shelves[-1][0] + shelves[-1][1] if shelves else 0
+            if top + padded_height <= page_height:
+                shelves.append([top, padded_height, padded_width])
+                placed = (page_index, 0, top)
+                break
+        if placed is None:
+            pages.append([[0, padded_height, padded_width]])
+            page_extents.append([0, 0])
+            placed = (len(pages) - 1, 0, 0)
+        page_index, x, y = placed
+        extent = page_extents[page_index]
+        extent[0] = max(extent[0], x + padded_width)
+        extent[1] = max(extent[1], y + padded_height)
+        regions[key] = AtlasRegion(page_index, x + padding, y + padding, width, height)
+    return regions, [(width, height) for width, height in page_extents]
+
+
+class TextureAtlas(Generic[P]):
+    """Maps texture ids to regions of a few large backend pages."""
+
+    def __init__(self, pages: list[P], regions: dict[str, AtlasRegion]) -> None:
+        self.pages = pages
+        self.regions = regions
+
+    def __contains__(self, texture_id: str) -> bool:
+        return texture_id in self.regions
+
+    def __len__(self) -> int:
+        return len(self.regions)
+
+    def get_region(self, texture_id: str) -> AtlasRegion:
+        region = self.regions.get(texture_id)
+        if region is None:
+            raise KeyError(f"Could not find texture in atlas: {texture_id}")
+        return region
+
+    def get_page(self, texture_id: str) -> Any:
+        return self.pages[self.get_region(texture_id).page]
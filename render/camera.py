@@ -1,13 +1,61 @@
+import math
+
+import numpy as np
+
 from .transform import Transform
 
 
 class Camera:
     def __init__(
-        self, viewport: tuple[int, int], position: tuple[float, float], zoom: float
+        self,
+        viewport: tuple[int, int],
+        position: tuple[float, float],
+        zoom: float,
+        rotation: float = 0.0,  # In degrees
     ) -> None:
-        self.viewport = viewport
-        self.position = position
-        self.zoom = zoom
+        self._viewport = viewport
+        self._position = position
+        self._zoom = zoom
+        self._rotation = rotation
+        self._matrix: np.ndarray | None = None
+        self._coefficients: tuple[float, ...] = ()
+        self.version = 0
+
+    @property
+    def viewport(self) -> tuple[int, int]:
+        return self._viewport
+
+    @viewport.setter
+    def viewport(self, viewport: tuple[int, int]) -> None:
+        self._viewport = viewport
+        self._invalidate()
+
+    @property
+    def position(self) -> tuple[float, float]:
+        return self._position
+
+    @position.setter
+    def position(self, position: tuple[float, float]) -> None:
+        self._position = position
+        self._invalidate()
+
+    @property
+    def zoom(self) -> float:
+        return self._zoom
+
+    @zoom.setter
+    def zoom(self, zoom: float) -> None:
+        self._zoom = zoom
+        self._invalidate()
+
+    @property
+    def rotation(self) -> float:
+        return self._rotation
+
+    @rotation.setter
+    def rotation(self, rotation: float) -> None:
+        self._rotation = rotation
+        self._invalidate()
 
     def set_viewport(self, viewport: tuple[int, int]):
         self.viewport = viewport
@@ -18,10 +66,38 @@ class Camera:
     def set_zoom(self, zoom: float) -> None:
         self.zoom = zoom
 
+    def set_rotation(self, rotation: float) -> None:
+        self.rotation = rotation
+
+    def get_matrix(self) -> np.ndarray:
+        """Get the cached 2x3 affine world-to-screen matrix.
+
+        The matrix is only rebuilt after the viewport, position, zoom or rotation
+        changed. Its last column is the translation.
+        """
+        if self._matrix is None:
+            angle = math.radians(-self._rotation)
+            cos = math.cos(angle) * self._zoom
+            sin = math.sin(angle) * self._zoom
+            x, y = self._position
+            self._matrix = np.array(
+                (
+                    (cos, -sin, self._viewport[0] / 2 - (cos * x - sin * y)),
+                    (sin, cos, self._viewport[1] / 2 - (sin * x + cos * y)),
+                ),
+                dtype=np.float64,
+            )
+            self._coefficients = tuple(float(v) for v in self._matrix.flat)
+        return self._matrix
+
     def world_to_screen(self, world_pos: tuple[float, float]) -> tuple[float, float]:
-        screen_x = (world_pos[0] - self.position[0]) * self.zoom + self.viewport[0] / 2
-        screen_y = (world_pos[1] - self.position[1]) * self.zoom + self.viewport[1] / 2
-        return (screen_x, screen_y)
+        if self._matrix is None:
+            self.get_matrix()
+        a, b, tx, c, d, ty = self._coefficients
+        return (
+            a * world_pos[0] + b * world_pos[1] + tx,
+            c * world_pos[0] + d * world_pos[1] + ty,
+        )
 
     def size_to_screen(self, world_size: tuple[float, float]) -> tuple[float, float]:
         screen_width = world_size[0] * self.zoom
@@ -36,9 +112,40 @@ class Camera:
         return (screen_pos, screen_size)
 
     def screen_to_world(self, screen_pos: tuple[float, float]) -> tuple[float, float]:
-        world_x = (screen_pos[0] - self.viewport[0] / 2) / self.zoom + self.position[0]
-        world_y = (screen_pos[1] - self.viewport[1] / 2) / self.zoom + self.position[1]
-        return (world_x, world_y)
+        if self._matrix is None:
+            self.get_matrix()
+        a, b, tx, c, d, ty = self._coefficients
+        sx = screen_pos[0] - tx
+        sy = screen_pos[1] - ty
+        determinant = a * d - b * c
+        return (
+            (d * sx - b * sy) / determinant,
+            (a * sy - c * sx) / determinant,
+        )
+
+    def world_to_screen_batch(self, world_positions: np.ndarray) -> np.ndarray:
+        """Convert an (N, 2) array of world positions to screen positions."""
+        matrix = self.get_matrix()
+        positions = np.asarray(world_positions, dtype=np.float64)
+        return positions @ matrix[:, :2].T + matrix[:, 2]
+
+    def size_to_screen_batch(self, world_sizes: np.ndarray) -> np.ndarray:
+        """Convert an (N, 2) array of world sizes to screen sizes."""
+        return np.asarray(world_sizes, dtype=np.float64) * self._zoom
+
+    def transform_rects_batch(
+        self, world_positions: np.ndarray, world_sizes: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray]:
+        return (
+            self.world_to_screen_batch(world_positions),
+            self.size_to_screen_batch(world_sizes),
+        )
+
+    def screen_to_world_batch(self, screen_positions: np.ndarray) -> np.ndarray:
+        """Convert an (N, 2) array of screen positions to world positions."""
+        matrix = self.get_matrix()
+        positions = np.asarray(screen_positions, dtype=np.float64) - matrix[:, 2]
+        return positions @ np.linalg.inv(matrix[:, :2]).T
 
     def is_visible(self, transform: Transform, bounds: tuple[float, float]) -> bool:
         screen_pos = self.world_to_screen(transform.position)
@@ -46,5 +153,31 @@ class Camera:
             screen_pos[0] + bounds[0] > 0
             and screen_pos[1] + bounds[1] > 0
             and screen_pos[0] - bounds[0] < self.viewport[0]
-            and screen_pos[1] - bounds[0] < self.viewport[1]
+            and screen_pos[1] - bounds[1] < self.viewport[1]
         )
+
+    def get_world_bounds(self) -> tuple[float, float, float, float]:
+        """Get the visible world area as (min_x, min_y, max_x, max_y).
+
+        With a rotated camera this is the axis-aligned box around the view.
+        """
+        half_width = self.viewport[0] / 2 / self.zoom
+        half_height = self.viewport[1] / 2 / self.zoom
+        if self._rotation:
+            angle = math.radians(self._rotation)
+            cos = abs(math.cos(angle))
+            sin = abs(math.sin(angle))
+            half_width, half_height = (
+                half_width * cos + half_height * sin,
+                half_width * sin + half_height * cos,
+            )
+        return (
+            self.position[0] - half_width,
+            self.position[1] - half_height,
+            self.position[0] + half_width,
+            self.position[1] + half_height,
+        )
+
+    def _invalidate(self) -> None:
+        self._matrix = None
+        self.version += 1
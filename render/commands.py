@@ -0,0 +1,293 @@
+from enum import IntEnum
+from math import floor
+from typing import Any, Callable, Optional
+
+from .atlas import TextureAtlas
+from .camera import Camera
+from .context import RenderContext
+from .transform import Transform
+
+
+class CommandKind(IntEnum):
+    CALLBACK = 0
+    TEXTURE = 1
+    SHAPE = 2
+
+
+LAYER_BITS = 16
+# Depth is fixed point, with as many bits after the point as before it.
+DEPTH_BITS = 32
+DEPTH_FRACTION_BITS = 16
+MATERIAL_BITS = 24
+
+_LAYER_BIAS = 1 << (LAYER_BITS - 1)
+_DEPTH_BIAS = 1 << (DEPTH_BITS - 1)
+_DEPTH_SCALE = 1 << DEPTH_FRACTION_BITS
+_LAYER_MAX = (1 << LAYER_BITS) - 1
+_DEPTH_MAX = (1 << DEPTH_BITS) - 1
+_MATERIAL_MAX = (1 << MATERIAL_BITS) - 1
+# Atlas pages get materials from the upper half so they never collide with
+# interned texture or shape names.
+_ATLAS_MATERIAL_BASE = 1 << (MATERIAL_BITS - 1)
+
+
+def make_sort_key(layer: float, depth: float, material: int = 0) -> int:
+    """Pack layer, depth and material into one integer that sorts like the tuple
+    ``(layer, depth, material)``. Layer and depth may be negative. A float layer
+    is floored, and a float depth is kept to 1/65536."""
+    biased_layer = min(max(floor(layer) + _LAYER_BIAS, 0), _LAYER_MAX)
+    biased_depth = min(max(floor(depth * _DEPTH_SCALE) + _DEPTH_BIAS, 0), _DEPTH_MAX)
+    return (
+        (biased_layer << (DEPTH_BITS + MATERIAL_BITS))
+        | (biased_depth << MATERIAL_BITS)
+        | (material & _MATERIAL_MAX)
+    )
+
+
+def layer_of_key(key: int) -> int:
+    """Get the layer packed into a sort key by ``make_sort_key``."""
+    return (key >> (DEPTH_BITS + MATERIAL_BITS)) - _LAYER_BIAS
+
+
+class RenderCommandBuffer:
+    """Preallocated, column-oriented list of draw commands for one frame.
+
+    Commands are recorded with the layer and depth set by ``begin``, sorted by a
+    packed integer key (skipped when they were recorded in order) and submitted to
+    the context in runs that share the same kind and material, so backends can
+    batch the draw calls.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._capacity = 0
+        self._count = 0
+        self._keys: list[int] = []
+        self._kinds: list[CommandKind] = []
+        self._resources: list[Any] = []
+        self._positions: list[tuple[float, float]] = []
+        self._sizes: list[tuple[float, float]] = []
+        self._rotations: list[float] = []
+        self._colors: list[Optional[tuple[int, int, int]]] = []
+        self._materials: dict[str, int] = {}
+        self._texture_materials: dict[str, int] = {}
+        self._base_key = make_sort_key(0, 0)
+        self._last_key = -1
+        self._in_order = True
+        self._grow(capacity)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def clear(self) -> None:
+        self._count = 0
+        self._last_key = -1
+        self._in_order = True
+
+    def material_id(self, name: str) -> int:
+        material = self._materials.get(name)
+        if material is None:
+            material = len(self._materials) + 1
+            self._materials[name] = material
+        return material
+
+    def set_atlas(self, atlas: TextureAtlas | None) -> None:
+        """Give textures packed in the atlas the material of their page, so all
+        sprites sharing a page are submitted in one run."""
+        if atlas is None:
+            self._texture_materials = {}
+            return
+        self._texture_materials = {
+            texture_id: _ATLAS_MATERIAL_BASE + region.page
+            for texture_id, region in atlas.regions.items()
+        }
+
+    def begin(self, layer: int, depth: float) -> None:
+        """Set the layer and depth used by the following commands."""
+        self._base_key = make_sort_key(layer, depth)
+
+    def push_texture(
+        self,
+        texture_id: str,
+        position: tuple[float, float],
+        size: tuple[float, float],
+        rotation: float = 0.0,
+    ) -> None:
+        material = self._texture_materials.get(texture_id)
+        if material is None:
+            material = self.material_id(texture_id)
+        self._push(
+            CommandKind.TEXTURE,
+            material,
+            texture_id,
+            position,
+            size,
+            rotation,
+            None,
+        )
+
+    def push_shape(
+        self,
+        shape_type: str,
+        position: tuple[float, float],
+        size: tuple[float, float],
+        color: tuple[int, int, int],
+        rotation: float = 0.0,
+    ) -> None:
+        self._push(
+            CommandKind.SHAPE,
+            self.material_id(shape_type),
+            shape_type,
+            position,
+            size,
+            rotation,
+            color,
+        )
+
+    def push_callback(self, callback: Callable[[Any], None], argument: Any) -> None:
+        """Record an opaque draw callback, called as ``callback(argument)``."""
+        self._push(CommandKind.CALLBACK, 0, callback, argument, None, 0.0, None)
+
+    def flush(self, context: RenderContext) -> None:
+        """Submit all recorded commands in sort-key order and clear the buffer."""
+        count = self._count
+        if count == 0:
+            return
+        keys = self._keys
+        kinds = self._kinds
+        if self._in_order:
+            order = range(count)
+        else:
+            order = sorted(range(count), key=keys.__getitem__)
+        start = 0
+        while start < count:
+            first = order[start]
+            kind = kinds[first]
+            if kind == CommandKind.CALLBACK:
+                self._resources[first](self._positions[first])
+                start += 1
+                continue
+            material = keys[first] & _MATERIAL_MAX
+            end = start + 1
+            while (
+                end < count
+                and kinds[order[end]] == kind
+                and keys[order[end]] & _MATERIAL_MAX == material
+            ):
+                end += 1
+            self._submit_run(context, kind, order[start:end])
+            start = end
+        self.clear()
+
+    def _submit_run(
+        self, context: RenderContext, kind: CommandKind, indices: list[int]
+    ) -> None:
+        resources = [self._resources[i] for i in indices]
+        positions = [self._positions[i] for i in indices]
+        sizes = [self._sizes[i] for i in indices]
+        rotations = [self._rotations[i] for i in indices]
+        if kind == CommandKind.TEXTURE:
+            context.draw_textures(resources, positions, sizes, rotations)
+        else:
+            colors = [self._colors[i] for i in indices]
+            context.draw_shapes(resources, positions, sizes, colors, rotations)
+
+    def _push(
+        self,
+        kind: CommandKind,
+        material: int,
+        resource: Any,
+        position: Any,
+        size: Any,
+        rotation: float,
+        color: Optional[tuple[int, int, int]],
+    ) -> None:
+        index = self._count
+        if index == self._capacity:
+            self._grow(self._capacity * 2 or 1)
+        key = self._base_key | material
+        if key < self._last_key:
+            self._in_order = False
+        self._last_key = key
+        self._keys[index] = key
+        self._kinds[index] = kind
+        self._resources[index] = resource
+        self._positions[index] = position
+        self._sizes[index] = size
+        self._rotations[index] = rotation
+        self._colors[index] = color
+        self._count = index + 1
+
+    def _grow(self, capacity: int) -> None:
+        extra = capacity - self._capacity
+        self._keys.extend([0] * extra)
+        self._kinds.extend([CommandKind.CALLBACK] * extra)
+        self._resources.extend([None] * extra)
+        self._positions.extend([None] * extra)
+        self._sizes.extend([None] * extra)
+        self._rotations.extend([0.0] * extra)
+        self._colors.extend([None] * extra)
+        self._capacity = capacity
+
+
+def _centered_rect(
+    camera: Camera, transform: Transform, size: tuple[float, float]
+) -> tuple[tuple[float, float], tuple[float, float]]:
+    """Get the screen rectangle (top-left, size) centered on the transform."""
+    (x, y), (width, height) = camera.transform_rect(transform.position, size)
+    return (x - width / 2, y - height / 2), (width, height)
+
+
+Emitter = Callable[[RenderCommandBuffer, Optional[Transform], Optional[Camera]], None]
+
+
+def sprite_emitter(
+    texture_id: str,
+    size: tuple[float, float],
+    position: tuple[float, float] = (0.0, 0.0),
+) -> Emitter:
+    """Emit a texture centered on the entity transform, or with its top-left
+    corner at ``position`` in screen space."""
+
+    def emit(
+        buffer: RenderCommandBuffer,
+        transform: Optional[Transform],
+        camera: Optional[Camera],
+    ) -> None:
+        if transform is None or camera is None:
+            buffer.push_texture(texture_id, position, size)
+            return
+        screen_pos, screen_size = _centered_rect(camera, transform, size)
+        buffer.push_texture(
+            texture_id, screen_pos, screen_size, transform.rotation - camera.rotation
+        )
+
+    return emit
+
+
+def shape_emitter(
+    shape_type: str,
+    size: tuple[float, float],
+    color: tuple[int, int, int],
+    position: tuple[float, float] = (0.0, 0.0),
+) -> Emitter:
+    """Emit a shape centered on the entity transform, or with its top-left
+    corner at ``position`` in screen space."""
+
+    def emit(
+        buffer: RenderCommandBuffer,
+        transform: Optional[Transform],
+        camera: Optional[Camera],
+    ) -> None:
+        if transform is None or camera is None:
+            buffer.push_shape(shape_type, position, size, color)
+            return
+        screen_pos, screen_size = _centered_rect(camera, transform, size)
+        buffer.push_shape(
+            shape_type,
+            screen_pos,
+            screen_size,
+            color,
+            transform.rotation - camera.rotation,
+        )
+
+    return emit
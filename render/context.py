@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Optional, Protocol, Sequence
 from enum import Enum, auto
 from .target import RenderTarget
 
@@ -56,6 +56,42 @@ class RenderContext(Protocol):
         """Draw a shape on the screen."""
         pass
 
+    def draw_textures(
+        self,
+        texture_ids: Sequence[str],
+        positions: Sequence[tuple[float, float]],
+        sizes: Sequence[tuple[float, float]],
+        rotations: Sequence[float],
+    ) -> None:
+        """Draw a run of textures submitted together by the command buffer."""
+        pass
+
+    def draw_shapes(
+        self,
+        shape_types: Sequence[str],
+        positions: Sequence[tuple[float, float]],
+        sizes: Sequence[tuple[float, float]],
+        colors: Sequence[Optional[tuple[int, int, int]]],
+        rotations: Sequence[float],
+    ) -> None:
+        """Draw a run of shapes submitted together by the command buffer."""
+        pass
+
+    def create_target(self, size: tuple[int, int]) -> RenderTarget:
+        """Create a transparent offscreen render target."""
+        pass
+
+    def draw_target(
+        self, target: RenderTarget, position: tuple[float, float] = (0.0, 0.0)
+    ) -> None:
+        """Draw the contents of another render target."""
+        pass
+
+    def mark_dirty(self, rect: tuple[int, int, int, int]) -> None:
+        """Report a region of the current target drawn without the draw methods,
+        e.g. by a render callback drawing on the target surface directly."""
+        pass
+
     def set_space(self, space: RenderSpace) -> None:
         """Set the current rendering space (e.g., 'world' or 'screen')."""
         pass
@@ -0,0 +1,89 @@
+import numpy as np
+
+from ..ecs.entity_manager import EntityManager
+from .transform import Transform
+
+
+class TransformHistory:
+    """Double-buffered snapshots of every Transform taken after each fixed step.
+
+    Each row holds ``(x, y, rotation)`` for one entity. ``capture`` swaps the
+    buffers and refills the current one, ``blend`` interpolates both buffers for
+    a render alpha in one vectorized pass, and ``interpolate`` then looks up an
+    entity's blended transform.
+    """
+
+    def __init__(self, em: EntityManager, capacity: int = 1024) -> None:
+        self.em = em
+        self._previous = np.zeros((capacity, 3), dtype=np.float64)
+        self._current = np.zeros((capacity, 3), dtype=np.float64)
+        self._rows: dict[int, int] = {}
+        self._free_rows: list[int] = []
+        self._blended: list[list[float]] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def capture(self) -> None:
+        self._previous, self._current = self._current, self._previous
+        entities = self.em.query_by_type(Transform)
+        rows = self._rows
+        for entity in rows.keys() - set(entities):
+            self._free_rows.append(rows.pop(entity))
+        indices: list[int] = []
+        values: list[tuple[float, float, float]] = []
+        new_rows: list[int] = []
+        for entity in entities:
+            row = rows.get(entity)
+            if row is None:
+                row = self._allocate_row()
+                rows[entity] = row
+                new_rows.append(row)
+            transform: Transform = self.em.get_component(entity, Transform)
+            indices.append(row)
+            values.append(
+                (transform.position[0], transform.position[1], transform.rotation)
+            )
+        if indices:
+            self._current[indices] = values
+        if new_rows:
+            self._previous[new_rows] = self._current[new_rows]
+
+    def snap(self, entity: int) -> None:
+        """Drop interpolation for an entity until the next capture, e.g. after a
+        teleport."""
+        row = self._rows.get(entity)
+        if row is None:
+            return
+        transform: Transform | None = self.em.get_component(entity, Transform)
+        if transform is not None:
+            self._current[row] = (*transform.position, transform.rotation)
+        self._previous[row] = self._current[row]
+
+    def blend(self, alpha: float) -> None:
+        """Interpolate all captured transforms for the given alpha."""
+        count = len(self._rows) + len(self._free_rows)
+        previous = self._previous[:count]
+        delta = self._current[:count] - previous
+        # Rotate through the shortest arc.
+        delta[:, 2] = (delta[:, 2] + 180.0) % 360.0 - 180.0
+        self._blended = (previous + delta * alpha).tolist()
+
+    def interpolate(self, entity: int, transform: Transform) -> Transform:
+        """Get the blended transform of an entity, or ``transform`` itself if the
+        entity has not been captured yet."""
+        row = self._rows.get(entity)
+        if row is None or row >= len(self._blended):
+            return transform
+        x, y, rotation = self._blended[row]
+        return Transform((x, y), rotation, transform.scale)
+
+    def _allocate_row(self) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        row = len(self._rows)
+        if row >= len(self._current):
+            capacity = len(self._current) * 2
+            self._previous = np.resize(self._previous, (capacity, 3))
+            self._current = np.resize(self._current, (capacity, 3))
+        return row
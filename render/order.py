@@ -0,0 +1,131 @@
+from bisect import bisect_left, insort
+from typing import Collection, Generic, Iterator, TypeVar
+
+from ..ecs.entity_manager import EntityManager
+from .commands import layer_of_key, make_sort_key
+from .renderable import RenderableBase
+
+R = TypeVar("R", bound=RenderableBase)
+
+
+class RenderOrderIndex(Generic[R]):
+    """Keeps the renderables of one component type sorted by layer and depth.
+
+    The index listens to the entity manager for added and removed renderables and
+    to the renderables themselves for layer/depth changes. Changes are queued and
+    applied by ``refresh``, so walking the index while rendering is always safe and
+    a frame only pays for what changed since the previous one.
+    """
+
+    def __init__(self, em: EntityManager, renderable_type: type[R]) -> None:
+        self._entries: list[tuple[int, int, R]] = []
+        self._entry_by_entity: dict[int, tuple[int, int, R]] = {}
+        self._pending: dict[int, R | None] = {}
+        em.register_listener(renderable_type, self._on_added, self._on_removed)
+        for entity in em.query_by_type(renderable_type):
+            self._on_added(entity, em.get_component(entity, renderable_type))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[tuple[int, R]]:
+        for _, entity, renderable in self._entries:
+            yield entity, renderable
+
+    def iter_layer(self, layer: int) -> Iterator[tuple[int, R]]:
+        start, end = self._layer_span(layer)
+        for index in range(start, end):
+            _, entity, renderable = self._entries[index]
+            yield entity, renderable
+
+    def iter_excluding(self, layers: Collection[int]) -> Iterator[tuple[int, R]]:
+        """Walk the index, jumping over every entry of the given layers."""
+        if not layers:
+            yield from self
+            return
+        entries = self._entries
+        position = 0
+        for layer in sorted(layers):
+            start, end = self._layer_span(layer)
+            for index in range(position, start):
+                _, entity, renderable = entries[index]
+                yield entity, renderable
+            position = max(position, end)
+        for index in range(position, len(entries)):
+            _, entity, renderable = entries[index]
+            yield entity, renderable
+
+    def iter_entities(self, entities: Collection[int]) -> Iterator[tuple[int, R]]:
+        """Walk the entries of the given entities only, in index order.
+
+        A few entities are sorted by their entry, so the cost follows their count
+        rather than the size of the index. Entities not in the index are skipped.
+        """
+        entries = self._entries
+        if len(entities) * 4 > len(entries):
+            for _, entity, renderable in entries:
+                if entity in entities:
+                    yield entity, renderable
+            return
+        entry_by_entity = self._entry_by_entity
+        found = [
+            entry_by_entity[entity] for entity in entities if entity in entry_by_entity
+        ]
+        found.sort(key=_entry_order)
+        for _, entity, renderable in found:
+            yield entity, renderable
+
+    def refresh(self) -> set[int]:
+        """Apply queued additions, removals and reorders.
+
+        Returns the layers whose content changed.
+        """
+        changed_layers: set[int] = set()
+        if not self._pending:
+            return changed_layers
+        pending = self._pending
+        self._pending = {}
+        for entity, renderable in pending.items():
+            entry = self._entry_by_entity.pop(entity, None)
+            if entry is not None:
+                index = bisect_left(self._entries, entry[:2], key=_entry_order)
+                del self._entries[index]
+                changed_layers.add(layer_of_key(entry[0]))
+            if renderable is not None:
+                changed_layers.add(renderable.layer)
+                entry = (
+                    make_sort_key(renderable.layer, renderable.depth),
+                    entity,
+                    renderable,
+                )
+                insort(self._entries, entry, key=_entry_order)
+                self._entry_by_entity[entity] = entry
+        return changed_layers
+
+    def _layer_span(self, layer: int) -> tuple[int, int]:
+        start = bisect_left(
+            self._entries, make_sort_key(layer, -(1 << 32)), key=_entry_key
+        )
+        end = bisect_left(
+            self._entries, make_sort_key(layer + 1, -(1 << 32)), key=_entry_key
+        )
+        return start, end
+
+    def _on_added(self, entity: int, renderable: R) -> None:
+        renderable.set_order_listener(lambda r: self._queue(entity, r))
+        self._queue(entity, renderable)
+
+    def _on_removed(self, entity: int, renderable: R) -> None:
+        renderable.set_order_listener(None)
+        self._queue(entity, None)
+
+    def _queue(self, entity: int, renderable: R | None) -> None:
+        self._pending[entity] = renderable
+
+
+def _entry_key(entry: tuple[int, int, RenderableBase]) -> int:
+    return entry[0]
+
+
+def _entry_order(entry: tuple[int, int, RenderableBase]) -> tuple[int, int]:
+    return entry[0], entry[1]
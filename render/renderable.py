@@ -6,12 +6,19 @@ import weakref
 from ..ecs.component import Component
 from ..ecs.entity_manager import EntityManager
 from .camera import Camera
+from .commands import Emitter
 from .context import RenderContext, RenderSpace
 from .transform import Transform
 
 
 @dataclass(frozen=True)
 class RenderParams:
+    """Arguments of a render callback.
+
+    A callback drawing on the target surface directly, instead of through the
+    context's draw methods, must report what it drew with ``context.mark_dirty``.
+    """
+
     context: RenderContext
     alpha: float
     transform: Optional[Transform] = None
@@ -19,22 +26,67 @@ class RenderParams:
 
 
 class RenderableBase(Component):
+    # Render callbacks and the order listener cannot be copied into snapshots.
+    snapshotted = False
+
     def __init__(
         self,
-        render_function: Callable[
-            [RenderParams],
-            None,
+        render_function: Optional[
+            Callable[
+                [RenderParams],
+                None,
+            ]
         ],
         space: RenderSpace,
         layer: int = 0,
         depth: int = 0,
         visible: bool = True,
+        emit_function: Optional[Emitter] = None,
     ) -> None:
+        self._order_listener: Optional[Callable[[RenderableBase], None]] = None
         self.render_function = render_function
-        self.layer = layer
-        self.depth = depth
+        self.emit_function = emit_function
+        self._layer = layer
+        self._depth = depth
         self.space = space
-        self.visible = visible
+        self._visible = visible
+
+    @property
+    def layer(self) -> int:
+        return self._layer
+
+    @layer.setter
+    def layer(self, layer: int) -> None:
+        self._layer = layer
+        if self._order_listener is not None:
+            self._order_listener(self)
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @depth.setter
+    def depth(self, depth: int) -> None:
+        self._depth = depth
+        if self._order_listener is not None:
+            self._order_listener(self)
+
+    @property
+    def visible(self) -> bool:
+        return self._visible
+
+    @visible.setter
+    def visible(self, visible: bool) -> None:
+        self._visible = visible
+        if self._order_listener is not None:
+            self._order_listener(self)
+
+    def set_order_listener(
+        self, listener: Optional[Callable[["RenderableBase"], None]]
+    ) -> None:
+        """Set the callback notified when ``layer``, ``depth`` or ``visible``
+        changes."""
+        self._order_listener = listener
 
     def render(self, params: RenderParams) -> None:
         self.render_function(params)
@@ -44,13 +96,16 @@ class UIRenderable(RenderableBase):
 
     def __init__(
         self,
-        render_function: Callable[
-            [RenderParams],
-            None,
-        ],
+        render_function: Optional[
+            Callable[
+                [RenderParams],
+                None,
+            ]
+        ] = None,
         layer: int = 0,
         depth: int = 0,
         visible: bool = True,
+        emit_function: Optional[Emitter] = None,
     ) -> None:
         super().__init__(
             render_function,
@@ -58,6 +113,7 @@ class UIRenderable(RenderableBase):
             layer,
             depth,
             visible,
+            emit_function,
         )
 
 
@@ -65,15 +121,20 @@ class WorldRenderable(RenderableBase):
 
     def __init__(
         self,
-        render_function: Callable[
-            [RenderParams],
-            None,
-        ],
+        render_function: Optional[
+            Callable[
+                [RenderParams],
+                None,
+            ]
+        ] = None,
         transform: Transform | None = None,
         layer: int = 0,
         depth: int = 0,
         visible: bool = True,
         debug_visible: bool = False,
+        emit_function: Optional[Emitter] = None,
+        bounds: tuple[float, float] | None = None,
+        static: bool = False,
     ) -> None:
         super().__init__(
             render_function,
@@ -81,12 +142,30 @@ class WorldRenderable(RenderableBase):
             layer,
             depth,
             visible,
+            emit_function,
         )
         self.transform_ref = weakref.ref(transform) if transform else None
         self.debug_visible = debug_visible
+        # Half extents in world units used for culling; None is never culled.
+        self.bounds = bounds
+        # Static renderables are indexed once instead of re-checked every frame.
+        self.static = static
+
+    def get_world_rect(
+        self, transform: Transform
+    ) -> tuple[float, float, float, float] | None:
+        if self.bounds is None:
+            return None
+        x, y = transform.position
+        return (
+            x - self.bounds[0],
+            y - self.bounds[1],
+            x + self.bounds[0],
+            y + self.bounds[1],
+        )
 
     def get_transform(self, em: EntityManager, entity: int) -> Transform | None:
         transform = em.get_component(entity, Transform)
         if transform:
             return transform
-        return self.transform_ref
+        return self.transform_ref() if self.transform_ref else None
@@ -0,0 +1,85 @@
+from math import floor
+
+Rect = tuple[float, float, float, float]  # (min_x, min_y, max_x, max_y)
+CellRange = tuple[int, int, int, int]
+
+
+class SpatialHashGrid:
+    """Uniform grid over world space mapping cells to the entities overlapping them.
+
+    Queries only visit the cells covered by the query rectangle, so their cost
+    depends on how much is inside the rectangle rather than on the world size.
+    """
+
+    def __init__(self, cell_size: float = 128.0) -> None:
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set[int]] = {}
+        self._ranges: dict[int, CellRange] = {}
+
+    def __len__(self) -> int:
+        return len(self._ranges)
+
+    def __contains__(self, entity: int) -> bool:
+        return entity in self._ranges
+
+    def insert(self, entity: int, rect: Rect) -> None:
+        """Insert or move an entity. Does nothing if its cells did not change."""
+        cell_range = self._cell_range(rect)
+        previous = self._ranges.get(entity)
+        if previous == cell_range:
+            return
+        if previous is not None:
+            self._unlink(entity, previous)
+        self._ranges[entity] = cell_range
+        min_x, min_y, max_x, max_y = cell_range
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                self._cells.setdefault((cx, cy), set()).add(entity)
+
+    def remove(self, entity: int) -> None:
+        cell_range = self._ranges.pop(entity, None)
+        if cell_range is not None:
+            self._unlink(entity, cell_range)
+
+    def query(self, rect: Rect) -> set[int]:
+        """Get the entities in cells overlapping the rectangle.
+
+        The result is conservative: entities near the rectangle may be included.
+        """
+        result: set[int] = set()
+        min_x, min_y, max_x, max_y = self._cell_range(rect)
+        cells = self._cells
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(cells):
+            for (cx, cy), entities in cells.items():
+                if min_x <= cx <= max_x and min_y <= cy <= max_y:
+                    result |= entities
+            return result
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                entities = cells.get((cx, cy))
+                if entities:
+                    result |= entities
+        return result
+
+    def clear(self) -> None:
+        self._cells.clear()
+        self._ranges.clear()
+
+    def _cell_range(self, rect: Rect) -> CellRange:
+        size = self.cell_size
+        return (
+            floor(rect[0] / size),
+            floor(rect[1] / size),
+            floor(rect[2] / size),
+            floor(rect[3] / size),
+        )
+
+    def _unlink(self, entity: int, cell_range: CellRange) -> None:
+        min_x, min_y, max_x, max_y = cell_range
+        for cx in range(min_x, max_x + 1):
+            for cy in range(min_y, max_y + 1):
+                entities = self._cells.get((cx, cy))
+                if entities is not None:
+                    entities.discard(entity)
+                    if not entities:
+                        del self._cells[(cx, cy)]
@@ -1,15 +1,47 @@
-from typing import Iterable
+from dataclasses import dataclass
+from enum import Enum, auto
+from typing import Callable, Iterable, Optional
 from .camera import Camera
+from .commands import RenderCommandBuffer
 from .context import RenderContext
+from .interpolation import TransformHistory
+from .order import RenderOrderIndex
 from .renderable import (
+    RenderableBase,
     UIRenderable,
     WorldRenderable,
     RenderParams,
     RenderSpace,
 )
+from .spatial_index import SpatialHashGrid
+from .target import RenderTarget
+from .transform import Transform
 from ..ecs.entity_manager import EntityManager
 
 
+@dataclass
+class RenderStats:
+    drawn: int = 0
+    culled: int = 0
+
+
+class LayerCachePolicy(Enum):
+    NONE = auto()
+    # Rendered once, until invalidate_layer is called.
+    STATIC = auto()
+    # Like STATIC, and also invalidated when a renderable in the layer is added,
+    # removed, reordered or shown/hidden.
+    INVALIDATE_ON_CHANGE = auto()
+
+
+@dataclass
+class _LayerCache:
+    policy: LayerCachePolicy
+    target: Optional[RenderTarget] = None
+    valid: bool = False
+    camera_version: int = -1
+
+
 class RenderSystem:
     def __init__(
         self,
@@ -17,11 +49,34 @@ class RenderSystem:
         context: RenderContext,
         camera: Camera,
         debug: bool = False,
+        command_capacity: int = 1024,
+        cull: bool = True,
+        cell_size: float = 128.0,
     ) -> None:
         self.em = em
         self.context = context
         self.camera = camera
         self.debug = debug
+        self.commands = RenderCommandBuffer(command_capacity)
+        self._world_order = RenderOrderIndex(em, WorldRenderable)
+        self._ui_order = RenderOrderIndex(em, UIRenderable)
+        self.cull = cull
+        self.stats = RenderStats()
+        self.interpolation: TransformHistory | None = None
+        self._grid = SpatialHashGrid(cell_size)
+        self._unbounded: set[int] = set()
+        self._dynamic: dict[int, WorldRenderable] = {}
+        self._unindexed: dict[int, WorldRenderable] = {}
+        self._layer_caches: dict[RenderSpace, dict[int, _LayerCache]] = {
+            RenderSpace.WORLD: {},
+            RenderSpace.SCREEN: {},
+        }
+        em.register_listener(
+            WorldRenderable, self._on_world_added, self._on_world_removed
+        )
+        for entity in em.query_by_type(WorldRenderable):
+            self._on_world_added(entity, em.get_component(entity, WorldRenderable))
+        em.register_listener(Transform, self._on_transform_added)
 
     def set_context(self, context: RenderContext) -> None:
         self.context = context
@@ -29,38 +84,219 @@ class RenderSystem:
     def set_camera(self, camera: Camera) -> None:
         self.camera = camera
 
+    def set_interpolation(self, history: TransformHistory | None) -> None:
+        """Render world transforms blended between the last two fixed steps."""
+        self.interpolation = history
+
+    def set_layer_policy(
+        self, space: RenderSpace, layer: int, policy: LayerCachePolicy
+    ) -> None:
+        """Cache a layer in an offscreen target and composite it with one draw.
+
+        World layers are also re-rendered whenever the camera changes.
+        """
+        if policy == LayerCachePolicy.NONE:
+            self._layer_caches[space].pop(layer, None)
+        else:
+            self._layer_caches[space][layer] = _LayerCache(policy)
+
+    def invalidate_layer(self, space: RenderSpace, layer: int) -> None:
+        cache = self._layer_caches[space].get(layer)
+        if cache is not None:
+            cache.valid = False
+
+    def refresh_bounds(self, entity: int) -> None:
+        """Re-index a static renderable after its bounds or transform changed.
+
+        Dynamic renderables are checked against the index every frame."""
+        renderable = self.em.get_component(entity, WorldRenderable)
+        if renderable is not None:
+            self._unindexed[entity] = renderable
+
     def render(self, alpha: float = 1.0) -> None:
         self.context.start_frame()
-        renderable_ids = self.em.query_by_type(WorldRenderable)
-        self._render_world(renderable_ids, alpha)
-        renderable_ids = self.em.query_by_type(UIRenderable)
-        self._render_ui(renderable_ids, alpha)
+        self._invalidate_changed_layers(RenderSpace.WORLD, self._world_order.refresh())
+        self._render_world(alpha)
+        self._invalidate_changed_layers(RenderSpace.SCREEN, self._ui_order.refresh())
+        self._render_ui(alpha)
         self.context.end_frame()
 
-    def _render_world(self, renderable_ids: Iterable[int], alpha: float) -> None:
+    def _render_world(self, alpha: float) -> None:
         self.context.set_space(RenderSpace.WORLD)
-        sorted_entity_renderable_pairs: list[tuple[int, WorldRenderable]] = sorted(
-            (
-                (entity, self.em.get_component(entity, WorldRenderable))
-                for entity in renderable_ids
-            ),
-            key=lambda pair: (pair[1].layer, pair[1].depth),
-        )
-        for entity, renderable in sorted_entity_renderable_pairs:
-            transform = renderable.get_transform(self.em, entity)
-            if not transform:
+        history = self.interpolation
+        if history is not None:
+            history.blend(alpha)
+
+        def emit(entity: int, renderable: WorldRenderable) -> bool:
+            return self._emit_world(entity, renderable, alpha)
+
+        cached_layers = self._layer_caches[RenderSpace.WORLD]
+        self._prepare_layer_caches(RenderSpace.WORLD, self._world_order, emit)
+        drawn = 0
+        for entity, renderable in self._world_candidates(cached_layers.keys()):
+            if emit(entity, renderable):
+                drawn += 1
+        self.commands.flush(self.context)
+        self.stats.drawn = drawn
+
+    def _emit_world(
+        self, entity: int, renderable: WorldRenderable, alpha: float
+    ) -> bool:
+        if not (renderable.visible or (renderable.debug_visible and self.debug)):
+            return False
+        transform = renderable.get_transform(self.em, entity)
+        if not transform:
+            return False
+        if self.interpolation is not None:
+            transform = self.interpolation.interpolate(entity, transform)
+        self._emit(renderable, alpha, transform, self.camera)
+        return True
+
+    def _world_candidates(
+        self, cached_layers: Iterable[int]
+    ) -> Iterable[tuple[int, WorldRenderable]]:
+        if not self.cull or self.camera is None:
+            self.stats.culled = 0
+            return self._world_order.iter_excluding(cached_layers)
+        cached_layers = set(cached_layers)
+        self._update_spatial_index()
+        min_x, min_y, max_x, max_y = self.camera.get_world_bounds()
+        candidates = self._grid.query((min_x, min_y, max_x, max_y))
+        candidates |= self._unbounded
+        in_view: list[tuple[int, WorldRenderable]] = []
+        # Walking the candidates in index order records the commands already
+        # sorted, so the command buffer does not sort them again.
+        for entity, renderable in self._world_order.iter_entities(candidates):
+            if renderable.layer in cached_layers:
                 continue
-            if renderable.visible or (renderable.debug_visible and self.debug):
-                renderable.render(
-                    RenderParams(self.context, alpha, transform, self.camera)
-                )
+            if renderable.bounds is not None:
+                transform = renderable.get_transform(self.em, entity)
+                if transform is None:
+                    continue
+                rect = renderable.get_world_rect(transform)
+                if (
+                    rect[2] < min_x
+                    or rect[0] > max_x
+                    or rect[3] < min_y
+                    or rect[1] > max_y
+                ):
+                    continue
+            in_view.append((entity, renderable))
+        self.stats.culled = len(self._world_order) - len(in_view)
+        return in_view
+
+    def _update_spatial_index(self) -> None:
+        if self._unindexed:
+            pending = self._unindexed
+            self._unindexed = {}
+            for entity, renderable in pending.items():
+                if not self._index_entity(entity, renderable):
+                    self._unindexed[entity] = renderable
+        # Transforms are plain data, often moved by assigning to them, so the
+        # bounds of dynamic renderables are checked every frame. The grid only
+        # relinks the ones that moved to other cells.
+        for entity, renderable in self._dynamic.items():
+            self._index_entity(entity, renderable)
+
+    def _index_entity(self, entity: int, renderable: WorldRenderable) -> bool:
+        transform = renderable.get_transform(self.em, entity)
+        if transform is None:
+            return False
+        rect = renderable.get_world_rect(transform)
+        if rect is None:
+            self._grid.remove(entity)
+            self._unbounded.add(entity)
+        else:
+            self._unbounded.discard(entity)
+            self._grid.insert(entity, rect)
+        return True
+
+    def _on_world_added(self, entity: int, renderable: WorldRenderable) -> None:
+        self._unindexed[entity] = renderable
+        if not renderable.static:
+            self._dynamic[entity] = renderable
 
-    def _render_ui(self, renderable_ids: Iterable[int], alpha: float) -> None:
+    def _on_transform_added(self, entity: int, transform: Transform) -> None:
+        # Also called for transforms replaced by restoring a snapshot.
+        renderable = self.em.get_component(entity, WorldRenderable)
+        if renderable is not None:
+            self._unindexed[entity] = renderable
+
+    def _on_world_removed(self, entity: int, renderable: WorldRenderable) -> None:
+        self._unindexed.pop(entity, None)
+        self._dynamic.pop(entity, None)
+        self._unbounded.discard(entity)
+        self._grid.remove(entity)
+
+    def _render_ui(self, alpha: float) -> None:
         self.context.set_space(RenderSpace.SCREEN)
-        renderables: list[UIRenderable] = sorted(
-            (self.em.get_component(entity, UIRenderable) for entity in renderable_ids),
-            key=lambda r: (r.layer, r.depth),
-        )
-        for renderable in renderables:
-            if renderable.visible:
-                renderable.render(RenderParams(self.context, alpha))
+
+        def emit(entity: int, renderable: UIRenderable) -> bool:
+            if not renderable.visible:
+                return False
+            self._emit(renderable, alpha)
+            return True
+
+        cached_layers = self._layer_caches[RenderSpace.SCREEN]
+        self._prepare_layer_caches(RenderSpace.SCREEN, self._ui_order, emit)
+        for entity, renderable in self._ui_order.iter_excluding(cached_layers.keys()):
+            emit(entity, renderable)
+        self.commands.flush(self.context)
+
+    def _invalidate_changed_layers(self, space: RenderSpace, layers: set[int]) -> None:
+        caches = self._layer_caches[space]
+        for layer in layers:
+            cache = caches.get(layer)
+            if cache and cache.policy == LayerCachePolicy.INVALIDATE_ON_CHANGE:
+                cache.valid = False
+
+    def _prepare_layer_caches(
+        self,
+        space: RenderSpace,
+        order: RenderOrderIndex,
+        emit: Callable[[int, RenderableBase], bool],
+    ) -> None:
+        """Re-render invalid cached layers into their targets and queue one draw of
+        every cached layer in the command buffer."""
+        caches = self._layer_caches[space]
+        if not caches:
+            return
+        resolution = self.context.get_resolution()
+        for layer, cache in caches.items():
+            if cache.target is None or cache.target.get_size() != resolution:
+                cache.target = self.context.create_target(resolution)
+                cache.valid = False
+            if space == RenderSpace.WORLD and self.camera is not None:
+                if cache.camera_version != self.camera.version:
+                    cache.camera_version = self.camera.version
+                    cache.valid = False
+            if not cache.valid:
+                previous_target = self.context.get_target()
+                self.context.set_target(cache.target)
+                cache.target.clear((0, 0, 0))
+                for entity, renderable in order.iter_layer(layer):
+                    emit(entity, renderable)
+                self.commands.flush(self.context)
+                self.context.set_target(previous_target)
+                cache.valid = True
+        # Queued only once every cache is rendered, so flushing a cache does not
+        # draw the other cached layers into it.
+        for layer, cache in caches.items():
+            # Lowest depth, so the cached layer sorts before anything else in it.
+            self.commands.begin(layer, -(1 << 15))
+            self.commands.push_callback(self.context.draw_target, cache.target)
+
+    def _emit(
+        self,
+        renderable: RenderableBase,
+        alpha: float,
+        transform: Transform | None = None,
+        camera: Camera | None = None,
+    ) -> None:
+        self.commands.begin(renderable.layer, renderable.depth)
+        if renderable.emit_function is not None:
+            renderable.emit_function(self.commands, transform, camera)
+        else:
+            self.commands.push_callback(
+                renderable.render, RenderParams(self.context, alpha, transform, camera)
+            )
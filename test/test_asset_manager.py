@@ -0,0 +1,114 @@
+from concurrent import futures
+import threading
+import time
+
+import pytest
+
+from pygmk2d.assets.manager import AssetError, AssetManager, AssetState
+from pygmk2d.core.event_manager import LogPolicy
+
+
+@pytest.fixture
+def asset_dir(tmp_path):
+    """Tạo một thư mục chứa ba tệp với kích thước khác nhau."""
+    for name, size in (("a.bin", 10), ("b.bin", 20), ("c.bin", 30)):
+        (tmp_path / name).write_bytes(b"x" * size)
+    return tmp_path
+
+
+def read_bytes(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
+
+
+@pytest.fixture
+def manager():
+    """AssetManager đọc bytes, kích thước tài nguyên là số byte."""
+    manager = AssetManager(read_bytes, size_of=len, max_workers=2)
+    yield manager
+    manager.shutdown()
+
+
+def test_load_folder_decodes_on_worker_threads(manager, asset_dir):
+    """load_folder dùng đường dẫn đầy đủ và giải mã trên luồng khác."""
+    threads = set()
+
+    def decoder(path):
+        threads.add(threading.current_thread().name)
+        return read_bytes(path)
+
+    manager.decoder = decoder
+    handles = manager.load_folder(str(asset_dir))
+    manager.wait()
+
+    assert [handle.name for handle in handles] == ["a.bin", "b.bin", "c.bin"]
+    assert all(handle.ready for handle in handles)
+    assert manager.get_asset("b.bin") == b"x" * 20
+    assert manager.memory_used == 60
+    assert threading.current_thread().name not in threads
+
+
+def test_load_same_asset_shares_handle(manager, asset_dir):
+    """Tải lại cùng tài nguyên chỉ tăng số tham chiếu."""
+    first = manager.load(str(asset_dir / "a.bin"))
+    second = manager.load(str(asset_dir / "a.bin"))
+
+    assert first is second
+    assert first.refcount == 2
+    assert first.get() == b"x" * 10
+
+
+def test_lru_eviction_keeps_referenced_assets(manager, asset_dir):
+    """Khi vượt ngân sách, tài nguyên không còn tham chiếu và ít dùng nhất bị loại."""
+    handles = manager.load_folder(str(asset_dir))
+    manager.wait()
+    manager.release(handles[0])
+    manager.release(handles[1])
+    manager.get_asset("a.bin")
+
+    manager.set_memory_budget(45)
+
+    assert manager.has("a.bin")
+    assert not manager.has("b.bin")
+    assert manager.has("c.bin")
+    assert manager.memory_used == 40
+
+
+def test_failed_load_follows_log_policy(asset_dir):
+    """Lỗi giải mã được báo khi poll theo LogPolicy; handle.get ném AssetError."""
+    manager = AssetManager(read_bytes, log_policy=LogPolicy.IGNORE)
+    handle = manager.load(str(asset_dir / "missing.bin"))
+    manager.wait()
+
+    assert handle.state == AssetState.FAILED
+    with pytest.raises(AssetError):
+        handle.get()
+    with pytest.raises(KeyError):
+        manager.get_asset("missing.bin")
+    manager.shutdown()
+
+
+class SlowQueue:
+    """Hàng đợi trì hoãn put, như khi done callback chạy sau khi wait thức dậy."""
+
+    def __init__(self, completed):
+        self.completed = completed
+
+    def put(self, handle):
+        time.sleep(0.1)
+        self.completed.put(handle)
+
+    def get_nowait(self):
+        return self.completed.get_nowait()
+
+
+def test_get_does_not_depend_on_done_callback(manager, asset_dir):
+    """get và get_asset hoàn tất handle từ future dù callback chưa xếp hàng."""
+    manager._completed = SlowQueue(manager._completed)
+    first = manager.load(str(asset_dir / "a.bin"))
+    second = manager.load(str(asset_dir / "b.bin"))
+
+    assert first.get() == b"x" * 10
+    futures.wait([second._future])
+    assert manager.get_asset("b.bin") == b"x" * 20
+    assert manager.memory_used == 30
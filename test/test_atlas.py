@@ -0,0 +1,79 @@
+from itertools import combinations
+
+import numpy as np
+import pygame
+import pytest
+
+from pygmk2d.pygame_backend.atlas import SpriteBatcher, build_atlas
+from pygmk2d.render.atlas import AtlasPackingError, pack_rects
+
+
+def test_pack_rects_never_overlaps_and_stays_in_bounds():
+    """Các vùng đã xếp không chồng lên nhau, kể cả lề, và nằm trong trang."""
+    rng = np.random.default_rng(1)
+    sizes = {
+        f"t{i}": (int(w), int(h))
+        for i, (w, h) in enumerate(rng.integers(1, 60, (200, 2)))
+    }
+    page_size = (128, 128)
+
+    regions, pages = pack_rects(sizes, page_size, padding=1)
+
+    assert len(pages) > 1
+    assert set(regions) == set(sizes)
+    for key, region in regions.items():
+        assert (region.width, region.height) == sizes[key]
+        assert region.x >= 1 and region.y >= 1
+        assert region.x + region.width + 1 <= pages[region.page][0] <= page_size[0]
+        assert region.y + region.height + 1 <= pages[region.page][1] <= page_size[1]
+    for a, b in combinations(regions.values(), 2):
+        if a.page == b.page:
+            assert (
+                a.x + a.width + 1 <= b.x - 1
+                or b.x + b.width + 1 <= a.x - 1
+                or a.y + a.height + 1 <= b.y - 1
+                or b.y + b.height + 1 <= a.y - 1
+            )
+    with pytest.raises(AtlasPackingError):
+        pack_rects({"huge": (128, 10)}, page_size, padding=1)
+
+
+def test_sprite_batcher_draws_from_atlas_pages():
+    """SpriteBatcher vẽ đúng màu của từng texture, kể cả khi được phóng to."""
+    images = {}
+    for name, color in (("red", (255, 0, 0)), ("blue", (0, 0, 255))):
+        images[name] = pygame.Surface((4, 4), pygame.SRCALPHA)
+        images[name].fill(color)
+    batcher = SpriteBatcher(build_atlas(images, (16, 16)))
+    target = pygame.Surface((32, 32))
+
+    rects = batcher.draw(
+        target, ["red", "blue"], [(0, 0), (10, 10)], [(4, 4), (8, 8)], [0.0, 0.0]
+    )
+
+    assert [tuple(rect) for rect in rects] == [(0, 0, 4, 4), (10, 10, 8, 8)]
+    assert tuple(target.get_at((3, 3)))[:3] == (255, 0, 0)
+    assert tuple(target.get_at((17, 17)))[:3] == (0, 0, 255)
+    assert tuple(target.get_at((5, 5)))[:3] == (0, 0, 0)
+
+
+def test_sprite_batcher_quantizes_rotation_and_evicts_lru():
+    """Góc xoay được làm tròn, bộ đệm bỏ bề mặt ít dùng gần đây nhất khi đầy."""
+    image = pygame.Surface((4, 4), pygame.SRCALPHA)
+    batcher = SpriteBatcher(build_atlas({"box": image}, (16, 16)), cache_size=2)
+    target = pygame.Surface((32, 32))
+
+    def draw(rotation: float) -> None:
+        batcher.draw(target, ["box"], [(8, 8)], [(4, 4)], [rotation])
+
+    for rotation in (10.0, 10.2, 9.8, 370.1, 0.3):
+        draw(rotation)
+    assert list(batcher._transformed) == [("box", (4, 4), 10.0)]
+
+    draw(20.0)
+    draw(10.0)
+    draw(30.0)
+    assert list(batcher._transformed) == [
+        ("box", (4, 4), 10.0),
+        ("box", (4, 4), 30.0),
+    ]
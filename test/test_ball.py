@@ -0,0 +1,63 @@
+from itertools import combinations
+
+import numpy as np
+import pygame
+
+from pygmk2d.ball import (
+    Ball,
+    BallSet,
+    exchange_momentum,
+    is_ball_collided,
+    move_ball_colliding,
+)
+
+RESOLUTION = (100, 80)
+SCENE = [
+    # radius, position, mass, velocity
+    (5.0, (20.0, 20.0), 1.0, (30.0, 0.0)),
+    (5.0, (27.0, 20.0), 2.0, (-10.0, 5.0)),
+    (4.0, (2.0, 50.0), 1.0, (-20.0, 10.0)),
+    (3.0, (60.0, 60.0), 3.0, (0.0, -15.0)),
+]
+
+
+def test_ball_set_matches_balls():
+    """BallSet cập nhật và va chạm giống hệt Ball với các hàm va chạm từng cặp."""
+    color = pygame.Color("white")
+    balls = [Ball(r, p, color, m, v) for r, p, m, v in SCENE]
+    ball_set = BallSet(capacity=2)
+    for ball in balls:
+        ball_set.add_ball(ball)
+
+    for _ in range(5):
+        for ball in balls:
+            ball.update(RESOLUTION, 1 / 60)
+        for ball_1, ball_2 in combinations(balls, 2):
+            if is_ball_collided(ball_1, ball_2):
+                move_ball_colliding(ball_1, ball_2)
+                exchange_momentum(ball_1, ball_2, 0.0)
+        ball_set.update(RESOLUTION, 1 / 60)
+        ball_set.collide()
+
+    assert np.allclose(
+        ball_set.bodies.positions, [tuple(ball.get_position()) for ball in balls]
+    )
+    assert np.allclose(
+        ball_set.bodies.velocities, [tuple(ball.get_velocity()) for ball in balls]
+    )
+
+
+def test_ball_setters_update_vectors_in_place():
+    """Setter và update ghi vào chính các vector của Ball, không tạo vector mới."""
+    ball = Ball(2.0, (10.0, 10.0), pygame.Color("red"), 1.0)
+    position = ball.get_position()
+    velocity = ball.get_velocity()
+
+    ball.move((3.0, 4.0))
+    ball.set_velocity(pygame.Vector2(6.0, -8.0))
+    ball.update(RESOLUTION, 0.5)
+
+    assert ball.get_position() is position
+    assert ball.get_velocity() is velocity
+    assert position == (6.0, 0.0)
+    assert velocity == (6.0, -8.0)
@@ -0,0 +1,59 @@
+import pytest
+
+from pygmk2d.assets.bundle import BundleError, BundleReader, write_bundle
+from pygmk2d.pygame_backend.bundle import BundleAssetManager
+
+
+def test_bundle_round_trip(tmp_path):
+    """Dữ liệu ghi vào bundle được đọc lại nguyên vẹn qua memory map, đã căn lề."""
+    path = tmp_path / "assets.pgb"
+    assets = [
+        ("a.png", 2, 1, "RGBA", bytes(range(8))),
+        ("b.png", 1, 1, "RGB", b"\x01\x02\x03"),
+    ]
+    with open(path, "wb") as file:
+        index = write_bundle(file, assets)
+
+    with BundleReader(str(path)) as reader:
+        assert len(reader) == 2
+        assert "a.png" in reader
+        assert reader.get_entry("b.png") == index["b.png"]
+        assert bytes(reader.get_buffer("a.png")) == bytes(range(8))
+        assert bytes(reader.get_buffer("b.png")) == b"\x01\x02\x03"
+        assert all(entry.offset % 16 == 0 for entry in reader.entries.values())
+        with pytest.raises(KeyError):
+            reader.get_entry("missing.png")
+
+
+def test_reject_non_bundle_file(tmp_path):
+    """Tệp không có magic number của bundle bị từ chối."""
+    path = tmp_path / "not_a_bundle.bin"
+    path.write_bytes(b"\x89PNG" + bytes(16))
+
+    with pytest.raises(BundleError):
+        BundleReader(str(path))
+
+
+def test_reject_file_shorter_than_header(tmp_path):
+    """Tệp ngắn hơn header bị từ chối bằng BundleError thay vì struct.error."""
+    path = tmp_path / "short.pgb"
+    path.write_bytes(b"PGB")
+
+    with pytest.raises(BundleError):
+        BundleReader(str(path))
+
+
+def test_close_with_surfaces_in_use_keeps_bundle_open(tmp_path):
+    """Đóng bundle khi surface còn dùng bộ nhớ map thì báo lỗi và bundle vẫn dùng được."""
+    path = tmp_path / "assets.pgb"
+    with open(path, "wb") as file:
+        write_bundle(file, [("a.png", 1, 1, "RGBA", b"\x01\x02\x03\xff")])
+    manager = BundleAssetManager(str(path))
+    surface = manager.get_asset("a.png")
+
+    with pytest.raises(BundleError):
+        manager.close()
+    assert tuple(manager.get_asset("a.png").get_at((0, 0))) == (1, 2, 3, 255)
+
+    del surface
+    manager.close()
@@ -0,0 +1,43 @@
+import numpy as np
+
+from pygmk2d.render.camera import Camera
+
+
+def make_camera() -> Camera:
+    return Camera((320, 240), (15.0, -40.0), 2.5, rotation=30.0)
+
+
+def test_batch_transforms_match_scalar_ones():
+    """Các phép biến đổi theo lô cho cùng kết quả với phép biến đổi từng điểm."""
+    camera = make_camera()
+    rng = np.random.default_rng(0)
+    positions = rng.uniform(-500.0, 500.0, (50, 2))
+    sizes = rng.uniform(1.0, 40.0, (50, 2))
+
+    screen, screen_sizes = camera.transform_rects_batch(positions, sizes)
+
+    expected = [
+        camera.transform_rect(tuple(p), tuple(s)) for p, s in zip(positions, sizes)
+    ]
+    assert np.allclose(screen, [position for position, _ in expected])
+    assert np.allclose(screen_sizes, [size for _, size in expected])
+    assert np.allclose(
+        camera.screen_to_world_batch(screen),
+        [camera.screen_to_world(tuple(p)) for p in screen],
+    )
+    assert np.allclose(camera.screen_to_world_batch(screen), positions)
+
+
+def test_matrix_is_rebuilt_after_changes():
+    """Ma trận được lưu đệm và tính lại khi camera thay đổi."""
+    camera = make_camera()
+    matrix = camera.get_matrix()
+    assert camera.get_matrix() is matrix
+
+    camera.move((5.0, 5.0))
+    camera.set_rotation(-90.0)
+
+    assert camera.get_matrix() is not matrix
+    # The camera center is always drawn at the middle of the viewport.
+    assert np.allclose(camera.world_to_screen((20.0, -35.0)), (160.0, 120.0))
+    assert np.allclose(camera.world_to_screen_batch([(20.0, -35.0)]), [(160.0, 120.0)])
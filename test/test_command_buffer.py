@@ -0,0 +1,52 @@
+from dataclasses import dataclass
+
+from pygmk2d.ecs.component import Component
+from pygmk2d.ecs.entity_manager import EntityManager
+
+
+@dataclass
+class Health(Component):
+    value: int = 100
+
+
+@dataclass
+class Poisoned(Component):
+    pass
+
+
+def test_commands_are_deferred_until_apply():
+    """Thay đổi cấu trúc chỉ được áp dụng khi gọi apply, nên duyệt query vẫn an toàn."""
+    em = EntityManager()
+    entities = [em.create_entity() for _ in range(3)]
+    for entity in entities:
+        em.add_component(entity, Health(entity * 50))
+
+    for entity in em.query_by_type(Health):
+        if em.get_component(entity, Health).value == 0:
+            em.commands.despawn(entity)
+        else:
+            em.commands.add(entity, Poisoned())
+    spawned = em.commands.spawn(Health())
+
+    assert em.filter_entities([Poisoned]) == set()
+    assert em.commands.apply() == 4
+    assert em.query_by_type(Health) == (1, 2, spawned)
+    assert em.filter_entities([Health, Poisoned]) == {1, 2}
+    assert len(em.commands) == 0
+
+
+def test_last_command_per_component_wins():
+    """Chỉ lệnh cuối cùng cho mỗi cặp entity/component được giữ; despawn áp dụng sau cùng."""
+    em = EntityManager()
+    entity = em.create_entity()
+    em.commands.add(entity, Poisoned())
+    em.commands.remove(entity, Poisoned)
+    em.commands.add(entity, Health(1))
+    discarded = em.commands.spawn(Health())
+    em.commands.despawn(discarded)
+
+    em.commands.apply()
+
+    assert not em.has_component(entity, Poisoned)
+    assert em.get_component(entity, Health).value == 1
+    assert em.get_component(discarded, Health) is None
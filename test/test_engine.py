@@ -105,6 +105,7 @@ def test_step_calls_systems(engine: Engine):
     engine.event_manager.external.process_event_queue = MagicMock()
     engine.event_manager.internal.process_event_queue = MagicMock()
     engine.render_system.render = MagicMock()
+    engine.jobs.run = MagicMock()
 
     class DummySystem:
         def __init__(self, em):
@@ -117,5 +118,27 @@ def test_step_calls_systems(engine: Engine):
     engine.event_manager.external.process_event_queue.assert_called_once()
     engine.event_manager.internal.process_event_queue.assert_called_once()
     engine.render_system.render.assert_called_once()
+    engine.jobs.run.assert_called_once()
     engine._fixed_delta_systems[0].update.assert_called_once_with(0.01)
     engine._variable_delta_systems[0].update.assert_called_once_with(0.016)
+    assert engine.em.advance_tick.call_count == 3
+    assert engine.em.commands.apply.call_count == 2
+
+
+def test_step_captures_transforms_per_fixed_step(engine: Engine):
+    engine.set_fixed_dt(0.01)
+    engine.input_manager.poll = MagicMock()
+    engine.render_system.render = MagicMock()
+    engine.transform_history.capture = MagicMock()
+
+    engine.step(0.01)
+    assert engine.render_system.interpolation is None
+    assert engine.transform_history.capture.call_count == 0
+
+    engine.set_interpolation(True)
+    engine.step(0.025)
+    assert engine.transform_history.capture.call_count == 2
+
+    engine.set_interpolation(False)
+    engine.step(0.01)
+    assert engine.transform_history.capture.call_count == 2
@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+
+from pygmk2d.ecs.component import Component
+from pygmk2d.ecs.entity_manager import EntityManager
+from pygmk2d.ecs.registry import ComponentRegistry
+
+
+@dataclass
+class Position(Component):
+    x: float = 0.0
+
+
+@dataclass
+class Velocity(Component):
+    dx: float = 0.0
+
+
+def make_same_name_class() -> type[Component]:
+    """Tạo một lớp component khác nhưng trùng tên với Position."""
+
+    @dataclass
+    class Position(Component):
+        y: float = 0.0
+
+    return Position
+
+
+def test_registry_assigns_sequential_ids():
+    """Mỗi lớp component nhận một id nguyên nhỏ, đăng ký lại trả về id cũ."""
+    registry = ComponentRegistry()
+
+    assert registry.register(Position) == 0
+    assert registry.register(Velocity) == 1
+    assert registry.register(Position) == 0
+    assert registry.get_mask([Position, Velocity]) == 0b11
+
+
+def test_classes_with_same_name_do_not_collide():
+    """Hai lớp cùng tên từ hai nơi khác nhau được lưu riêng biệt."""
+    em = EntityManager()
+    other_position = make_same_name_class()
+    entity = em.create_entity()
+    em.add_component(entity, Position(1.0))
+    em.add_component(entity, other_position(2.0))
+
+    assert em.get_component(entity, Position).x == 1.0
+    assert em.get_component(entity, other_position).y == 2.0
+    assert set(em.get_all_components(entity)) == {Position, other_position}
+
+
+def test_filter_entities_uses_masks():
+    """filter_entities trả về các entity có đủ mọi component được yêu cầu."""
+    em = EntityManager()
+    moving = em.create_entity()
+    still = em.create_entity()
+    em.add_component(moving, Position())
+    em.add_component(moving, Velocity())
+    em.add_component(still, Position())
+
+    assert em.filter_entities([Position, Velocity]) == {moving}
+    assert em.filter_entities([Position]) == {moving, still}
+
+    em.remove_component(moving, Velocity)
+    assert em.filter_entities([Position, Velocity]) == set()
+    assert not em.has_component(moving, Velocity)
+
+    em.remove_entity(still)
+    assert em.query_by_type(Position) == (moving,)
+    assert em.get_mask(still) == 0
+
+
+def test_change_ticks_track_adds_and_writes():
+    """Chỉ các component được thêm hoặc ghi qua accessor sau tick đã lưu được trả về."""
+    em = EntityManager()
+    first = em.create_entity()
+    second = em.create_entity()
+    em.add_component(first, Position())
+    em.add_component(second, Position())
+    seen = em.tick
+    em.advance_tick()
+
+    assert em.changed_since(Position, seen) == ()
+
+    em.get_component_mut(second, Position).x = 5.0
+    em.get_component(first, Position).x = 1.0
+    assert em.changed_since(Position, seen) == (second,)
+    assert em.added_since(Position, seen) == ()
+
+    third = em.create_entity()
+    em.add_component(third, Position())
+    em.mark_changed(first, Position)
+    assert em.changed_since(Position, seen) == (second, third, first)
+    assert em.added_since(Position, seen) == (third,)
+
+    em.remove_entity(second)
+    assert em.changed_since(Position, seen) == (third, first)
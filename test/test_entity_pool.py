@@ -0,0 +1,91 @@
+from dataclasses import dataclass
+
+import pytest
+
+from pygmk2d.ecs.component import Component
+from pygmk2d.ecs.entity_manager import EntityManager
+from pygmk2d.ecs.pool import EntityPool
+
+
+@dataclass
+class Projectile(Component):
+    speed: float = 10.0
+    lifetime: float = 1.0
+
+
+@pytest.fixture
+def em() -> EntityManager:
+    return EntityManager()
+
+
+def test_spawn_reuses_prewarmed_entities(em: EntityManager):
+    """Entity đã cấp phát trước được tái sử dụng, không tạo component mới."""
+    pool = EntityPool(em, lambda: [Projectile()], size=2)
+    first = pool.spawn()
+    component = em.get_component(first, Projectile)
+    pool.despawn(first)
+
+    assert em.get_component(first, Projectile) is None
+    assert pool.spawn() == first
+    assert em.get_component(first, Projectile) is component
+    assert pool.stats.hits == 2
+    assert pool.stats.misses == 0
+
+
+def test_spawn_resets_fields(em: EntityManager):
+    """Các trường bị thay đổi được đặt lại về giá trị của prefab khi spawn."""
+    pool = EntityPool(em, lambda: [Projectile()], size=1)
+    entity = pool.spawn()
+    em.get_component(entity, Projectile).lifetime = 0.0
+    pool.despawn(entity)
+
+    entity = pool.spawn()
+
+    assert em.get_component(entity, Projectile).lifetime == 1.0
+
+
+def test_empty_pool_grows_and_counts_miss(em: EntityManager):
+    """Pool rỗng tạo entity mới và ghi nhận một lần miss."""
+    pool = EntityPool(em, lambda: [Projectile()])
+    entities = {pool.spawn(), pool.spawn()}
+
+    assert len(entities) == 2
+    assert pool.stats.misses == 2
+    assert pool.active_count == 2
+    assert set(em.query_by_type(Projectile)) == entities
+    with pytest.raises(ValueError):
+        pool.despawn(99)
+
+
+class Sprite(Component):
+    __slots__ = ("frame", "_layer")
+    layer_changes: list[int] = []
+
+    def __init__(self) -> None:
+        self.frame = 0
+        self._layer = 1
+
+    @property
+    def layer(self) -> int:
+        return self._layer
+
+    @layer.setter
+    def layer(self, layer: int) -> None:
+        self._layer = layer
+        self.layer_changes.append(layer)
+
+
+def test_spawn_resets_slots_through_setters(em: EntityManager):
+    """Component dùng __slots__ được đặt lại, trường riêng qua setter của property."""
+    pool = EntityPool(em, lambda: [Sprite()])
+    entity = pool.spawn()
+    sprite = em.get_component(entity, Sprite)
+    sprite.frame = 7
+    sprite.layer = 5
+    pool.despawn(entity)
+
+    pool.spawn()
+
+    assert sprite.frame == 0
+    assert sprite.layer == 1
+    assert Sprite.layer_changes == [5, 1]
@@ -0,0 +1,68 @@
+import pygame
+import pytest
+
+from pygmk2d import glyph_cache
+from pygmk2d.glyph_cache import GlyphCache, GlyphLine
+
+WHITE = pygame.Color("white")
+
+
+@pytest.fixture
+def font():
+    pygame.font.init()
+    return pygame.font.Font(None, 16)
+
+
+@pytest.fixture
+def rasterized(monkeypatch):
+    """Ghi lại mọi ký tự được rasterize."""
+    chars = []
+    rasterize = glyph_cache._rasterize
+
+    def spy(font, char, color, antialias):
+        chars.append(char)
+        return rasterize(font, char, color, antialias)
+
+    monkeypatch.setattr(glyph_cache, "_rasterize", spy)
+    return chars
+
+
+def test_glyphs_are_reused_per_style(font, rasterized):
+    """Mỗi ký tự chỉ được rasterize một lần cho mỗi kiểu font/màu."""
+    cache = GlyphCache(max_styles=1)
+    first = cache.get_glyph(font, "a", WHITE)
+    cache.layout(font, "banana", WHITE)
+
+    assert cache.get_glyph(font, "a", WHITE) is first
+    assert rasterized == ["a", "b", "n"]
+
+    # A second style evicts the least recently used one.
+    cache.get_glyph(font, "a", pygame.Color("red"))
+    cache.get_glyph(font, "a", WHITE)
+    assert rasterized == ["a", "b", "n", "a", "a"]
+
+
+def test_glyph_line_only_redraws_changed_suffix(font, rasterized, monkeypatch):
+    """GlyphLine giữ phần đầu chung, bỏ qua văn bản không đổi và đúng độ rộng."""
+    line = GlyphLine(font, WHITE, cache=GlyphCache())
+    line.set_text("FPS: 59")
+    surface = line.get_surface()
+    line.set_text("FPS: 59")
+    assert line.get_surface() is surface
+
+    layout = GlyphCache.layout
+    laid_out = []
+
+    def spy(self, font, text, *args):
+        laid_out.append(text)
+        return layout(self, font, text, *args)
+
+    monkeypatch.setattr(GlyphCache, "layout", spy)
+    line.set_text("FPS: 60")
+
+    assert laid_out == ["60"]
+    assert rasterized == ["F", "P", "S", ":", " ", "5", "9", "6", "0"]
+    assert line.get_text() == "FPS: 60"
+    assert line.get_surface().get_width() == sum(
+        metrics[4] for metrics in font.metrics("FPS: 60")
+    )
@@ -0,0 +1,46 @@
+from pygmk2d.ecs.entity_manager import EntityManager
+from pygmk2d.render.interpolation import TransformHistory
+from pygmk2d.render.transform import Transform
+
+
+def test_blend_between_captures():
+    """Transform được nội suy giữa hai bước cố định, góc xoay theo cung ngắn nhất."""
+    em = EntityManager()
+    entity = em.create_entity()
+    em.add_component(entity, Transform((0.0, 10.0), 350.0, (2.0, 2.0)))
+    history = TransformHistory(em, capacity=1)
+    history.capture()
+    transform = em.get_component(entity, Transform)
+    transform.position = (4.0, 20.0)
+    transform.rotation = 10.0
+    history.capture()
+
+    history.blend(0.25)
+    blended = history.interpolate(entity, transform)
+
+    assert blended.position == (1.0, 12.5)
+    assert blended.rotation == 355.0
+    assert blended.scale == (2.0, 2.0)
+
+
+def test_new_and_snapped_entities_are_not_interpolated():
+    """Entity mới hoặc vừa snap hiển thị đúng vị trí hiện tại, không trượt từ vị trí cũ."""
+    em = EntityManager()
+    first = em.create_entity()
+    em.add_component(first, Transform((0.0, 0.0)))
+    history = TransformHistory(em, capacity=1)
+    history.capture()
+    second = em.create_entity()
+    em.add_component(second, Transform((50.0, 50.0)))
+    em.get_component(first, Transform).position = (100.0, 0.0)
+    history.capture()
+    em.get_component(first, Transform).position = (200.0, 0.0)
+    history.snap(first)
+
+    history.blend(0.5)
+
+    assert history.interpolate(first, Transform()).position == (200.0, 0.0)
+    assert history.interpolate(second, Transform()).position == (50.0, 50.0)
+    unknown = Transform((7.0, 7.0))
+    assert history.interpolate(99, unknown) is unknown
+    assert len(history) == 2
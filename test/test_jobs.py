@@ -0,0 +1,103 @@
+import pytest
+
+from pygmk2d.core.event_manager import LogPolicy
+from pygmk2d.core.jobs import JobError, JobPriority, JobScheduler, JobState
+
+
+class FakeClock:
+    """Đồng hồ giả lập: mỗi lần gọi now() thời gian tăng thêm một bước cố định."""
+
+    def __init__(self, tick: float = 0.001):
+        self.time = 0.0
+        self.tick = tick
+
+    def now(self) -> float:
+        self.time += self.tick
+        return self.time
+
+
+@pytest.fixture
+def scheduler() -> JobScheduler:
+    """Cung cấp một JobScheduler mới với ngân sách 3 bước cho mỗi lần chạy."""
+    return JobScheduler(FakeClock(), budget=0.003)
+
+
+def test_plain_callable_runs_once(scheduler: JobScheduler):
+    """Hàm thường chạy xong trong một bước và lưu kết quả."""
+    job = scheduler.submit(lambda: 42)
+
+    assert scheduler.run() == 1
+    assert job.state == JobState.DONE
+    assert job.result == 42
+    assert scheduler.pending() == 0
+
+
+def test_generator_job_spreads_across_runs(scheduler: JobScheduler):
+    """Generator được tiếp tục qua nhiều lần run theo ngân sách thời gian."""
+
+    def work():
+        for _ in range(5):
+            yield
+        return "done"
+
+    job = scheduler.submit(work)
+
+    scheduler.run()
+    assert not job.done
+    scheduler.run()
+    assert job.state == JobState.DONE
+    assert job.result == "done"
+    assert job.steps == 6
+
+
+def test_priority_order(scheduler: JobScheduler):
+    """Job có độ ưu tiên cao hơn được chạy trước."""
+    order = []
+    scheduler.submit(lambda: order.append("low"), JobPriority.LOW)
+    scheduler.submit(lambda: order.append("high"), JobPriority.HIGH)
+    scheduler.submit(lambda: order.append("normal"))
+
+    scheduler.run()
+
+    assert order == ["high", "normal", "low"]
+
+
+def test_run_makes_progress_with_zero_budget(scheduler: JobScheduler):
+    """Ngân sách bằng 0 vẫn phải chạy ít nhất một bước."""
+    scheduler.submit(lambda: None)
+    scheduler.submit(lambda: None)
+
+    assert scheduler.run(budget=0.0) == 1
+    assert scheduler.pending() == 1
+
+
+def test_cancel_and_on_done(scheduler: JobScheduler):
+    """Job bị hủy không được chạy; on_done được gọi khi job hoàn thành."""
+    finished = []
+    cancelled = scheduler.submit(lambda: finished.append("cancelled"))
+    scheduler.submit(lambda: 1, on_done=finished.append)
+    cancelled.cancel()
+
+    scheduler.run()
+
+    assert cancelled.state == JobState.CANCELLED
+    assert len(finished) == 1
+    assert finished[0].result == 1
+
+
+def test_failed_job_log_policy():
+    """LogPolicy.RAISE phải ném JobError; IGNORE chỉ đánh dấu job thất bại."""
+
+    def faulty_job():
+        raise ValueError("Test Error")
+
+    raising = JobScheduler(FakeClock(), log_policy=LogPolicy.RAISE)
+    raising.submit(faulty_job)
+    with pytest.raises(JobError, match="faulty_job"):
+        raising.run()
+
+    ignoring = JobScheduler(FakeClock(), log_policy=LogPolicy.IGNORE)
+    job = ignoring.submit(faulty_job)
+    ignoring.run()
+    assert job.state == JobState.FAILED
+    assert isinstance(job.error, ValueError)
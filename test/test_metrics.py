@@ -0,0 +1,59 @@
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+
+import numpy as np
+
+from pygmk2d.core.engine import Engine
+from pygmk2d.core.metrics import MetricsCollector, Reduction, reduce_values
+from pygmk2d.ecs.component import Component
+from pygmk2d.ecs.entity_manager import EntityManager
+
+
+@dataclass
+class Body(Component):
+    mass: float = 1.0
+    velocity: tuple[float, float] = (0.0, 0.0)
+
+
+def test_reduce_values():
+    """Các phép gộp được tính trên cả mảng, kể cả khi mảng rỗng."""
+    values = np.array([3.0, 1.0, 2.0])
+
+    assert reduce_values(values, Reduction.SUM) == 6.0
+    assert reduce_values(values, Reduction.MIN) == 1.0
+    assert reduce_values(values, Reduction.MAX) == 3.0
+    assert reduce_values(values, Reduction.MEAN) == 2.0
+    counts, edges = reduce_values(values, Reduction.HISTOGRAM, 2, (0.0, 4.0))
+    assert counts.tolist() == [1, 2]
+    assert edges.tolist() == [0.0, 2.0, 4.0]
+    assert reduce_values(np.empty(0), Reduction.SUM) == 0.0
+    assert reduce_values(np.empty(0), Reduction.MAX) is None
+
+
+def test_metric_is_sampled_every_n_frames():
+    """Chỉ số chỉ được tính lại sau mỗi N khung hình."""
+    metrics = MetricsCollector()
+    source = MagicMock(return_value=np.array([1.0, 2.0]))
+    metrics.add("total", source, every=3)
+
+    sampled = [metrics.update() for _ in range(7)]
+
+    assert source.call_count == 3
+    assert sampled == [["total"], [], [], ["total"], [], [], ["total"]]
+    assert metrics.get("total") == 3.0
+
+
+def test_component_field_metric_in_engine():
+    """Engine cập nhật chỉ số gộp từ cột thành phần mỗi khung hình."""
+    em = EntityManager()
+    for mass, velocity in ((1.0, (3.0, 4.0)), (2.0, (-1.0, 0.0))):
+        em.add_component(em.create_entity(), Body(mass, velocity))
+    engine = Engine(em, MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    engine.render_system = MagicMock()
+    engine.metrics.add_component_field("mass", em, Body, "mass", Reduction.MAX)
+    engine.metrics.add_component_field("momentum", em, Body, "velocity")
+
+    engine.step(0.0)
+
+    assert engine.metrics.get("mass") == 2.0
+    assert engine.metrics.get("momentum").tolist() == [2.0, 4.0]
@@ -0,0 +1,290 @@
+import numpy as np
+
+from pygmk2d.physics.circles import (
+    CircleBodies,
+    find_pairs,
+    resolve_collisions,
+    step_circles,
+)
+from pygmk2d.physics.contacts import ContactSolver
+from pygmk2d.physics.pair_cache import PairCache
+from pygmk2d.physics.sharding import ShardedCircleSimulation
+from pygmk2d.physics.sleeping import SleepState, connected_components
+from pygmk2d.physics.world import CircleWorld
+
+BOUNDS = (200.0, 100.0)
+
+
+def make_bodies(count: int, seed: int = 0) -> CircleBodies:
+    """Tạo ngẫu nhiên các vật thể tròn trong khung BOUNDS."""
+    rng = np.random.default_rng(seed)
+    bodies = CircleBodies(capacity=4)
+    for _ in range(count):
+        bodies.add(
+            tuple(rng.uniform((5.0, 5.0), (BOUNDS[0] - 5.0, BOUNDS[1] - 5.0))),
+            tuple(rng.uniform(-50.0, 50.0, 2)),
+            float(rng.uniform(1.0, 4.0)),
+            float(rng.uniform(1.0, 3.0)),
+        )
+    return bodies
+
+
+def test_find_pairs_matches_brute_force():
+    """Sweep and prune tìm đúng các cặp có hộp bao chồng lên nhau."""
+    bodies = make_bodies(300)
+    first, second = find_pairs(bodies.positions, bodies.radii)
+    found = set(zip(first.tolist(), second.tolist()))
+
+    expected = set()
+    positions, radii = bodies.positions, bodies.radii
+    for i in range(len(bodies)):
+        for j in range(i + 1, len(bodies)):
+            reach = radii[i] + radii[j]
+            if np.all(np.abs(positions[i] - positions[j]) <= reach):
+                expected.add((i, j))
+    assert found == expected
+
+
+def test_resolve_collisions_conserves_momentum():
+    """Va chạm tách hai vật và bảo toàn động lượng."""
+    bodies = CircleBodies()
+    bodies.add((0.0, 0.0), (10.0, 0.0), 2.0, 1.0)
+    bodies.add((3.0, 0.0), (-5.0, 0.0), 2.0, 2.0)
+    momentum = (bodies.velocities * bodies.masses[:, None]).sum(axis=0)
+
+    colliding = resolve_collisions(
+        bodies.positions,
+        bodies.velocities,
+        bodies.radii,
+        bodies.masses,
+        find_pairs(bodies.positions, bodies.radii),
+    )
+
+    assert len(colliding[0]) == 1
+    assert np.isclose(bodies.positions[1, 0] - bodies.positions[0, 0], 4.0)
+    assert np.allclose(
+        (bodies.velocities * bodies.masses[:, None]).sum(axis=0), momentum
+    )
+
+
+def test_remove_moves_last_body():
+    """Xóa một vật chuyển vật cuối cùng vào vị trí của nó."""
+    bodies = make_bodies(3)
+    last = bodies.positions[2].copy()
+
+    assert bodies.remove(0) == 2
+    assert len(bodies) == 2
+    assert np.array_equal(bodies.positions[0], last)
+
+
+def test_sharded_step_matches_single_process():
+    """Mô phỏng chia vùng qua shared memory cho kết quả giống mô phỏng một tiến trình."""
+    bodies = make_bodies(400, seed=3)
+    positions = bodies.positions.copy()
+    velocities = bodies.velocities.copy()
+    for _ in range(5):
+        step_circles(positions, velocities, bodies.radii, bodies.masses, BOUNDS, 0.05)
+
+    with ShardedCircleSimulation(BOUNDS, capacity=512, columns=2, rows=2) as sim:
+        sim.load(bodies)
+        for _ in range(5):
+            sim.step(0.05)
+        sim.store(bodies)
+
+    assert np.allclose(bodies.positions, positions)
+    assert np.allclose(bodies.velocities, velocities)
+
+
+def test_ccd_prevents_tunneling():
+    """Với CCD, hai vật nhỏ và nhanh không xuyên qua nhau trong một bước lớn."""
+    for ccd, crossed in ((False, True), (True, False)):
+        bodies = CircleBodies()
+        bodies.add((90.0, 50.0), (200.0, 0.0), 1.0, 1.0)
+        bodies.add((110.0, 50.0), (-200.0, 0.0), 1.0, 1.0)
+
+        substeps = step_circles(
+            bodies.positions,
+            bodies.velocities,
+            bodies.radii,
+            bodies.masses,
+            BOUNDS,
+            0.1,
+            restitution=1.0,
+            ccd=ccd,
+        )
+
+        assert (bodies.positions[0, 0] > bodies.positions[1, 0]) == crossed
+        assert substeps == (1 if ccd else 0)
+
+
+def test_ccd_bounces_off_borders():
+    """Với CCD, vật rất nhanh bật lại khi chạm biên thay vì vượt ra ngoài."""
+    bodies = CircleBodies()
+    bodies.add((190.0, 50.0), (1000.0, 0.0), 2.0, 1.0)
+
+    step_circles(
+        bodies.positions,
+        bodies.velocities,
+        bodies.radii,
+        bodies.masses,
+        BOUNDS,
+        0.1,
+        ccd=True,
+    )
+
+    assert bodies.velocities[0, 0] == -1000.0
+    assert np.isclose(bodies.positions[0, 0], 198.0 - 92.0)
+
+
+def test_ccd_sweeps_bounced_bodies_again():
+    """Với CCD, vật bật lại vẫn va chạm với vật nằm trên đường đi mới của nó."""
+    bodies = CircleBodies()
+    bodies.add((100.0, 50.0), (200.0, 0.0), 5.0, 1.0)
+    bodies.add((130.0, 50.0), (0.0, 0.0), 5.0, 1000.0)
+    bodies.add((60.0, 50.0), (0.0, 0.0), 5.0, 1.0)
+
+    rounds = step_circles(
+        bodies.positions,
+        bodies.velocities,
+        bodies.radii,
+        bodies.masses,
+        BOUNDS,
+        0.5,
+        restitution=1.0,
+        ccd=True,
+    )
+
+    assert rounds == 2
+    # The first body stopped on the third one, which was pushed away.
+    assert bodies.positions[0, 0] > bodies.positions[2, 0]
+    assert bodies.velocities[2, 0] < 0.0
+
+
+def test_connected_components_labels_islands():
+    """Các vật tiếp xúc nhau được gộp thành cùng một đảo."""
+    labels = connected_components(6, (np.array([0, 1, 4]), np.array([1, 2, 3])))
+
+    assert labels.tolist() == [0, 0, 0, 3, 3, 5]
+
+
+def test_resting_island_sleeps_and_wakes_on_contact():
+    """Đảo đứng yên đủ lâu sẽ ngủ và được đánh thức khi có vật chuyển động chạm vào."""
+    world = CircleWorld(BOUNDS, sleeping=SleepState(threshold=1.0, frames=3))
+    world.add((50.0, 50.0), (0.0, 0.0), 2.0, 1.0)
+    world.add((54.0, 50.0), (0.0, 0.0), 2.0, 1.0)
+    striker = world.add((80.0, 50.0), (-300.0, 0.0), 2.0, 1.0)
+
+    for _ in range(3):
+        world.step(0.01)
+    assert world.awake_count() == 1
+    assert world.sleeping.asleep[:2].all()
+
+    for _ in range(10):
+        world.step(0.01)
+    assert not world.sleeping.asleep[:2].any()
+    assert world.bodies.velocities[striker, 0] > -300.0
+
+
+def test_contact_solver_keeps_stack_resting():
+    """Bộ giải tiếp xúc giữ chồng bóng đứng yên dưới trọng lực và cho phép chúng ngủ."""
+    world = CircleWorld(
+        (100.0, 200.0),
+        sleeping=SleepState(),
+        solver=ContactSolver(iterations=4),
+        gravity=(0.0, 500.0),
+    )
+    for i in range(10):
+        world.add((50.0, 193.0 - 14.0 * i), (0.0, 0.0), 7.0, 1.0)
+
+    for _ in range(180):
+        world.step(1 / 60)
+
+    heights = world.bodies.positions[:, 1]
+    assert np.allclose(np.diff(heights), -14.0, atol=0.2)
+    assert np.isclose(heights[0], 193.0, atol=0.2)
+    assert world.awake_count() == 0
+
+
+def test_contact_solver_warm_starts_impulses():
+    """Xung lực của bước trước được dùng lại và bằng trọng lượng của vật bên trên."""
+    solver = ContactSolver(iterations=1)
+    world = CircleWorld((100.0, 100.0), solver=solver, gravity=(0.0, 600.0))
+    world.add((50.0, 93.0), (0.0, 0.0), 7.0, 1.0)
+    world.add((50.0, 79.0), (0.0, 0.0), 7.0, 1.0)
+
+    for _ in range(30):
+        world.step(0.01)
+
+    assert np.isclose(solver.get_impulse(0, 1), 6.0)
+    assert np.allclose(world.bodies.velocities, 0.0, atol=1e-3)
+
+
+def test_pair_cache_reports_added_and_removed_pairs():
+    """Bộ đệm cặp chỉ cập nhật vật ra khỏi hộp nới rộng và báo cặp thêm/bớt."""
+    cache = PairCache(margin=1.0)
+    events = []
+    cache.register_listener(
+        lambda first, second: events.append(("added", first.tolist(), second.tolist())),
+        lambda first, second: events.append(
+            ("removed", first.tolist(), second.tolist())
+        ),
+    )
+    half_sizes = np.full((3, 2), 2.0)
+    centers = np.array([[10.0, 10.0], [14.0, 10.0], [50.0, 10.0]])
+
+    added, removed = cache.update(centers, half_sizes)
+    assert added[0].tolist() == [0] and added[1].tolist() == [1]
+    assert not len(removed[0])
+
+    # Still inside the enlarged box: nothing is re-boxed.
+    centers[1, 0] = 14.5
+    cache.update(centers, half_sizes)
+    assert cache.moved_count == 0
+
+    centers[1, 0] = 46.0
+    added, removed = cache.update(centers, half_sizes)
+    assert cache.moved_count == 1
+    assert events == [
+        ("added", [0], [1]),
+        ("added", [1], [2]),
+        ("removed", [0], [1]),
+    ]
+    assert [pair.tolist() for pair in cache.get_pairs()] == [[1], [2]]
+
+
+def test_pair_cache_covers_overlapping_boxes():
+    """Các cặp trong bộ đệm luôn chứa mọi cặp hộp chồng nhau khi các vật di chuyển."""
+    rng = np.random.default_rng(3)
+    positions = rng.uniform(0.0, 100.0, (200, 2))
+    velocities = rng.uniform(-30.0, 30.0, (200, 2))
+    radii = np.full(200, 2.0)
+    cache = PairCache(margin=2.0)
+
+    for _ in range(30):
+        positions += velocities * 0.01
+        cache.update(positions, np.repeat(radii[:, None], 2, axis=1))
+        expected = set(zip(*(pair.tolist() for pair in find_pairs(positions, radii))))
+        cached = set(zip(*(pair.tolist() for pair in cache.get_pairs())))
+        assert expected <= cached
+
+    cache.update(positions[:150], np.full((150, 2), 2.0))
+    assert max(cache.get_pairs()[1], default=0) < 150
+
+
+def test_pair_cache_reports_pairs_of_removed_objects():
+    """Khi mọi vật bị xóa, các cặp cũ vẫn được báo là đã bỏ."""
+    cache = PairCache()
+    removed_events = []
+    cache.register_listener(
+        on_removed=lambda first, second: removed_events.append(
+            (first.tolist(), second.tolist())
+        )
+    )
+    cache.update(np.array([[10.0, 10.0], [12.0, 10.0]]), np.full((2, 2), 2.0))
+
+    added, removed = cache.update(np.empty((0, 2)), np.empty((0, 2)))
+
+    assert not len(added[0])
+    assert (removed[0].tolist(), removed[1].tolist()) == ([0], [1])
+    assert removed_events == [([0], [1])]
+    assert len(cache) == 0
@@ -0,0 +1,87 @@
+import pygame
+
+from pygmk2d.pygame_backend.context import PygameRenderContext
+from pygmk2d.pygame_backend.target import PygameRenderTarget
+
+
+def make_context(**kwargs) -> PygameRenderContext:
+    """Context vẽ lên một surface 64x64 ngoài màn hình, với một texture 8x8."""
+    texture = pygame.Surface((8, 8))
+    texture.fill((255, 0, 0))
+    target = PygameRenderTarget(pygame.Surface((64, 64)))
+    return PygameRenderContext(target, textures={"red": texture}, **kwargs)
+
+
+def test_rotated_texture_cache_is_bounded():
+    """Sprite xoay liên tục dùng lại surface theo góc đã làm tròn, cache có giới hạn."""
+    context = make_context(rotation_step=5.0, cache_size=16)
+    for frame in range(200):
+        context.start_frame()
+        context.draw_texture("red", (20.0, 20.0), (8.0, 8.0), frame * 0.5)
+        context.end_frame()
+
+    assert len(context._scaled) == 16
+
+    context._scaled.clear()
+    for rotation in (0.4, 1.2, 359.9):
+        context.draw_texture("red", (20.0, 20.0), (8.0, 8.0), rotation)
+    assert len(context._scaled) == 1
+
+
+class RecordingTarget(PygameRenderTarget):
+    """Target ghi lại các dirty rect được đặt cho mỗi khung."""
+
+    def __init__(self, surface):
+        super().__init__(surface)
+        self.presented = []
+
+    def set_dirty_rects(self, rects):
+        super().set_dirty_rects(rects)
+        self.presented.append(None if rects is None else [tuple(r) for r in rects])
+
+
+def test_dirty_rects_are_the_changed_draws():
+    """Chỉ các lần vẽ khác khung trước mới tạo dirty rect; vùng cũ được xóa."""
+    target = RecordingTarget(pygame.Surface((64, 64)))
+    context = PygameRenderContext(target, full_update_ratio=0.9)
+
+    def frame(*positions):
+        context.start_frame()
+        for position in positions:
+            context.draw_shape("rect", position, (4, 4), (255, 255, 255))
+        context.end_frame()
+
+    frame((0, 0), (10, 10))
+    frame((0, 0), (10, 10))
+    frame((0, 0), (20, 10))
+
+    assert target.presented == [None, [], [(20, 10, 4, 4), (10, 10, 4, 4)]]
+    surface = target.get_surface()
+    assert tuple(surface.get_at((11, 11)))[:3] == (0, 0, 0)
+    assert tuple(surface.get_at((21, 11)))[:3] == (255, 255, 255)
+
+
+def test_marked_regions_are_presented_and_erased():
+    """Vùng vẽ trực tiếp được báo bằng mark_dirty được hiển thị và xóa ở khung sau."""
+    target = RecordingTarget(pygame.Surface((64, 64)))
+    context = PygameRenderContext(target, full_update_ratio=0.9)
+
+    def frame(position):
+        context.start_frame()
+        rect = pygame.draw.rect(
+            context.get_target().get_surface(), (0, 255, 0), (*position, 4, 4)
+        )
+        context.mark_dirty(rect)
+        context.end_frame()
+
+    frame((0, 0))
+    frame((10, 10))
+    frame((30, 10))
+
+    assert target.presented[1:] == [
+        [(10, 10, 4, 4), (0, 0, 4, 4)],
+        [(30, 10, 4, 4), (10, 10, 4, 4)],
+    ]
+    surface = target.get_surface()
+    assert tuple(surface.get_at((11, 11)))[:3] == (0, 0, 0)
+    assert tuple(surface.get_at((31, 11)))[:3] == (0, 255, 0)
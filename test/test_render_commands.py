@@ -0,0 +1,50 @@
+from itertools import product
+from unittest.mock import MagicMock
+
+from pygmk2d.render.commands import (
+    RenderCommandBuffer,
+    layer_of_key,
+    make_sort_key,
+)
+
+
+def test_sort_key_orders_like_tuple():
+    """Khóa đóng gói sắp xếp giống tuple (layer, depth, material), kể cả số âm."""
+    values = list(product((-3, 0, 2), (-40, -1, 0, 7), (0, 1, 5)))
+    by_key = sorted(values, key=lambda value: make_sort_key(*value))
+
+    assert by_key == sorted(values)
+    assert all(layer_of_key(make_sort_key(*value)) == value[0] for value in values)
+    # Depth is clamped to its bits instead of spilling into the layer.
+    assert make_sort_key(0, 1 << 20) < make_sort_key(1, -(1 << 20))
+
+
+def test_sort_key_orders_float_depths():
+    """Depth kiểu float được sắp xếp đúng thứ tự thay vì báo TypeError."""
+    depths = [0.8, -0.5, 0.2, 2, -1, 0.25]
+    by_key = sorted(depths, key=lambda depth: make_sort_key(1, depth))
+
+    assert by_key == sorted(depths)
+    assert make_sort_key(1, 0.2, 9) < make_sort_key(1, 0.8, 1)
+    assert make_sort_key(1.5, 0) == make_sort_key(1, 0)
+
+
+def test_flush_sorts_and_batches_runs():
+    """Lệnh được gửi theo thứ tự khóa, lệnh liền nhau cùng material gộp thành một lô."""
+    buffer = RenderCommandBuffer(capacity=1)
+    context = MagicMock()
+    calls = []
+    context.draw_textures.side_effect = lambda ids, *_: calls.append(list(ids))
+    buffer.begin(1, 0)
+    buffer.push_texture("tree", (0, 0), (8, 8))
+    buffer.begin(0, 5)
+    buffer.push_callback(calls.append, "background")
+    buffer.begin(1, 0)
+    buffer.push_texture("tree", (9, 0), (8, 8))
+    buffer.begin(2, 0)
+    buffer.push_texture("rock", (0, 9), (8, 8))
+
+    buffer.flush(context)
+
+    assert calls == ["background", ["tree", "tree"], ["rock"]]
+    assert len(buffer) == 0
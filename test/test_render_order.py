@@ -0,0 +1,50 @@
+from pygmk2d.ecs.entity_manager import EntityManager
+from pygmk2d.render.order import RenderOrderIndex
+from pygmk2d.render.renderable import UIRenderable
+
+
+def make_index() -> tuple[EntityManager, RenderOrderIndex, list[UIRenderable]]:
+    """Bốn renderable ở hai layer với depth khác nhau."""
+    em = EntityManager()
+    renderables = [
+        UIRenderable(layer=layer, depth=depth)
+        for layer, depth in ((1, 0), (0, 3), (1, -2), (0, 1))
+    ]
+    for renderable in renderables:
+        em.add_component(em.create_entity(), renderable)
+    index = RenderOrderIndex(em, UIRenderable)
+    index.refresh()
+    return em, index, renderables
+
+
+def entities(pairs) -> list[int]:
+    return [entity for entity, _ in pairs]
+
+
+def test_index_walks_layer_then_depth():
+    """Chỉ mục duyệt theo layer rồi depth, từng layer hoặc bỏ qua một số layer."""
+    em, index, _ = make_index()
+
+    assert entities(index) == [3, 1, 2, 0]
+    assert entities(index.iter_layer(1)) == [2, 0]
+    assert entities(index.iter_excluding({0})) == [2, 0]
+    assert entities(index.iter_entities({0, 1})) == [1, 0]
+
+
+def test_reorder_is_applied_on_refresh():
+    """Đổi layer/depth chỉ được áp dụng khi refresh, trả về các layer thay đổi."""
+    em, index, renderables = make_index()
+
+    renderables[0].depth = -5
+    renderables[3].layer = 2
+    assert entities(index) == [3, 1, 2, 0]
+
+    assert index.refresh() == {0, 1, 2}
+    assert entities(index) == [1, 0, 2, 3]
+
+    em.remove_entity(1)
+    spawned = em.create_entity()
+    em.add_component(spawned, UIRenderable(layer=-1))
+    assert index.refresh() == {-1, 0}
+    assert entities(index) == [spawned, 0, 2, 3]
+    assert index.refresh() == set()
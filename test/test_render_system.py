@@ -0,0 +1,192 @@
+from unittest.mock import MagicMock
+
+from pygmk2d.ecs.entity_manager import EntityManager
+from pygmk2d.render.camera import Camera
+from pygmk2d.render.context import RenderSpace
+from pygmk2d.render.renderable import WorldRenderable
+from pygmk2d.render.system import LayerCachePolicy, RenderSystem
+from pygmk2d.render.transform import Transform
+
+
+def make_system(drawn: list[int]):
+    """Thế giới có camera 100x100 nhìn quanh gốc tọa độ, ô lưới 32 đơn vị."""
+    em = EntityManager()
+    camera = Camera((100, 100), (0.0, 0.0), 1.0)
+    system = RenderSystem(em, MagicMock(), camera, cell_size=32.0)
+
+    def spawn(position, layer=0, depth=0, bounds=(5.0, 5.0)) -> int:
+        entity = em.create_entity()
+        em.add_component(entity, Transform(position))
+        em.add_component(
+            entity,
+            WorldRenderable(
+                lambda params: drawn.append(entity),
+                layer=layer,
+                depth=depth,
+                bounds=bounds,
+            ),
+        )
+        return entity
+
+    return em, system, spawn
+
+
+def test_culling_walks_visible_renderables_in_order():
+    """Chỉ renderable trong tầm nhìn được vẽ, theo thứ tự layer/depth của chỉ mục."""
+    drawn = []
+    em, system, spawn = make_system(drawn)
+    back = spawn((10.0, 0.0), layer=-1)
+    front = spawn((0.0, 10.0), layer=2)
+    middle = spawn((-40.0, 0.0), depth=3)
+    spawn((200.0, 0.0))
+    spawn((0.0, -300.0), layer=-1)
+    unbounded = spawn((900.0, 900.0), bounds=None)
+    recorded_in_order = []
+    flush = system.commands.flush
+
+    def record_flush(context) -> None:
+        recorded_in_order.append(system.commands._in_order)
+        flush(context)
+
+    system.commands.flush = record_flush
+    system.render()
+
+    assert drawn == [back, unbounded, middle, front]
+    assert system.stats.drawn == 4
+    assert system.stats.culled == 2
+    # Recorded already sorted, so the command buffer does not sort them.
+    assert recorded_in_order[0]
+
+
+def test_moved_transforms_are_reindexed():
+    """Transform bị gán trực tiếp vẫn được đánh chỉ mục lại, chỉ khi đổi ô lưới."""
+    drawn = []
+    em, system, spawn = make_system(drawn)
+    entities = [spawn((x * 20.0, 0.0)) for x in range(-2, 3)]
+    hidden = spawn((500.0, 0.0))
+    system.render()
+    system._grid._unlink = MagicMock(wraps=system._grid._unlink)
+
+    em.get_component(entities[0], Transform).position = (-41.0, 1.0)
+    system.render()
+    assert system._grid._unlink.call_count == 0
+
+    em.get_component(hidden, Transform).position = (0.0, 20.0)
+    drawn.clear()
+    system.render()
+
+    assert system._grid._unlink.call_count == 1
+    assert sorted(drawn) == sorted(entities + [hidden])
+    assert system.stats.culled == 0
+
+
+def test_layer_cache_is_redrawn_only_when_invalid():
+    """Layer được lưu đệm chỉ vẽ lại khi bị vô hiệu hóa, thay đổi hoặc camera di chuyển."""
+    drawn = []
+    em, system, spawn = make_system(drawn)
+    system.context.get_resolution.return_value = (100, 100)
+    system.context.create_target.side_effect = lambda size: MagicMock(
+        get_size=MagicMock(return_value=size)
+    )
+    static = spawn((0.0, 0.0), layer=1)
+    changing = spawn((0.0, 0.0), layer=2)
+    live = spawn((0.0, 0.0))
+    system.set_layer_policy(RenderSpace.WORLD, 1, LayerCachePolicy.STATIC)
+    system.set_layer_policy(RenderSpace.WORLD, 2, LayerCachePolicy.INVALIDATE_ON_CHANGE)
+
+    def frame() -> list[int]:
+        drawn.clear()
+        system.render()
+        return sorted(drawn)
+
+    assert frame() == [static, changing, live]
+    assert frame() == [live]
+    assert system.context.draw_target.call_count == 4
+
+    em.get_component(changing, WorldRenderable).depth = 3
+    assert frame() == [changing, live]
+    em.get_component(static, WorldRenderable).depth = 3
+    assert frame() == [live]
+
+    system.invalidate_layer(RenderSpace.WORLD, 1)
+    assert frame() == [static, live]
+    system.camera.move((1.0, 0.0))
+    assert frame() == [static, changing, live]
+
+
+class FakeTarget:
+    def __init__(self, name: str, size: tuple[int, int]) -> None:
+        self.name = name
+        self.size = size
+        self.drawn: list = []
+
+    def get_size(self) -> tuple[int, int]:
+        return self.size
+
+    def clear(self, color) -> None:
+        self.drawn.clear()
+
+
+class FakeContext:
+    """Ghi lại những gì được vẽ vào mỗi đích vẽ."""
+
+    def __init__(self) -> None:
+        self.screen = FakeTarget("screen", (100, 100))
+        self.target = self.screen
+        self.created = 0
+
+    def get_target(self) -> FakeTarget:
+        return self.target
+
+    def set_target(self, target: FakeTarget) -> None:
+        self.target = target
+
+    def get_resolution(self) -> tuple[int, int]:
+        return self.screen.size
+
+    def create_target(self, size) -> FakeTarget:
+        self.created += 1
+        return FakeTarget(f"cache{self.created}", size)
+
+    def draw_target(self, target: FakeTarget, position=(0.0, 0.0)) -> None:
+        self.target.drawn.append(target.name)
+
+    def start_frame(self) -> None:
+        self.screen.drawn.clear()
+
+    def end_frame(self) -> None:
+        pass
+
+    def set_space(self, space) -> None:
+        pass
+
+
+def test_invalid_layer_caches_are_drawn_into_their_own_target():
+    """Hai layer lưu đệm cùng vô hiệu không vẽ lẫn vào đích của nhau."""
+    em = EntityManager()
+    context = FakeContext()
+    system = RenderSystem(em, context, Camera((100, 100), (0.0, 0.0), 1.0))
+    entities = []
+    for layer in (0, 1):
+        entity = em.create_entity()
+        em.add_component(entity, Transform((0.0, 0.0)))
+        em.add_component(
+            entity,
+            WorldRenderable(
+                lambda params, entity=entity: params.context.get_target().drawn.append(
+                    entity
+                ),
+                layer=layer,
+            ),
+        )
+        entities.append(entity)
+        system.set_layer_policy(RenderSpace.WORLD, layer, LayerCachePolicy.STATIC)
+
+    for _ in range(2):
+        system.render()
+        caches = system._layer_caches[RenderSpace.WORLD]
+        assert caches[0].target.drawn == [entities[0]]
+        assert caches[1].target.drawn == [entities[1]]
+        assert context.screen.drawn == ["cache1", "cache2"]
+        system.invalidate_layer(RenderSpace.WORLD, 0)
+        system.invalidate_layer(RenderSpace.WORLD, 1)
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from unittest.mock import MagicMock
+
+import pytest
+
+from pygmk2d.core.engine import Engine
+from pygmk2d.ecs.component import Component
+from pygmk2d.ecs.entity_manager import EntityManager
+from pygmk2d.ecs.system import System
+from pygmk2d.render.renderable import WorldRenderable
+from pygmk2d.render.transform import Transform
+
+
+@dataclass
+class Walker(Component):
+    x: float = 0.0
+    push: float = 0.0
+
+
+class WalkSystem(System):
+    """Hệ thống di chuyển dùng RNG của engine và lực đẩy từ input."""
+
+    rng = None
+
+    def update(self, delta_time: float) -> None:
+        for entity in self._ecs.query_by_type(Walker):
+            walker = self._ecs.get_component_mut(entity, Walker)
+            walker.x += walker.push + self.rng.random() * delta_time
+
+
+def make_engine() -> Engine:
+    em = EntityManager()
+    engine = Engine(em, MagicMock(), MagicMock(), MagicMock(), MagicMock(), MagicMock())
+    engine.add_fixed_delta_system(WalkSystem)
+    engine._fixed_delta_systems[0].rng = engine.rng
+    entity = em.create_entity()
+    em.add_component(entity, Walker())
+
+    def apply_input(push: float) -> None:
+        em.get_component_mut(entity, Walker).push = push
+
+    engine.set_input_handler(apply_input)
+    engine.enable_rollback(frames=4, seed=7)
+    return engine
+
+
+def position(engine: Engine) -> float:
+    return engine.em.get_component(0, Walker).x
+
+
+def test_rollback_and_resimulate_is_deterministic():
+    """Quay lui rồi mô phỏng lại cùng input cho kết quả giống hệt."""
+    engine = make_engine()
+    engine.resimulate([1.0, 2.0, 3.0, 4.0])
+    expected = position(engine)
+
+    inputs = engine.rollback(1)
+    assert inputs == [2.0, 3.0, 4.0]
+    assert engine.fixed_tick == 1
+
+    engine.resimulate(inputs)
+    assert position(engine) == expected
+    assert engine.fixed_tick == 4
+
+
+def test_rollback_outside_window_raises():
+    """Không thể quay lui quá số bước mà ring buffer còn giữ."""
+    engine = make_engine()
+    engine.resimulate([0.0] * 6)
+
+    with pytest.raises(KeyError):
+        engine.rollback(1)
+    engine.rollback(2)
+    assert engine.fixed_tick == 2
+
+
+def test_fixed_step_with_renderables():
+    """Snapshot mặc định bỏ qua renderable của RenderSystem nên không lỗi pickle."""
+    engine = make_engine()
+    engine.em.add_component(0, WorldRenderable(lambda params: None))
+    engine.resimulate([1.0, 2.0])
+
+    engine.rollback(0)
+
+    assert position(engine) == 0.0
+    assert engine.em.get_component(0, WorldRenderable) is not None
+
+
+def test_rollback_keeps_components_outside_snapshot():
+    """Chỉ các kiểu được chụp bị ghi lại; component khác và entity cũ được giữ."""
+    engine = make_engine()
+    engine.enable_rollback(frames=4, component_types=[Walker])
+    engine.em.add_component(0, Transform((3.0, 4.0)))
+    engine.resimulate([1.0])
+    spawned = engine.em.create_entity()
+    engine.em.add_component(spawned, Transform())
+
+    engine.rollback(0)
+
+    assert position(engine) == 0.0
+    assert engine.em.get_component(0, Transform) == Transform((3.0, 4.0))
+    assert engine.em.get_component(spawned, Transform) is None
@@ -0,0 +1,150 @@
+from dataclasses import dataclass, field
+from typing import Callable
+
+import pytest
+
+from pygmk2d.ecs.component import Component
+from pygmk2d.ecs.entity_manager import EntityManager
+from pygmk2d.ecs.snapshot import (
+    SnapshotError,
+    WorldSnapshot,
+    restore_snapshot,
+    take_delta,
+    take_snapshot,
+)
+
+
+@dataclass
+class Body(Component):
+    position: tuple[float, float] = (0.0, 0.0)
+    mass: float = 1.0
+    collisions: int = 0
+
+
+@dataclass
+class Tag(Component):
+    labels: list[str] = field(default_factory=list)
+
+
+class Particle(Component):
+    __slots__ = ("position", "_age")
+
+    def __init__(self, position: tuple[float, float], age: int) -> None:
+        self.position = position
+        self._age = age
+
+
+@dataclass
+class Callback(Component):
+    function: Callable[[], None]
+
+
+@dataclass
+class LiveCallback(Callback):
+    snapshotted = False
+
+
+def make_world() -> EntityManager:
+    """Tạo một thế giới nhỏ với component số và component chứa list."""
+    em = EntityManager()
+    for i in range(3):
+        entity = em.create_entity()
+        em.add_component(entity, Body((float(i), 2.0 * i), 1.5, i))
+    em.add_component(1, Tag(["player"]))
+    return em
+
+
+def test_numeric_fields_are_stored_in_arrays():
+    """Trường số được đóng gói thành cột array thay vì pickle từng đối tượng."""
+    snapshot = take_snapshot(make_world())
+    body = next(c for c in snapshot.columns if c.component_type is Body)
+
+    assert body.fields["position"][0] == "d2"
+    assert body.fields["mass"][0] == "d"
+    assert body.fields["collisions"][0] == "q"
+
+
+def test_restore_round_trip_through_bytes():
+    """Snapshot ghi ra bytes rồi khôi phục lại đúng thế giới ban đầu."""
+    em = make_world()
+    data = take_snapshot(em).to_bytes()
+    em.get_component(1, Tag).labels.append("dead")
+    em.remove_entity(2)
+
+    restore_snapshot(em, WorldSnapshot.from_bytes(data, types=[Body, Tag]))
+
+    assert em.query_by_type(Body) == (0, 1, 2)
+    assert em.get_component(2, Body) == Body((2.0, 4.0), 1.5, 2)
+    assert em.get_component(1, Tag).labels == ["player"]
+
+
+def test_delta_applies_changes_and_removals():
+    """Delta chỉ chứa component thay đổi và bị xóa kể từ snapshot gốc."""
+    em = make_world()
+    em.advance_tick()
+    base = take_snapshot(em)
+    em.advance_tick()
+    em.get_component_mut(0, Body).mass = 9.0
+    em.remove_component(1, Tag)
+    delta = take_delta(em, base)
+
+    assert [len(c) for c in delta.columns] == [1, 0]
+
+    other = EntityManager()
+    restore_snapshot(other, base)
+    restore_snapshot(other, WorldSnapshot.from_bytes(delta.to_bytes(), [Body, Tag]))
+
+    assert other.get_component(0, Body).mass == 9.0
+    assert other.get_component(1, Tag) is None
+    assert other.tick == em.tick
+
+
+def test_delta_includes_writes_made_in_the_base_tick():
+    """Thay đổi ghi trong cùng tick với snapshot gốc, sau khi chụp, vẫn vào delta."""
+    em = make_world()
+    em.advance_tick()
+    base = take_snapshot(em)
+    em.get_component_mut(2, Body).collisions = 7
+
+    delta = take_delta(em, base)
+    other = EntityManager()
+    restore_snapshot(other, base)
+    restore_snapshot(other, delta)
+
+    assert other.get_component(2, Body).collisions == 7
+
+
+def test_slotted_components_round_trip():
+    """Component dùng __slots__ được chụp và khôi phục theo từng trường."""
+    em = make_world()
+    em.add_component(0, Particle((1.0, 2.0), 3))
+    em.add_component(2, Particle((4.0, 5.0), 6))
+
+    snapshot = WorldSnapshot.from_bytes(take_snapshot(em).to_bytes(), [Body, Particle])
+    other = EntityManager()
+    restore_snapshot(other, snapshot)
+
+    particle = other.get_component(2, Particle)
+    assert (particle.position, particle._age) == ((4.0, 5.0), 6)
+    assert not vars(particle)
+
+
+def test_unpicklable_component_error_names_type():
+    """Component chứa lambda báo lỗi rõ ràng, nêu tên kiểu component."""
+    em = make_world()
+    em.add_component(0, Callback(lambda: None))
+
+    with pytest.raises(SnapshotError, match="Callback"):
+        take_snapshot(em)
+
+
+def test_opted_out_components_are_skipped():
+    """Kiểu component tắt snapshotted bị bỏ qua khi chụp mọi kiểu đã đăng ký."""
+    em = make_world()
+    em.add_component(0, LiveCallback(lambda: None))
+
+    snapshot = take_snapshot(em)
+
+    assert {c.component_type for c in snapshot.columns} == {Body, Tag}
+    with pytest.raises(SnapshotError):
+        take_snapshot(em, [LiveCallback])
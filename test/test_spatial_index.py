@@ -0,0 +1,21 @@
+from pygmk2d.render.spatial_index import SpatialHashGrid
+
+
+def test_grid_query_follows_inserts_moves_and_removals():
+    """Truy vấn trả về các entity trong những ô giao với hình chữ nhật."""
+    grid = SpatialHashGrid(cell_size=10.0)
+    grid.insert(1, (1.0, 1.0, 4.0, 4.0))
+    grid.insert(2, (-15.0, 2.0, -12.0, 5.0))
+    grid.insert(3, (5.0, 5.0, 25.0, 8.0))
+
+    assert grid.query((0.0, 0.0, 9.0, 9.0)) == {1, 3}
+    assert grid.query((21.0, 0.0, 22.0, 1.0)) == {3}
+    # A rectangle covering more cells than exist scans the stored cells instead.
+    assert grid.query((-1000.0, -1000.0, 1000.0, 1000.0)) == {1, 2, 3}
+
+    grid.insert(1, (-11.0, 1.0, -10.5, 2.0))
+    grid.remove(3)
+
+    assert grid.query((0.0, 0.0, 9.0, 9.0)) == set()
+    assert grid.query((-20.0, 0.0, -10.0, 9.0)) == {1, 2}
+    assert len(grid) == 2 and 3 not in grid
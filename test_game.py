@@ -1,33 +1,24 @@
+from itertools import chain
 from typing import Iterable
 from old_architecture.game_engine import Game
-from quadtree import QuadTreeNode, QuadTreeRenderer
 from ball import (
     Ball,
     BallRenderer,
+    BallSet,
+    BallSetRenderer,
     is_ball_collided,
     move_ball_colliding,
     exchange_momentum,
 )
 from text_line import TextLine, TextLineRenderer
+from core.metrics import MetricsCollector
+from physics.pair_cache import PairCache
+import numpy as np
 import pygame
 import color
 import random
 
 
-def strict_collision_update(container: list[int], reference_list: list[Ball]) -> None:
-    for i in range(len(container) - 1):
-        for j in range(i + 1, len(container)):
-            if is_ball_collided(
-                reference_list[container[i]], reference_list[container[j]]
-            ):
-                move_ball_colliding(
-                    reference_list[container[i]], reference_list[container[j]]
-                )
-                exchange_momentum(
-                    reference_list[container[i]], reference_list[container[j]], 0.0
-                )
-
-
 def get_kinetic_energy(ball: Ball) -> float:
     return 0.5 * ball.get_mass() * ball.get_velocity().length_squared()
 
@@ -65,11 +56,18 @@ def generate_random_balls(
 
 
 class TestGame(Game):
-    def __init__(self):
+    def __init__(self, array_backed: bool = False):
+        """The ball demo
+
+        Args:
+            array_backed (bool, optional): Keep the balls in a single BallSet
+            stepped with array kernels instead of one Ball object each. Defaults
+            to False.
+        """
         super().__init__((1280, 720), caption="Test Game")
         self.render_controller.set_background_color(color.BLACK)
         self.render_controller.register_renderer("ball", BallRenderer())
-        self.render_controller.register_renderer("quadtree", QuadTreeRenderer())
+        self.render_controller.register_renderer("ball_set", BallSetRenderer())
         self.render_controller.register_renderer("text_line", TextLineRenderer())
         default_font = pygame.font.Font(pygame.font.get_default_font(), 16)
         self.ball_size_text = TextLine(
@@ -97,7 +95,14 @@ class TestGame(Game):
                 self.total_kinetic_energy,
             ]
         )
-        self.game_object_manager.add_multi(
+        # Candidate pairs kept across frames, updated only for balls that moved
+        # out of their enlarged bounds.
+        self.pair_cache = PairCache()
+        self.ball_set: BallSet | None = None
+        if array_backed:
+            self.ball_set = BallSet(1024)
+            self.game_object_manager.add(self.ball_set)
+        self.add_balls(
             generate_random_balls(1000, self.render_controller.get_resolution())
         )
         """preset_ball_list = [
@@ -129,37 +134,61 @@ class TestGame(Game):
             )"""
         # self.game_object_manager.add_multi(preset_ball_list)
         self.set_fps(240)
+        # The HUD only needs a few refreshes per second.
+        self.metrics = MetricsCollector()
+        self.metrics.add("kinetic_energy", self._ball_kinetic_energies, every=30)
         self.spawn_time_marker = 0
         self.spawn_ball_size = 1
 
+    def add_balls(self, balls: Iterable[Ball]) -> None:
+        if self.ball_set is None:
+            self.game_object_manager.add_multi(balls)
+            return
+        for ball in balls:
+            self.ball_set.add_ball(ball)
+
     def update(self) -> None:
         self._ball_collision_update()
         self._ball_total_kinetic_energy_update()
         super().update()
 
-    def _ball_total_kinetic_energy_update(self):
+    def _ball_kinetic_energies(self) -> np.ndarray:
+        if self.ball_set is not None:
+            return self.ball_set.get_kinetic_energies()
         game_object_list: list[Ball] = self.game_object_manager.get_pool("ball")
-        total_kinetic_energy = 0.0
-        for ball in game_object_list:
-            total_kinetic_energy += get_kinetic_energy(ball)
+        return np.fromiter(
+            map(get_kinetic_energy, game_object_list),
+            dtype=float,
+            count=len(game_object_list),
+        )
+
+    def _ball_total_kinetic_energy_update(self):
+        if "kinetic_energy" not in self.metrics.update():
+            return
+        total_kinetic_energy = self.metrics.get("kinetic_energy")
         self.total_kinetic_energy.update_text(
             f"Kinetic Energy: {total_kinetic_energy:.2f}"
         )
 
     def _ball_collision_update(self):
+        if self.ball_set is not None:
+            self.ball_set.collide()
+            return
         game_object_list: list[Ball] = self.game_object_manager.get_pool("ball")
-        quad_tree = QuadTreeNode(
-            depth=0,
-            start_point=(0, 0),
-            end_point=self.render_controller.get_resolution(),
-            reference_list=game_object_list,
-        )
-        if self.game_object_manager.get_pool("quadtree"):
-            self.game_object_manager.remove_pool("quadtree")
-        self.game_object_manager.add(quad_tree)
-        for i in range(len(game_object_list)):
-            quad_tree.insert(i)
-        quad_tree.interate_tree(strict_collision_update)
+        count = len(game_object_list)
+        centers = np.fromiter(
+            chain.from_iterable(map(Ball.get_position, game_object_list)),
+            float,
+            count * 2,
+        ).reshape(count, 2)
+        radii = np.fromiter(map(Ball.get_radius, game_object_list), float, count)
+        self.pair_cache.update(centers, np.repeat(radii[:, None], 2, axis=1))
+        first, second = self.pair_cache.get_pairs()
+        for i, j in zip(first.tolist(), second.tolist()):
+            ball_1, ball_2 = game_object_list[i], game_object_list[j]
+            if is_ball_collided(ball_1, ball_2):
+                move_ball_colliding(ball_1, ball_2)
+                exchange_momentum(ball_1, ball_2, 0.0)
 
     def run(self) -> None:
         self.running = True
@@ -181,6 +210,10 @@ class TestGame(Game):
                     self.stop()
                 if event.key == pygame.K_r:
                     self.game_object_manager.remove_pool("ball")
+                    # Balls spawned next would take the indices of the old ones.
+                    self.pair_cache.reset()
+                    if self.ball_set is not None:
+                        self.ball_set.clear()
                 if event.key == pygame.K_UP:
                     self.spawn_ball_size += 1
                     if self.spawn_ball_size > 20:
@@ -198,28 +231,32 @@ class TestGame(Game):
             if event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1:
                     self.spawn_time_marker = pygame.time.get_ticks() + 200
-                    self.game_object_manager.add(
-                        Ball(
-                            self.spawn_ball_size,
-                            event.pos,
-                            color.WHITE,
-                            self.spawn_ball_size * 2 * 3.14,
-                            (random.uniform(-100, 100), random.uniform(-100, 100)),
-                        )
+                    self.add_balls(
+                        [
+                            Ball(
+                                self.spawn_ball_size,
+                                event.pos,
+                                color.WHITE,
+                                self.spawn_ball_size * 2 * 3.14,
+                                (random.uniform(-100, 100), random.uniform(-100, 100)),
+                            )
+                        ]
                     )
         if pygame.mouse.get_pressed(3)[0]:
             if self.spawn_time_marker + 10 > pygame.time.get_ticks():
                 return
             self.spawn_time_marker = pygame.time.get_ticks()
             mouse_position = pygame.mouse.get_pos()
-            self.game_object_manager.add(
-                Ball(
-                    self.spawn_ball_size,
-                    mouse_position,
-                    color.WHITE,
-                    self.spawn_ball_size * 2 * 3.14,
-                    (random.uniform(-100, 100), random.uniform(-100, 100)),
-                )
+            self.add_balls(
+                [
+                    Ball(
+                        self.spawn_ball_size,
+                        mouse_position,
+                        color.WHITE,
+                        self.spawn_ball_size * 2 * 3.14,
+                        (random.uniform(-100, 100), random.uniform(-100, 100)),
+                    )
+                ]
             )
 
     def stop(self) -> None:
@@ -1,4 +1,5 @@
 import pygame
+from glyph_cache import GlyphCache, GlyphLine
 
 
 class TextLine:
@@ -8,12 +9,15 @@ class TextLine:
         font: pygame.font.Font,
         color: pygame.color.Color,
         position: tuple[int, int] | pygame.Vector2,
+        glyph_cache: GlyphCache | None = None,
     ) -> None:
         self.text = text
         self.font = font
         self.color = color
         self.position = position
-        self._rendered_text = self.font.render(self.text, True, self.color)
+        self._line = GlyphLine(self.font, self.color, cache=glyph_cache)
+        self._line.set_text(self.text)
+        self._rendered_text = self._line.get_surface()
 
     def update(self, resolution: tuple[int, int], time_step: float) -> None:
         pass
@@ -29,18 +33,23 @@ class TextLine:
 
     def set_font(self, new_font: pygame.font.Font) -> None:
         self.font = new_font
-        self._rendered_text = self.font.render(self.text, True, self.color)
+        self._line.set_style(self.font, self.color)
+        self._rendered_text = self._line.get_surface()
 
     def set_color(self, new_color: pygame.color.Color) -> None:
         self.color = new_color
-        self._rendered_text = self.font.render(self.text, True, self.color)
+        self._line.set_style(self.font, self.color)
+        self._rendered_text = self._line.get_surface()
 
     def get_color(self) -> pygame.color.Color:
         return self.color
 
     def update_text(self, new_text: str) -> None:
+        if new_text == self.text:
+            return
         self.text = new_text
-        self._rendered_text = self.font.render(self.text, True, self.color)
+        self._line.set_text(self.text)
+        self._rendered_text = self._line.get_surface()
 
     def get_text(self) -> str:
         return self.text